@@ -1,14 +1,38 @@
 import streamlit as st
-import altair as alt
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import os
-import pandas as pd
 import uuid
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 import json
 import re
-import requests
+import unicodedata
+import importlib
+import html
+import sys
+from typing import Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+import threading
+import shutil
+
+class LazyModule:
+    """처음 속성에 접근할 때 import 하는 모듈 대리 객체.
+    로그인 화면 첫 렌더에는 필요 없는 pandas/altair와 requests(resumable_upload가 사용)의 import 비용을 실제 사용하는 페이지로 미룬다."""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+alt = LazyModule('altair')
+resumable_upload = LazyModule('resumable_upload')
 
 # ------------------------------------------------------
 # 1. 환경 변수 로드
@@ -50,42 +74,106 @@ FIELD_DEFINITIONS = {
 }
 
 # ------------------------------------------------------
-# 세션 상태 초기화
+# 세션 상태 초기화 (세션당 한 번만 수행)
 # ------------------------------------------------------
-if 'accessory_specs' not in st.session_state:
-    st.session_state.accessory_specs = []
-if 'spare_part_specs' not in st.session_state:
-    st.session_state.spare_part_specs = []
-if 'documents' not in st.session_state:
-    st.session_state.documents = []
-if 'add_eq_images' not in st.session_state:
-    st.session_state.add_eq_images = []
-
-# 스크류 스펙 초기값 설정 (dict 형식으로 변경)
-if 'screw_specs' not in st.session_state:
-    st.session_state.screw_specs = {
-        'material_spec_description': """A:일반 수지류(PP.PE.ABS.POM.PMMA.PC.PET)
+def session_default_values():
+    """세션 상태 기본값 (호출할 때마다 새 객체)"""
+    return {
+        'authenticated': False,
+        'current_factory': None,
+        'language': 'ko',
+        'selected_eq_id_admin': None,
+        'selected_eq_id_admin_temp': None,
+        'selected_log_id_admin': None,
+        'selected_factory_id_admin': None,
+        'selected_status_id_admin': None,
+        'selected_log_id': None,
+        'accessory_specs': [],
+        'spare_part_specs': [],
+        'documents': [],
+        'add_eq_images': [],
+        'edit_accessory_specs': [],
+        'edit_spare_part_specs': [],
+        'edit_documents': [],
+        'edit_oil_specs': [],
+        'edit_screw_specs': {},
+        'edit_oil_notes': '',
+        'edit_oil_aftercare': '',
+        'edit_spec_errors': [],
+        'edit_unread_specs': {},
+        # 스크류 스펙 초기값 (dict 형식)
+        'screw_specs': {
+            'material_spec_description': """A:일반 수지류(PP.PE.ABS.POM.PMMA.PC.PET)
 B:GLASS WOOL 포함율 30% 이내(PC-GF,POM-GF,PA-GF,PBT-GF)
 C:GLASS WOOL 포함율 30% 이상(난연 ABS, 난연PC,난연 PBI, NYLON6,66)
 D:400℃이상 온도 사용 제품""",
-        'screw_type_general': '일반 수지용 SCREW',
-        'applicable_general': '',
-        'screw_type_wear': '내마모성 SCREW',
-        'applicable_wear': '',
-        'general_cycle': [{'해당 사양': '교체 주기 (월)', 'A': '5', 'B': '5', 'C': '3', 'D': '3'}],
-        'wear_resistant_cycle': [{'해당 사양': '교체 주기 (월)', 'A': '10', 'B': '10', 'C': '5', 'D': '5'}]
+            'screw_type_general': '일반 수지용 SCREW',
+            'applicable_general': '',
+            'screw_type_wear': '내마모성 SCREW',
+            'applicable_wear': '',
+            'general_cycle': [{'해당 사양': '교체 주기 (월)', 'A': '5', 'B': '5', 'C': '3', 'D': '3'}],
+            'wear_resistant_cycle': [{'해당 사양': '교체 주기 (월)', 'A': '10', 'B': '10', 'C': '5', 'D': '5'}]
+        },
+        # 오일 스펙 초기값
+        'oil_specs': [
+            {"구분": "작동유", "적용 작동유 SPCE": "LG 정유", "교체 주기": "9000HR / 1년"},
+            {"구분": "SPCE", "적용 작동유 SPCE": "란도 HD 46", "교체 주기": "375 일"}
+        ],
     }
 
-# 오일 스펙 초기값 설정
-if 'oil_specs' not in st.session_state:
-    st.session_state.oil_specs = [
-        {"구분": "작동유", "적용 작동유 SPCE": "LG 정유", "교체 주기": "9000HR / 1년"},
-        {"구분": "SPCE", "적용 작동유 SPCE": "란도 HD 46", "교체 주기": "375 일"}
-    ]
+def init_session_defaults():
+    if st.session_state.get('session_defaults_ready'):
+        return
+    for key, value in session_default_values().items():
+        st.session_state.setdefault(key, value)
+    st.session_state['session_defaults_ready'] = True
+
+init_session_defaults()
 
 # ------------------------------------------------------
 # 3. 데이터 조회
 # ------------------------------------------------------
+EQUIPMENT_DATE_COLUMNS = ('production_date', 'acquisition_date', 'purchase_date')
+DISPLAY_DATETIME_FORMAT = '%Y-%m-%d %H:%M'
+
+def parse_datetime_column(values):
+    """날짜 문자열 목록을 한 번에 파싱. 형식은 값마다 추론하고, 'N/A' 등 해석할 수 없는 값은 NaT"""
+    parsed = pd.to_datetime(pd.Series(values, dtype='object'), format='mixed', errors='coerce', utc=True)
+    return parsed.dt.tz_localize(None)
+
+def utc_now():
+    """parse_datetime_column 결과(UTC 기준, 시간대 없음)와 비교할 현재 시각"""
+    return pd.Timestamp.now(tz='UTC').tz_localize(None)
+
+def normalize_equipment_dates(rows):
+    """조회 시점에 날짜 컬럼을 <컬럼>_value(date)로 변환하고 설비 연식(age_years)을 미리 계산"""
+    if not rows:
+        return rows
+    for column in EQUIPMENT_DATE_COLUMNS:
+        parsed = parse_datetime_column([row.get(column) for row in rows])
+        for row, value in zip(rows, parsed):
+            row[f"{column}_value"] = None if pd.isna(value) else value.date()
+        if column == 'production_date':
+            today = date.today()
+            # 월/일을 고려한 연식 (생일이 지나지 않았으면 1년 차감)
+            not_yet = (parsed.dt.month > today.month) | ((parsed.dt.month == today.month) & (parsed.dt.day > today.day))
+            ages = today.year - parsed.dt.year - not_yet.astype(int)
+            for row, age in zip(rows, ages):
+                row['age_years'] = None if pd.isna(age) else int(age)
+    return rows
+
+def normalize_timestamp_column(rows, column):
+    """<컬럼>_value(Timestamp)와 화면 표시용 <컬럼>_display 문자열을 한 번에 추가"""
+    if not rows:
+        return rows
+    parsed = parse_datetime_column([row.get(column) for row in rows])
+    displays = parsed.dt.strftime(DISPLAY_DATETIME_FORMAT)
+    for row, value, display in zip(rows, parsed, displays):
+        missing = pd.isna(value)
+        row[f"{column}_value"] = None if missing else value
+        row[f"{column}_display"] = '' if missing else display
+    return rows
+
 @st.cache_data(ttl=600)
 def get_factories():
     res = supabase.from_('factories').select('*').execute()
@@ -97,50 +185,617 @@ def get_equipment(factory_id=None):
     if factory_id:
         query = query.eq('factory_id', factory_id)
     res = query.execute()
+    return normalize_equipment_dates(res.data) if res.data else []
+
+# 설비 검색(typeahead)은 가벼운 컬럼만, 최대 EQUIPMENT_SEARCH_LIMIT건만 조회
+EQUIPMENT_SEARCH_LIMIT = 20
+EQUIPMENT_SEARCH_COLUMNS = ('name', 'model', 'serial_number', 'maker')
+
+def clean_search_term(term):
+    """부분 일치 검색어 정리. PostgREST or 필터 문법에 쓰이는 문자(, ( ) * % :)와 백슬래시는 공백으로 치환"""
+    return re.sub(r'[,()*%:\\]', ' ', term or '').strip()
+
+def ilike_any_filter(columns, term):
+    """여러 컬럼 부분 일치(ilike) OR 조건 문자열. 검색어가 비면 None"""
+    term = clean_search_term(term)
+    if not term:
+        return None
+    return ','.join(f"{column}.ilike.*{term}*" for column in columns)
+
+@st.cache_data(ttl=60, max_entries=500)
+def search_equipment(term, limit=EQUIPMENT_SEARCH_LIMIT):
+    """이름/모델/시리얼/제조사 부분 일치 검색 (pg_trgm 인덱스 사용). 검색어가 없으면 이름순 상위 limit건"""
+    query = supabase.from_('equipment').select('id, name, model, maker, serial_number, factories(name)')
+    condition = ilike_any_filter(EQUIPMENT_SEARCH_COLUMNS, term)
+    if condition:
+        query = query.or_(condition)
+    res = query.order('name').limit(limit).execute()
     return res.data if res.data else []
 
+@st.cache_data(ttl=600)
+def get_equipment_by_id(equipment_id):
+    """선택한 설비 한 건만 전체 컬럼으로 조회"""
+    if not equipment_id:
+        return None
+    res = supabase.from_('equipment').select('*, factories(name)').eq('id', equipment_id).limit(1).execute()
+    return normalize_equipment_dates(res.data)[0] if res.data else None
+
+# 스페어 파트/부속기기 색인 (equipment_parts: 설비 사양 JSON을 트리거가 행 단위로 풀어 둔 테이블)
+PART_KINDS = {'spare_part': 'col_spare_part', 'accessory': 'part_kind_accessory'}  # 종류 → 번역 키
+PART_SEARCH_COLUMNS = ('name', 'model', 'serial', 'maker')
+PART_SEARCH_LIMIT = 200
+
+@st.cache_data(ttl=60, max_entries=200)
+def search_parts(term, kind=None, factory_id=None, limit=PART_SEARCH_LIMIT):
+    """부품명/부속기기명/형식/제작번호/제조처 부분 일치로 사용 설비 조회"""
+    query = supabase.from_('equipment_parts').select('kind, name, model, serial, maker, spec, equipment_id, factory_id, equipment(name, model, factories(name))')
+    condition = ilike_any_filter(PART_SEARCH_COLUMNS, term)
+    if condition:
+        query = query.or_(condition)
+    if kind:
+        query = query.eq('kind', kind)
+    if factory_id:
+        query = query.eq('factory_id', factory_id)
+    res = query.order('name').limit(limit).execute()
+    return res.data if res.data else []
+
+@st.cache_data(ttl=300, max_entries=100)
+def get_part_usage(kind=None, term=''):
+    """부품별 공장 사용 현황 (DB에서 집계, 행: kind/name_key/name/factory_id/factory_name/equipment_count/row_count)"""
+    res = supabase.rpc('part_usage_by_factory', {'p_kind': kind, 'p_term': clean_search_term(term) or None}).execute()
+    return res.data if res.data else []
+
+def format_equipment_hit(hit):
+    """검색 결과 한 건을 선택 상자 표시 문자열로 변환"""
+    factory = (hit.get('factories') or {}).get('name')
+    extras = [value for value in (hit.get('model'), hit.get('serial_number'), factory) if value]
+    return f"{hit['name']} ({' / '.join(extras)})" if extras else hit['name']
+
 @st.cache_data(ttl=600)
 def get_maintenance_logs(equipment_id=None):
      query = supabase.from_('maintenance_logs').select('*, equipment(name, factories(name)), action_category').order('maintenance_date', desc=True)
      if equipment_id:
          query = query.eq('equipment_id', equipment_id)
      res = query.execute()
-     return res.data if res.data else []
+     return normalize_timestamp_column(res.data, 'maintenance_date') if res.data else []
+
+QUERY_PAGE_SIZE = 1000  # PostgREST 기본 max-rows (한 번에 이보다 많이 요청해도 잘려서 옴)
+
+def fetch_all_rows(build_query, page_size=QUERY_PAGE_SIZE):
+    """조회 결과를 .range()로 나눠 끝까지 읽음. build_query는 호출할 때마다 새 쿼리(정렬 포함)를 반환해야 함"""
+    rows, start = [], 0
+    while True:
+        page = build_query().range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+# 정비 비용 집계 테이블 (maintenance_logs 트리거가 증분 갱신)
+COST_ROLLUP_TABLES = {'day': 'maintenance_cost_daily', 'month': 'maintenance_cost_monthly'}
+COST_SUMMARY_MONTHS = 12
+COST_SUMMARY_TOP_EQUIPMENT = 10
+
+@st.cache_data(ttl=60)
+def get_admin_overview(month):
+    """공장별 설비 상태 수/진행 중 고장/해당 월 정비 건수·비용 (집계 RPC 한 번 호출).
+    번역된 상태 문자열도 세도록 신뢰성 지표와 같은 상태 매핑의 별칭 목록을 넘김"""
+    aliases = {}
+    for value, state in reliability_state_map().items():
+        aliases.setdefault(state, []).append(value)
+    res = supabase.rpc('admin_factory_overview', {
+        'p_month': month.isoformat(),
+        'p_normal': aliases.get('up'),
+        'p_faulty': aliases.get('down'),
+        'p_sold': aliases.get('retired')
+    }).execute()
+    return res.data if res.data else []
+
+@st.cache_data(ttl=600)
+def get_cost_rollup(grain='month', factory_id=None, equipment_id=None, since=None):
+    """(기간, 설비, 작업 분류)별 비용 합계/건수. grain은 'day' 또는 'month', 기간 컬럼 이름도 같음"""
+    def build_query():
+        # 페이지 경계가 흔들리지 않도록 기본 키 순서로 정렬
+        query = supabase.from_(COST_ROLLUP_TABLES[grain]).select(f'{grain}, equipment_id, action_category, cost, log_count')
+        query = query.order(grain).order('equipment_id').order('action_category')
+        if factory_id:
+            query = query.eq('factory_id', factory_id)
+        if equipment_id:
+            query = query.eq('equipment_id', equipment_id)
+        if since:
+            query = query.gte(grain, since.isoformat())
+        return query
+    return fetch_all_rows(build_query)
+
+@st.cache_data(ttl=600)
+def get_factory_cost_rollup(factory_id, since=None):
+    """공장의 (월, 작업 분류)별 비용 합계/건수 (공장 단위 월 집계 테이블)"""
+    def build_query():
+        query = supabase.from_('maintenance_cost_factory_monthly').select('month, action_category, cost, log_count')
+        query = query.eq('factory_id', factory_id).order('month').order('action_category')
+        if since:
+            query = query.gte('month', since.isoformat())
+        return query
+    return fetch_all_rows(build_query)
+
+@st.cache_data(ttl=600)
+def get_factory_equipment_costs(factory_id, since=None, limit=COST_SUMMARY_TOP_EQUIPMENT):
+    """공장 설비별 비용 합계 상위 limit건 (DB에서 합산)"""
+    res = supabase.rpc('factory_equipment_costs', {
+        'p_factory_id': factory_id,
+        'p_since': since.isoformat() if since else None,
+        'p_limit': limit
+    }).execute()
+    return res.data if res.data else []
 
 @st.cache_data(ttl=0)
 
 def get_status_history(factory_id=None, equipment_id=None):
     try:
         if equipment_id:
-            query = supabase.table('equipment_status_history').select('id, equipment_id, status, notes, created_at')
-            query = query.eq('equipment_id', equipment_id)
+            def build_query():
+                query = supabase.table('equipment_status_history').select('id, equipment_id, status, notes, created_at')
+                return query.eq('equipment_id', equipment_id).order('created_at').order('id')
         elif factory_id:
             # equipment 테이블에서 equipment_id 목록 가져오기
             equipment_list = get_equipment(factory_id)
             equipment_ids = [eq['id'] for eq in equipment_list]
             if not equipment_ids:
                 return []
-            query = supabase.table('equipment_status_history').select('id, equipment_id, status, notes, created_at')
-            query = query.in_('equipment_id', equipment_ids)
-        response = query.execute()
-        data = response.data
+            def build_query():
+                query = supabase.table('equipment_status_history').select('id, equipment_id, status, notes, created_at')
+                return query.in_('equipment_id', equipment_ids).order('created_at').order('id')
+        data = fetch_all_rows(build_query)
         # equipment 테이블에서 name 매핑
         equipment_map = {eq['id']: eq['name'] for eq in get_equipment(factory_id)}
         for item in data:
             item['equipment'] = {'name': equipment_map.get(item['equipment_id'], 'Unknown')}
-        return data
+        return normalize_timestamp_column(data, 'created_at')
     except Exception as e:
         st.error(f"Error fetching status history: {e}")
         return []
 
-def get_field_definitions():
-    """모든 활성화된 필드 정의 조회"""
+# ------------------------------------------------------
+# 부분 갱신 (fragment 재실행용 캐시 무효화 / 로컬 행 패치)
+# ------------------------------------------------------
+def invalidate_status_caches():
+    """상태 기록 후 설비 목록과 상태 이력 캐시만 무효화 (공장/필드 정의 등 나머지 캐시는 유지)"""
+    get_equipment.clear()
+    get_equipment_by_id.clear()
+    get_status_history.clear()
+    mark_status_intervals_stale()
+
+def invalidate_log_caches():
+    """정비 이력 변경 후 정비 이력/비용 집계 캐시만 무효화"""
+    get_maintenance_logs.clear()
+    get_cost_rollup.clear()
+    get_factory_cost_rollup.clear()
+    get_factory_equipment_costs.clear()
+
+def patch_equipment_row(equipment_id, **fields):
+    """fragment만 다시 실행될 때 화면의 설비 행에 반영할 변경 사항. 다음 전체 실행에서 새로 조회되면 버려진다."""
+    st.session_state.setdefault('equipment_row_patches', {}).setdefault(equipment_id, {}).update(fields)
+
+def apply_equipment_patch(eq):
+    patch = st.session_state.get('equipment_row_patches', {}).get(eq['id'])
+    return {**eq, **patch} if patch else eq
+
+def reset_equipment_patches():
+    st.session_state['equipment_row_patches'] = {}
+
+# ------------------------------------------------------
+# 설비 사양 모델 (JSON 문자열 컬럼을 행 버전별로 한 번만 파싱)
+# ------------------------------------------------------
+SPEC_COLUMNS = ('details', 'fields_config', 'accessory_specs', 'spare_part_specs', 'documents', 'screw_specs', 'oil_specs')
+SPEC_CACHE_MAX_ENTRIES = 2000
+SPEC_FRAME_CACHE_MAX_ENTRIES = 500
+DEFAULT_GENERAL_CYCLE = [{'해당 사양': '교체 주기 (월)', 'A': '5', 'B': '5', 'C': '3', 'D': '3'}]
+DEFAULT_WEAR_CYCLE = [{'해당 사양': '교체 주기 (월)', 'A': '10', 'B': '10', 'C': '5', 'D': '5'}]
+# 표 셀 값. 편집 후 다시 저장되므로 숫자를 문자열로 바꾸지 않고 원래 타입 그대로 보존
+SpecValue = Optional[Union[str, bool, int, float]]
+
+class SpecRow(BaseModel):
+    """표 형태 사양의 한 행. DB에는 한글 키로 저장되므로 alias로 매핑하고, 알 수 없는 열은 그대로 보존"""
+    model_config = ConfigDict(populate_by_name=True, extra='allow', frozen=True)
+
+    def to_record(self):
+        # 입력에 있던 키만 원래 한글 키로 돌려줌 (표 열 구성 유지)
+        return self.model_dump(by_alias=True, exclude_unset=True)
+
+class AccessorySpec(SpecRow):
+    seq: SpecValue = Field(None, alias='순번')
+    name: SpecValue = Field(None, alias='부속기기 명')
+    type: SpecValue = Field(None, alias='형식')
+    serial: SpecValue = Field(None, alias='제작번호')
+    capacity: SpecValue = Field(None, alias='용량 및 규격')
+    maker: SpecValue = Field(None, alias='제조처')
+    notes: SpecValue = Field(None, alias='비고')
+
+class SparePartSpec(SpecRow):
+    part: SpecValue = Field(None, alias='SPARE PART')
+    cycle: SpecValue = Field(None, alias='교체 주기')
+    replaced_on: SpecValue = Field(None, alias='교체 일자')
+
+class DocumentRef(SpecRow):
+    name: SpecValue = Field(None, alias='기술 자료명')
+    url: SpecValue = None
+
+class OilSpec(SpecRow):
+    category: SpecValue = Field(None, alias='구분')
+    oil: SpecValue = Field(None, alias='적용 작동유 SPCE')
+    cycle: SpecValue = Field(None, alias='교체 주기')
+
+class ScrewSpecs(BaseModel):
+    model_config = ConfigDict(extra='allow', frozen=True)
+
+    material_spec_description: SpecValue = ''
+    screw_type_general: SpecValue = ''
+    applicable_general: SpecValue = ''
+    screw_type_wear: SpecValue = ''
+    applicable_wear: SpecValue = ''
+    general_cycle: list[dict] = Field(default_factory=list)
+    wear_resistant_cycle: list[dict] = Field(default_factory=list)
+
+    def has_content(self):
+        return bool(self.material_spec_description or self.general_cycle or self.wear_resistant_cycle)
+
+class EquipmentSpecs(BaseModel):
+    """설비 한 행의 파싱된 사양. 여러 세션이 공유하므로 수정하지 말고 to_record()/model_dump로 복사해서 사용"""
+    model_config = ConfigDict(frozen=True)
+
+    details: dict = Field(default_factory=dict)
+    fields_config: dict = Field(default_factory=dict)
+    accessory_specs: list[AccessorySpec] = Field(default_factory=list)
+    spare_part_specs: list[SparePartSpec] = Field(default_factory=list)
+    documents: list[DocumentRef] = Field(default_factory=list)
+    screw_specs: ScrewSpecs = Field(default_factory=ScrewSpecs)
+    oil_specs: list[OilSpec] = Field(default_factory=list)
+    # oil_specs 목록 안에 {'notes': ...}, {'aftercare': ...} 형태로 함께 저장된 값
+    oil_notes: str = ''
+    oil_aftercare: str = ''
+    errors: tuple[str, ...] = ()
+    # 읽지 못한 원본 값. 편집 후 저장할 때 그대로 되돌려 쓰거나 (확인 후) 버린다
+    unread_rows: dict = Field(default_factory=dict)     # 컬럼 → 검증에 실패한 행 목록
+    unread_columns: dict = Field(default_factory=dict)  # 컬럼 → 통째로 읽지 못한 컬럼 원본 값
+
+def _load_json_value(raw, expected_type, column, errors, unread_columns=None):
+    if raw is None or raw == '':
+        return expected_type()
+    value = raw
+    if isinstance(raw, str):
+        try:
+            value = json.loads(raw)
+        except ValueError as e:
+            errors.append(f"{column}: JSON 파싱 실패 ({e})")
+            if unread_columns is not None:
+                unread_columns[column] = raw
+            return expected_type()
+    if value is None:
+        return expected_type()
+    if not isinstance(value, expected_type):
+        errors.append(f"{column}: {expected_type.__name__} 형식이 아님")
+        if unread_columns is not None:
+            unread_columns[column] = raw
+        return expected_type()
+    return value
+
+def _parse_spec_rows(model, rows, column, errors, unread_rows):
+    parsed = []
+    for index, row in enumerate(rows):
+        try:
+            parsed.append(model.model_validate(row))
+        except ValidationError as e:
+            errors.append(f"{column}[{index}]: {e.error_count()}개 항목 오류")
+            unread_rows.setdefault(column, []).append(row)
+    return parsed
+
+def spec_row_version(eq):
+    """사양 컬럼 원본 값으로 만든 행 버전 (값이 바뀌면 캐시 키가 바뀜)"""
+    return hash(tuple(str(eq.get(column)) for column in SPEC_COLUMNS))
+
+@st.cache_resource(max_entries=SPEC_CACHE_MAX_ENTRIES)
+def _parse_equipment_specs(equipment_id, version, _raw):
+    errors = []
+    unread_rows = {}
+    unread_columns = {}
+    details = _load_json_value(_raw.get('details'), dict, 'details', errors)
+    fields_config = _load_json_value(_raw.get('fields_config'), dict, 'fields_config', errors)
+    accessory_rows = _load_json_value(_raw.get('accessory_specs'), list, 'accessory_specs', errors, unread_columns)
+    spare_rows = _load_json_value(_raw.get('spare_part_specs'), list, 'spare_part_specs', errors, unread_columns)
+    document_rows = _load_json_value(_raw.get('documents'), list, 'documents', errors, unread_columns)
+    screw_data = _load_json_value(_raw.get('screw_specs'), dict, 'screw_specs', errors, unread_columns)
+    oil_rows = _load_json_value(_raw.get('oil_specs'), list, 'oil_specs', errors, unread_columns)
+
+    oil_notes = next((row['notes'] for row in oil_rows if isinstance(row, dict) and 'notes' in row), '')
+    oil_aftercare = next((row['aftercare'] for row in oil_rows if isinstance(row, dict) and 'aftercare' in row), '')
+    oil_rows = [row for row in oil_rows if not (isinstance(row, dict) and ('notes' in row or 'aftercare' in row))]
+
     try:
-        response = supabase.table('field_definitions').select('*').eq('is_active', True).order('field_label').execute()
-        return response.data if response.data else []
-    except Exception as e:
-        st.error(f"필드 정의 조회 실패: {str(e)}")
+        screw_specs = ScrewSpecs.model_validate({key: value for key, value in screw_data.items() if value is not None})
+    except ValidationError as e:
+        errors.append(f"screw_specs: {e.error_count()}개 항목 오류")
+        unread_columns['screw_specs'] = _raw.get('screw_specs')
+        screw_specs = ScrewSpecs()
+
+    return EquipmentSpecs(
+        details=details,
+        fields_config=fields_config,
+        accessory_specs=_parse_spec_rows(AccessorySpec, accessory_rows, 'accessory_specs', errors, unread_rows),
+        spare_part_specs=_parse_spec_rows(SparePartSpec, spare_rows, 'spare_part_specs', errors, unread_rows),
+        documents=_parse_spec_rows(DocumentRef, document_rows, 'documents', errors, unread_rows),
+        screw_specs=screw_specs,
+        oil_specs=_parse_spec_rows(OilSpec, oil_rows, 'oil_specs', errors, unread_rows),
+        oil_notes=str(oil_notes or ''),
+        oil_aftercare=str(oil_aftercare or ''),
+        errors=tuple(errors),
+        unread_rows=unread_rows,
+        unread_columns=unread_columns
+    )
+
+def get_equipment_specs(eq):
+    """설비 행의 사양 모델. (설비 ID, 행 버전)별로 한 번만 파싱해 모든 세션이 공유"""
+    return _parse_equipment_specs(eq['id'], spec_row_version(eq), {column: eq.get(column) for column in SPEC_COLUMNS})
+
+@st.cache_resource(max_entries=SPEC_FRAME_CACHE_MAX_ENTRIES)
+def _build_spec_frames(equipment_id, version, lang, _specs):
+    t = load_translation_catalog(lang).__getitem__
+
+    def frame(rows, rename):
+        if not rows:
+            return None
+        return pd.DataFrame([row.to_record() for row in rows]).rename(columns=rename)
+
+    screw_specs = _specs.screw_specs
+    return {
+        'accessory_specs': frame(_specs.accessory_specs, {
+            '순번': t('col_seq'),
+            '부속기기 명': t('col_accessory_name'),
+            '형식': t('col_accessory_type'),
+            '제작번호': t('col_accessory_serial'),
+            '용량 및 규격': t('col_capacity_spec'),
+            '제조처': t('col_maker'),
+            '비고': t('col_notes')
+        }),
+        'spare_part_specs': frame(_specs.spare_part_specs, {
+            'SPARE PART': t('col_spare_part'),
+            '교체 주기': t('col_maintenance_cycle'),
+            '교체 일자': t('col_replacement_date')
+        }),
+        'oil_specs': frame(_specs.oil_specs, {
+            '구분': t('col_category'),
+            '적용 작동유 SPCE': t('col_applicable_oil'),
+            '교체 주기': t('col_maintenance_cycle')
+        }),
+        'screw_general_cycle': pd.DataFrame(screw_specs.general_cycle) if screw_specs.general_cycle else None,
+        'screw_wear_cycle': pd.DataFrame(screw_specs.wear_resistant_cycle) if screw_specs.wear_resistant_cycle else None,
+    }
+
+def get_equipment_spec_frames(eq):
+    """상세 화면 사양 표. (설비 ID, 행 버전, 언어)별로 한 번만 만들어 세션 간 재사용하므로 수정하지 말 것"""
+    lang = st.session_state.get('language', DEFAULT_LANGUAGE)
+    return _build_spec_frames(eq['id'], spec_row_version(eq), lang, _specs=get_equipment_specs(eq))
+
+def report_spec_errors(equipment_rows):
+    """사양 파싱 오류가 있는 설비를 한 번에 모아 경고로 표시"""
+    problems = []
+    for eq in equipment_rows:
+        errors = get_equipment_specs(eq).errors
+        if errors:
+            problems.append({'설비': eq.get('name'), 'ID': eq['id'], '오류': ' / '.join(errors)})
+    if problems:
+        with st.expander(f"⚠️ 사양 데이터 오류가 있는 설비 {len(problems)}대", expanded=False):
+            st.dataframe(pd.DataFrame(problems), width='stretch', hide_index=True)
+    return problems
+
+# ------------------------------------------------------
+# 검색 인덱스 (한글/영문 n-gram, 오타 허용 순위 검색)
+# ------------------------------------------------------
+# 검색어/필드를 공백 단위 토큰으로 나누고 구두점을 지운 뒤('SE-180' -> 'se180') 한글/그 외 문자 구간마다 2-gram을 만든다.
+# 한글 구간은 자모로 풀어서('컴' -> 'ㅋㅓㅁ') 2-gram을 만들므로 한 음절 오타('컴프래서')도 대부분의 gram이 일치한다.
+# 그 외 문자는 문서 쪽에 한 글자 검색도 되도록 1-gram도 함께 넣는다.
+SEARCH_WORD_PATTERN = re.compile(r'[^\W_]+')
+SEARCH_SCRIPT_RUN_PATTERN = re.compile(r'[가-힣]+|[^가-힣]+')
+SEARCH_MIN_COVERAGE = 0.5  # 완전 일치가 없을 때 검색어 n-gram 중 이 비율 이상 일치하면 유사 결과로 포함
+SEARCH_INDEX_CACHE_MAX_ENTRIES = 20
+EQUIPMENT_SEARCH_WEIGHTS = {
+    'name': 5.0,
+    'model': 4.0,
+    'serial_number': 4.0,
+    'maker': 3.0,
+    'installation_location': 2.0,
+    'details': 1.5,
+    'status': 1.0,
+}
+
+def compact_search_text(text):
+    """전각/반각 통일(NFKC), 소문자화 후 구두점 제거"""
+    if text is None:
+        return ''
+    return ''.join(SEARCH_WORD_PATTERN.findall(unicodedata.normalize('NFKC', str(text)).lower()))
+
+def search_tokens(text):
+    """공백 단위 토큰 (압축 형태)"""
+    if text is None:
         return []
+    return [token for token in (compact_search_text(part) for part in str(text).split()) if token]
+
+def search_grams(text, unigrams=False):
+    grams = set()
+    for token in search_tokens(text):
+        for run in SEARCH_SCRIPT_RUN_PATTERN.findall(token):
+            if '가' <= run[0] <= '힣':
+                run = unicodedata.normalize('NFD', run)  # 음절 -> 초성/중성/종성 자모
+            elif len(run) == 1 or unigrams:
+                grams.update(run)
+            grams.update(run[i:i + 2] for i in range(len(run) - 1))
+    return grams
+
+class SearchIndex:
+    """문서 번호 -> 필드별 텍스트로 만든 n-gram 역색인.
+    모든 검색어 토큰이 어떤 필드에 그대로 들어 있는 문서(완전 일치)가 있으면 그 문서만,
+    없으면 n-gram 일치율이 SEARCH_MIN_COVERAGE 이상인 유사 문서를 점수순으로 반환한다."""
+    def __init__(self, weights):
+        self.weights = weights
+        self.postings = {}  # gram -> {문서 번호: 가장 높은 필드 가중치}
+        self.fields = {}    # 문서 번호 -> [(가중치, 압축 문자열)]
+
+    def __len__(self):
+        return len(self.fields)
+
+    def add(self, doc, fields):
+        """문서 추가. 이미 있는 문서 번호면 기존 내용을 대체"""
+        if doc in self.fields:
+            self.remove(doc)
+        compact_fields = []
+        for field, text in fields.items():
+            if text is None or text == '':
+                continue
+            weight = self.weights[field]
+            for gram in search_grams(text, unigrams=True):
+                docs = self.postings.setdefault(gram, {})
+                if docs.get(doc, 0) < weight:
+                    docs[doc] = weight
+            compact_fields.append((weight, ' '.join(search_tokens(text))))
+        self.fields[doc] = compact_fields
+
+    def remove(self, doc):
+        # 압축 문자열에서 gram을 다시 만들어 해당 posting만 정리 (문서별 gram 목록은 따로 저장하지 않음)
+        for _, text in self.fields.pop(doc, ()):
+            for gram in search_grams(text, unigrams=True):
+                docs = self.postings.get(gram)
+                if docs is not None:
+                    docs.pop(doc, None)
+                    if not docs:
+                        del self.postings[gram]
+
+    def search(self, query, candidates=None):
+        """(문서 번호, 점수) 목록을 점수 내림차순으로 반환. candidates가 있으면 그 문서만 대상"""
+        grams = search_grams(query)
+        if not grams:
+            return []
+        scores, hits = {}, {}
+        for gram in grams:
+            for doc, weight in self.postings.get(gram, {}).items():
+                if candidates is not None and doc not in candidates:
+                    continue
+                scores[doc] = scores.get(doc, 0) + weight
+                hits[doc] = hits.get(doc, 0) + 1
+
+        tokens = search_tokens(query)
+        exact = []
+        for doc, count in hits.items():
+            if count < len(grams):
+                continue
+            # 토큰마다 그 토큰을 포함하는 필드 중 가장 높은 가중치를 가산점으로
+            token_weights = [max((weight for weight, text in self.fields[doc] if token in text), default=0) for token in tokens]
+            if all(token_weights):
+                exact.append((doc, scores[doc] / len(grams) + sum(token_weights)))
+        if exact:
+            ranked = exact
+        else:
+            needed = len(grams) * SEARCH_MIN_COVERAGE
+            ranked = [(doc, score / len(grams)) for doc, score in scores.items() if hits[doc] >= needed]
+        ranked.sort(key=lambda item: -item[1])
+        return ranked
+
+def equipment_data_version(rows):
+    """설비 목록 버전: 행 수 + 가장 최근 updated_at (updated_at이 없으면 검색 대상 값의 해시)"""
+    if rows and 'updated_at' in rows[0]:
+        return (len(rows), max(str(row.get('updated_at') or '') for row in rows))
+    return (len(rows), hash(tuple((row['id'], row.get('name'), row.get('model'), row.get('maker'), row.get('status')) for row in rows)))
+
+def equipment_search_fields(eq):
+    details = get_equipment_specs(eq).details
+    return {
+        'name': eq.get('name'),
+        'model': eq.get('model'),
+        'serial_number': eq.get('serial_number'),
+        'maker': eq.get('maker'),
+        'installation_location': eq.get('installation_location'),
+        # 특화 필드 값 (details JSON)
+        'details': ' '.join(str(value) for value in details.values() if isinstance(value, (str, int, float)) and value != ''),
+        'status': eq.get('status'),
+    }
+
+@st.cache_resource(max_entries=SEARCH_INDEX_CACHE_MAX_ENTRIES)
+def _build_equipment_search_index(factory_id, version, _rows):
+    index = SearchIndex(EQUIPMENT_SEARCH_WEIGHTS)
+    for position, eq in enumerate(_rows):
+        index.add(position, equipment_search_fields(eq))
+    return index
+
+def search_equipment_list(equipment_list, query, factory_id=None):
+    """설비 목록을 검색어로 순위 정렬해 반환. 인덱스는 (공장, 목록 버전)별로 한 번만 만들어 세션 간 공유"""
+    index = _build_equipment_search_index(factory_id, equipment_data_version(equipment_list), _rows=equipment_list)
+    # 같은 버전이면 행 순서도 같으므로 문서 번호 = 현재 목록의 위치
+    ranked = index.search(query)
+    ranked.sort(key=lambda item: (-item[1], equipment_list[item[0]].get('name') or ''))
+    return [equipment_list[position] for position, _ in ranked]
+
+# ------------------------------------------------------
+# 설비 템플릿 / 필드 정의 레지스트리
+# ------------------------------------------------------
+@st.cache_resource
+def get_schema_registry():
+    """템플릿과 필드 정의를 프로세스 전체에서 한 번만 로드해 공유. 쓰기 후 refresh_schema_registry()로 갱신"""
+    return {'lock': threading.Lock(), 'version': 0, 'snapshot': None}
+
+def _load_schema_snapshot(version):
+    fields = supabase.table('field_definitions').select('*').eq('is_active', True).order('field_label').execute().data or []
+    templates = supabase.table('equipment_templates').select('*').eq('is_active', True).order('created_at').execute().data or []
+    for template in templates:
+        # fields_config는 로드할 때 한 번만 파싱
+        if isinstance(template.get('fields_config'), str):
+            template['fields_config'] = json.loads(template['fields_config'] or '{}')
+        template['fields_config'] = template.get('fields_config') or {}
+    return {
+        'version': version,
+        'fields': fields,
+        'fields_by_key': {field['field_key']: field for field in fields},
+        'templates': templates,
+        'templates_by_name': {template['name']: template for template in templates},
+        'templates_by_id': {template['id']: template for template in templates},
+    }
+
+def load_schema_registry():
+    """현재 레지스트리 스냅샷. 스냅샷은 세션 간 공유되므로 수정하지 말고 복사해서 사용"""
+    registry = get_schema_registry()
+    snapshot = registry['snapshot']
+    if snapshot is not None:
+        return snapshot
+    with registry['lock']:
+        if registry['snapshot'] is None:
+            try:
+                registry['snapshot'] = _load_schema_snapshot(registry['version'])
+            except Exception as e:
+                st.error(f"템플릿/필드 정의 조회 실패: {str(e)}")
+                return _empty_schema_snapshot(registry['version'])
+        return registry['snapshot']
+
+def _empty_schema_snapshot(version):
+    return {'version': version, 'fields': [], 'fields_by_key': {}, 'templates': [], 'templates_by_name': {}, 'templates_by_id': {}}
+
+def refresh_schema_registry():
+    """템플릿/필드 쓰기 후 호출. 버전을 올리고 다음 조회 때 다시 로드"""
+    registry = get_schema_registry()
+    with registry['lock']:
+        registry['version'] += 1
+        registry['snapshot'] = None
+
+def get_field_definitions():
+    """모든 활성화된 필드 정의 조회"""
+    return load_schema_registry()['fields']
+
+def get_field_definition(field_key):
+    return load_schema_registry()['fields_by_key'].get(field_key)
+
+def get_field_spec(field_key):
+    """특화 필드의 표시 라벨/타입. 번역 키가 있는 기본 필드는 FIELD_DEFINITIONS 라벨을, 나머지는 DB 정의를 사용"""
+    builtin = FIELD_DEFINITIONS.get(field_key)
+    field = get_field_definition(field_key)
+    label = builtin['label'] if builtin else field['field_label'] if field else field_key
+    field_type = field['field_type'] if field else builtin['type'] if builtin else 'text'
+    return {'label': label, 'type': field_type}
 
 def add_field_definition(field_key, field_label, field_type, category):
     """새 필드 정의 추가"""
@@ -157,6 +812,7 @@ def add_field_definition(field_key, field_label, field_type, category):
             'category': category
         }
         response = supabase.table('field_definitions').insert(data).execute()
+        refresh_schema_registry()
         return True, "필드가 추가되었습니다."
     except Exception as e:
         return False, str(e)
@@ -166,6 +822,7 @@ def delete_field_definition(field_id):
     try:
         data = {'is_active': False}
         response = supabase.table('field_definitions').update(data).eq('id', field_id).execute()
+        refresh_schema_registry()
         return True, "필드가 삭제되었습니다."
     except Exception as e:
         return False, str(e)
@@ -190,26 +847,34 @@ def upload_images(uploaded_files):
             return None
     return ",".join(image_urls) if image_urls else None
 
+def split_urls(urls):
+    """쉼표로 구분된 URL 문자열을 리스트로 변환"""
+    return [url.strip() for url in urls.split(',') if url.strip()] if urls else []
+
+def storage_object_name(url):
+    """공개 URL에서 Storage 객체 이름 추출"""
+    return url.strip().split('?')[0].split('/')[-1]
+
+def remove_storage_objects(bucket, urls):
+    """버킷의 여러 객체를 한 번의 remove 호출로 삭제"""
+    file_names = sorted({storage_object_name(url) for url in urls if url and url.strip()})
+    if not file_names:
+        return True
+    try:
+        supabase.storage.from_(bucket).remove(file_names)
+        return True
+    except Exception as e:
+        st.warning(f"기존 파일 삭제 실패 ({bucket}, {len(file_names)}개): {e}")
+        return False
+
 def update_equipment_images(equipment_id, uploaded_images):
     current_eq_data = supabase.from_('equipment').select('image_urls').eq('id', equipment_id).single().execute().data
-    old_urls = current_eq_data['image_urls'].split(',') if current_eq_data and current_eq_data['image_urls'] else []
-    for url in old_urls:
-        try:
-            file_name = url.split('/')[-1]
-            supabase.storage.from_('equipment_images').remove([file_name])
-        except Exception as e:
-            st.warning(f"기존 이미지 삭제 실패: {e}")
+    remove_storage_objects('equipment_images', split_urls(current_eq_data and current_eq_data['image_urls']))
     return upload_images(uploaded_images)
 
 def update_log_images(log_id, uploaded_files):
     current_log_data = supabase.from_('maintenance_logs').select('image_urls').eq('id', log_id).single().execute().data
-    old_urls = current_log_data['image_urls'].split(',') if current_log_data and current_log_data['image_urls'] else []
-    for url in old_urls:
-        try:
-            file_name = url.split('/')[-1]
-            supabase.storage.from_('equipment_images').remove([file_name])
-        except Exception as e:
-            st.warning(f"기존 이미지 삭제 실패: {e}")
+    remove_storage_objects('equipment_images', split_urls(current_log_data and current_log_data['image_urls']))
     return upload_images(uploaded_files)
 
 def add_factory(name, password):
@@ -239,7 +904,76 @@ def serialize_data_for_json(data):
     else:
         return data
 
-def update_equipment(equipment_id, name, product_name, maker, model, details_dict, accessory_specs, spare_part_specs, documents, screw_specs, oil_specs, status, uploaded_images, uploaded_documents=None, oil_notes='', oil_aftercare=''):
+def parse_json_list(raw):
+    """JSON 문자열(또는 이미 파싱된 값)을 리스트로 변환"""
+    if isinstance(raw, list):
+        return raw
+    try:
+        value = json.loads(raw) if raw else []
+    except (TypeError, ValueError):
+        return []
+    return value if isinstance(value, list) else []
+
+# equipment 테이블 실제 컬럼 (details JSON이 아닌 컬럼에 직접 저장)
+EQUIPMENT_DIRECT_COLUMNS = [
+    'product_name', 'maker', 'serial_number', 'production_date',
+    'acquisition_cost', 'acquisition_date', 'acquisition_basis',
+    'purchase_date', 'installation_location', 'motor_capacity',
+    'heater_capacity', 'total_weight', 'other_notes',
+    'equipment_grade'
+]
+
+def add_equipment(factory_id, name, model, equipment_type, details_dict, accessory_specs, spare_part_specs, documents, screw_specs, oil_specs, image_urls=None, attachments=None):
+    """설비 추가. 첨부 파일(attachments)은 로컬 스풀에 저장 후 백그라운드 워커가 업로드"""
+    job_id = None
+    try:
+        # 날짜 형식 변환
+        for part in spare_part_specs:
+            if isinstance(part.get('교체 일자'), date):
+                part['교체 일자'] = part['교체 일자'].isoformat()
+        for key, value in details_dict.items():
+            if isinstance(value, date):
+                details_dict[key] = value.isoformat() if value else None
+
+        fields_config = details_dict.pop('fields_config', {}) or {}
+        direct_fields = {key: value for key, value in details_dict.items() if key in EQUIPMENT_DIRECT_COLUMNS}
+        extra_fields = {key: value for key, value in details_dict.items() if key not in EQUIPMENT_DIRECT_COLUMNS}
+
+        # 파일 바이트를 먼저 디스크에 저장해 두어야 새로고침/재시작에도 유실되지 않음
+        if attachments:
+            job_id = spool_attachments('equipment', attachments, factory_id=factory_id, label=name)
+
+        insert_data = {
+            'factory_id': factory_id,
+            'name': name,
+            'model': model,
+            'equipment_type': equipment_type,
+            'status': '정상',
+            **direct_fields,
+            'fields_config': json.dumps(fields_config, ensure_ascii=False),
+            'details': json.dumps(extra_fields, ensure_ascii=False),
+            'accessory_specs': json.dumps(accessory_specs, ensure_ascii=False),
+            'spare_part_specs': json.dumps(spare_part_specs, ensure_ascii=False),
+            'documents': json.dumps([doc for doc in documents or [] if isinstance(doc, dict) and doc.get('url')], ensure_ascii=False),
+            'screw_specs': json.dumps(screw_specs, ensure_ascii=False) if screw_specs else None,
+            'oil_specs': json.dumps(oil_specs, ensure_ascii=False),
+            'image_urls': image_urls or None,
+            'attachments_pending': job_id is not None
+        }
+        response = supabase.table('equipment').insert(insert_data).execute()
+        if job_id and not queue_spooled_attachments(job_id, response.data[0]['id']):
+            supabase.table('equipment').update({'attachments_pending': False}).eq('id', response.data[0]['id']).execute()
+            st.cache_data.clear()
+            return True, "설비가 추가되었지만 첨부 파일 업로드 작업을 찾을 수 없습니다. 첨부 파일을 다시 올려 주세요."
+        st.cache_data.clear()
+        return True, "설비가 추가되었습니다."
+    except Exception as e:
+        if job_id:
+            discard_spooled_attachments(job_id)
+        return False, str(e)
+
+def update_equipment(equipment_id, name, product_name, maker, model, details_dict, accessory_specs, spare_part_specs, documents, screw_specs, oil_specs, status, uploaded_images, uploaded_documents=None, oil_notes='', oil_aftercare='', equipment_type=None, unread_specs=None):
+    """설비 수정. unread_specs({'rows', 'columns'})가 있으면 편집 화면에 불러오지 못한 원본 사양을 그대로 함께 저장"""
     try:
         # 날짜 형식 변환
         for part in spare_part_specs:
@@ -260,35 +994,26 @@ def update_equipment(equipment_id, name, product_name, maker, model, details_dic
                 screw_specs['wear_resistant_cycle'] = screw_specs['wear_resistant_cycle_df'].to_dict('records')
                 del screw_specs['wear_resistant_cycle_df']
         
-        # equipment 테이블 실제 컬럼 (수정: equipment_grade 추가)
-        direct_columns = [
-            'product_name', 'maker', 'serial_number', 'production_date',
-            'acquisition_cost', 'acquisition_date', 'acquisition_basis',
-            'purchase_date', 'installation_location', 'motor_capacity',
-            'heater_capacity', 'total_weight', 'other_notes',
-            'equipment_grade'  # 추가
-        ]
-        
         # details_dict를 direct 필드와 extra 필드로 분리
         direct_fields = {}
         extra_fields = {}
         
         for key, value in details_dict.items():
-            if key in direct_columns:
+            if key in EQUIPMENT_DIRECT_COLUMNS:
                 direct_fields[key] = value
             else:
                 extra_fields[key] = value
         
+        # 읽지 못한 행은 편집한 행 뒤에 원본 그대로 붙임
+        unread_rows = (unread_specs or {}).get('rows', {})
+        accessory_specs = accessory_specs + unread_rows.get('accessory_specs', [])
+        spare_part_specs = spare_part_specs + unread_rows.get('spare_part_specs', [])
+
         # 작동유 사양에 노트 추가
-        oil_specs_with_notes = oil_specs + [{'notes': oil_notes}, {'aftercare': oil_aftercare}]
+        oil_specs_with_notes = oil_specs + unread_rows.get('oil_specs', []) + [{'notes': oil_notes}, {'aftercare': oil_aftercare}]
         
-        # 이미지 처리
-        if uploaded_images:
-            new_image_urls = upload_images(uploaded_images)
-            existing_image_urls = supabase.table('equipment').select('image_urls').eq('id', equipment_id).execute().data[0].get('image_urls', '')
-            combined_image_urls = f"{existing_image_urls},{new_image_urls}" if existing_image_urls else new_image_urls
-        else:
-            combined_image_urls = supabase.table('equipment').select('image_urls').eq('id', equipment_id).execute().data[0].get('image_urls', '')
+        # 이미지 처리 (기존 URL 뒤에 이어 붙이는 작업은 RPC에서 처리)
+        new_image_urls = upload_images(uploaded_images) if uploaded_images else None
         
         # 문서 처리
         updated_documents = documents.copy() if documents else []
@@ -307,12 +1032,13 @@ def update_equipment(equipment_id, name, product_name, maker, model, details_dic
                     }
                     if not any(d['기술 자료명'] == file_data['기술 자료명'] for d in updated_documents):  # 이름 기반 중복 체크
                         updated_documents.append(file_data)
+        updated_documents += unread_rows.get('documents', [])
         
         # 업데이트 데이터 준비
         update_data = {
             "name": name,
             "model": model,
-            "equipment_type": selected_equipment_type,
+            "equipment_type": equipment_type,
             "status": status,
             **direct_fields,
             "details": json.dumps(extra_fields, ensure_ascii=False),
@@ -320,12 +1046,18 @@ def update_equipment(equipment_id, name, product_name, maker, model, details_dic
             "spare_part_specs": json.dumps(spare_part_specs, ensure_ascii=False),
             "documents": json.dumps(updated_documents, ensure_ascii=False),
             "screw_specs": json.dumps(screw_specs, ensure_ascii=False) if screw_specs else None,
-            "oil_specs": json.dumps(oil_specs_with_notes, ensure_ascii=False),
-            "image_urls": combined_image_urls
+            "oil_specs": json.dumps(oil_specs_with_notes, ensure_ascii=False)
         }
+        # 통째로 읽지 못한 컬럼은 편집 내용 대신 원본 값을 그대로 되돌려 씀
+        for column, raw in (unread_specs or {}).get('columns', {}).items():
+            update_data[column] = raw if raw is None or isinstance(raw, str) else json.dumps(raw, ensure_ascii=False)
         
-        # Supabase 업데이트
-        supabase.table('equipment').update(update_data).eq('id', equipment_id).execute()
+        # Supabase 업데이트 (단일 트랜잭션 RPC)
+        supabase.rpc('update_equipment_record', {
+            'p_equipment_id': equipment_id,
+            'p_data': update_data,
+            'p_new_image_urls': new_image_urls
+        }).execute()
         st.cache_data.clear()
         # 제출 후 세션 초기화 (중복 방지)
         st.session_state.edit_documents = []  # 세션 초기화
@@ -334,37 +1066,49 @@ def update_equipment(equipment_id, name, product_name, maker, model, details_dic
         return False, str(e)
 
 def delete_equipment(equipment_id):
-    current_eq_data = supabase.from_('equipment').select('image_urls').eq('id', equipment_id).single().execute().data
-    old_urls = current_eq_data['image_urls'].split(',') if current_eq_data and current_eq_data['image_urls'] else []
-    for url in old_urls:
-        try:
-            file_name = url.split('/')[-1]
-            supabase.storage.from_('equipment_images').remove([file_name])
-        except Exception as e:
-            st.warning(f"이미지 삭제 실패: {e}")
+    # 상태 이력, 정비 이력, 설비를 한 트랜잭션에서 삭제하고 정리할 파일 URL을 돌려받음
+    deleted = supabase.rpc('delete_equipment_cascade', {'p_equipment_id': equipment_id}).execute().data or {}
 
-    supabase.from_('equipment_status_history').delete().eq('equipment_id', equipment_id).execute()
-    supabase.from_('maintenance_logs').delete().eq('equipment_id', equipment_id).execute()
-    supabase.from_('equipment').delete().eq('id', equipment_id).execute()
+    # 설비 이미지와 정비 이력 이미지는 같은 버킷이므로 한 번에 삭제
+    image_urls = split_urls(deleted.get('image_urls'))
+    for log_image_urls in deleted.get('log_image_urls') or []:
+        image_urls.extend(split_urls(log_image_urls))
+    remove_storage_objects('equipment_images', image_urls)
+    remove_storage_objects('documents', [doc.get('url') for doc in parse_json_list(deleted.get('documents')) if isinstance(doc, dict)])
 
     st.success("설비 및 관련 데이터 삭제 완료")
     st.session_state.selected_eq_id_admin = None
     st.cache_data.clear()
+    remove_equipment_from_log_search(equipment_id)
 
-def add_log(equipment_id, engineer, action, notes, maintenance_date, maintenance_time, image_urls=None, cost=0.0, action_category=None):
+def add_log(equipment_id, engineer, action, notes, maintenance_date, maintenance_time, image_urls=None, cost=0.0, action_category=None, attachments=None):
     combined_dt = datetime.combine(maintenance_date, maintenance_time)
-    supabase.from_('maintenance_logs').insert({
-        'equipment_id': equipment_id,
-        'maintenance_date': combined_dt.isoformat(),
-        'engineer': engineer,
-        'action': action,
-        'notes': notes,
-        'image_urls': image_urls,
-        'cost': cost,
-        'action_category': action_category
-    }).execute()
+    job_id = None
+    if attachments:
+        factory = st.session_state.get('current_factory') or {}
+        job_id = spool_attachments('log', attachments, factory_id=factory.get('id'), label=f"정비 이력 {combined_dt:%Y-%m-%d %H:%M} {action}")
+    try:
+        response = supabase.from_('maintenance_logs').insert({
+            'equipment_id': equipment_id,
+            'maintenance_date': combined_dt.isoformat(),
+            'engineer': engineer,
+            'action': action,
+            'notes': notes,
+            'image_urls': image_urls,
+            'cost': cost,
+            'action_category': action_category,
+            'attachments_pending': job_id is not None
+        }).execute()
+    except Exception:
+        if job_id:
+            discard_spooled_attachments(job_id)
+        raise
+    if job_id and not queue_spooled_attachments(job_id, response.data[0]['id']):
+        supabase.from_('maintenance_logs').update({'attachments_pending': False}).eq('id', response.data[0]['id']).execute()
+        st.warning("첨부 파일 업로드 작업을 찾을 수 없습니다. 첨부 파일을 다시 올려 주세요.")
     st.success("정비 이력 추가 완료")
-    st.cache_data.clear()
+    invalidate_log_caches()
+    refresh_log_search_entry(response.data[0]['id'])
 
 def update_log(log_id, engineer, action, notes, uploaded_images, action_category=None):
     if uploaded_images:
@@ -385,34 +1129,31 @@ def update_log(log_id, engineer, action, notes, uploaded_images, action_category
         }).eq('id', log_id).execute()
     st.success("정비 이력 업데이트 완료")
     st.cache_data.clear()
+    refresh_log_search_entry(log_id)
     st.session_state.selected_log_id_admin = None
 
 def delete_log(log_id):
     current_log_data = supabase.from_('maintenance_logs').select('image_urls').eq('id', log_id).single().execute().data
-    old_urls = current_log_data['image_urls'].split(',') if current_log_data and current_log_data['image_urls'] else []
-    for url in old_urls:
-        try:
-            file_name = url.split('/')[-1]
-            supabase.storage.from_('equipment_images').remove([file_name])
-        except Exception as e:
-            st.warning(f"기존 이미지 삭제 실패: {e}")
+    remove_storage_objects('equipment_images', split_urls(current_log_data and current_log_data['image_urls']))
 
     supabase.from_('maintenance_logs').delete().eq('id', log_id).execute()
     st.success("정비 이력 삭제 완료")
     st.cache_data.clear()
+    refresh_log_search_entry(log_id, deleted=True)
     st.session_state.selected_log_id_admin = None
 
 def add_status_history(equipment_id, status, notes, history_date, history_time):
     combined_dt = datetime.combine(history_date, history_time)
-    supabase.from_('equipment_status_history').insert({
-        'equipment_id': equipment_id,
-        'status': status,
-        'notes': notes,
-        'created_at': combined_dt.isoformat()
+    # 이력 추가와 설비 상태 변경을 단일 트랜잭션 RPC로 처리
+    supabase.rpc('record_equipment_status', {
+        'p_equipment_id': equipment_id,
+        'p_status': status,
+        'p_notes': notes,
+        'p_created_at': combined_dt.isoformat()
     }).execute()
-    supabase.from_('equipment').update({'status': status}).eq('id', equipment_id).execute()
     st.success(f"상태 '{status}' 기록 완료")
-    st.cache_data.clear()
+    invalidate_status_caches()
+    patch_equipment_row(equipment_id, status=status)
 
 def update_status_history(history_id, status, notes):
     supabase.from_('equipment_status_history').update({
@@ -421,6 +1162,7 @@ def update_status_history(history_id, status, notes):
     }).eq('id', history_id).execute()
     st.success("상태 기록이 업데이트 되었습니다.")
     st.cache_data.clear()
+    mark_status_intervals_stale(full=True)
     st.session_state.selected_status_id_admin = None
 
 def delete_status_history(history_id):
@@ -428,6 +1170,7 @@ def delete_status_history(history_id):
     st.success("상태 기록이 삭제 되었습니다.")
     st.session_state.selected_status_id_admin = None
     st.cache_data.clear()
+    mark_status_intervals_stale(full=True)
 
 def get_date_value(date_str):
     if not date_str or date_str.lower() == 'n/a':
@@ -440,52 +1183,1047 @@ def get_date_value(date_str):
             pass
     return None
 
+def make_document_filename(original_filename):
+    """Storage에 저장할 고유 문서 파일명 생성"""
+    # 파일명 안전하게 변환 (특수 문자 치환 및 공백 처리)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    sanitized_filename = re.sub(r'[<>:"/\\|?*\[\]]', '_', original_filename)  # 특수 문자 치환
+    sanitized_filename = re.sub(r'\s+', '_', sanitized_filename)  # 공백을 _로 치환
+    return f"{timestamp}_{uuid.uuid4().hex[:8]}_{sanitized_filename}"  # UUID 추가로 고유성 강화
+
 def upload_document_to_supabase(file):
-    """Supabase Storage에 문서 업로드"""
+    """Supabase Storage에 문서 업로드 (대용량 파일은 청크 단위 재개 가능 업로드)"""
     try:
-        # 파일명 안전하게 변환 (특수 문자 치환 및 공백 처리)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        original_filename = file.name
-        sanitized_filename = re.sub(r'[<>:"/\\|?*\[\]]', '_', original_filename)  # 특수 문자 치환
-        sanitized_filename = re.sub(r'\s+', '_', sanitized_filename)  # 공백을 _로 치환
-        unique_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{sanitized_filename}"  # UUID 추가로 고유성 강화
-        
-        # "documents" 버킷에 업로드
-        response = supabase.storage.from_('documents').upload(unique_filename, file.getvalue(), {
-            'content-type': file.type
-        })
+        size = get_stream_size(file)
+        resume_key = f"documents:{getattr(file, 'file_id', file.name)}:{size}"
+        uploads = st.session_state.setdefault('resumable_uploads', {})
+
+        if size > RESUMABLE_UPLOAD_THRESHOLD:
+            # 이전 시도에서 중단된 업로드가 있으면 같은 객체 이름으로 이어서 업로드
+            object_name = uploads.get(resume_key, {}).get('object_name') or make_document_filename(file.name)
+            upload_stream_resumable(file, size, 'documents', object_name, file.type, uploads, resume_key)
+        else:
+            object_name = make_document_filename(file.name)
+            file.seek(0)
+            supabase.storage.from_('documents').upload(object_name, file.read(), {
+                'content-type': file.type
+            })
         # 공개 URL 가져오기
-        public_url = supabase.storage.from_('documents').get_public_url(unique_filename)
+        public_url = supabase.storage.from_('documents').get_public_url(object_name)
         return public_url
     except Exception as e:
         st.error(f"파일 업로드 실패: {str(e)}")
         return None
 
-# ============ 설비 템플릿 관리 함수 ============
+# ------------------------------------------------------
+# 재개 가능한 청크 업로드 (TUS 프로토콜)
+# ------------------------------------------------------
+# Supabase Storage의 TUS 엔드포인트. 로컬 테스트 서버를 쓰려면 RESUMABLE_UPLOAD_ENDPOINT로 덮어쓴다.
+RESUMABLE_UPLOAD_ENDPOINT = os.getenv("RESUMABLE_UPLOAD_ENDPOINT") or f"{SUPABASE_URL}/storage/v1/upload/resumable"
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024  # Supabase는 마지막 청크를 제외하고 6MB 청크만 허용
+RESUMABLE_UPLOAD_THRESHOLD = RESUMABLE_CHUNK_SIZE
+RESUMABLE_MAX_RETRIES = 5
+
+def get_stream_size(stream):
+    """업로드 파일(또는 파일 객체)의 전체 크기 계산"""
+    size = getattr(stream, 'size', None)
+    if size is None:
+        position = stream.tell()
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        stream.seek(position)
+    return size
+
+def upload_stream_resumable(stream, size, bucket, object_name, content_type, resume_store, resume_key, persist=None):
+    """스트림을 청크 단위로 업로드 (resumable_upload.upload_stream에 엔드포인트/키를 채워 호출)"""
+    return resumable_upload.upload_stream(
+        RESUMABLE_UPLOAD_ENDPOINT, SUPABASE_KEY, stream, size, bucket, object_name, content_type,
+        resume_store, resume_key, persist=persist, chunk_size=RESUMABLE_CHUNK_SIZE, max_retries=RESUMABLE_MAX_RETRIES
+    )
 
-def get_equipment_templates():
-    """모든 활성화된 설비 템플릿 조회"""
+# ------------------------------------------------------
+# Storage 고아 객체 정리 (GC)
+# ------------------------------------------------------
+STORAGE_BUCKETS = ('equipment_images', 'documents')
+STORAGE_GC_PAGE_SIZE = 1000
+STORAGE_GC_DELETE_BATCH = 100
+STORAGE_GC_MIN_AGE_HOURS = 24  # 업로드 직후 아직 DB에 반영되지 않은 파일은 건드리지 않음
+
+def storage_url_ref(url, default_bucket):
+    """공개 URL을 (버킷, 객체 이름)으로 변환"""
+    match = re.search(r'/storage/v1/object/public/([^/]+)/', url)
+    return (match.group(1) if match else default_bucket), storage_object_name(url)
+
+def iter_table_rows(table, columns, page_size=STORAGE_GC_PAGE_SIZE):
+    """테이블 전체를 페이지 단위로 순회"""
+    start = 0
+    while True:
+        rows = supabase.table(table).select(columns).order('id').range(start, start + page_size - 1).execute().data or []
+        yield from rows
+        if len(rows) < page_size:
+            break
+        start += page_size
+
+def iter_bucket_objects(bucket, page_size=STORAGE_GC_PAGE_SIZE):
+    """버킷 최상위 객체를 페이지 단위로 순회 (폴더는 제외)"""
+    offset = 0
+    while True:
+        items = supabase.storage.from_(bucket).list('', {
+            'limit': page_size,
+            'offset': offset,
+            'sortBy': {'column': 'name', 'order': 'asc'}
+        }) or []
+        for item in items:
+            if item.get('id'):  # 폴더(logo_image 등)는 id가 없음
+                yield item
+        if len(items) < page_size:
+            break
+        offset += page_size
+
+def collect_storage_references():
+    """DB가 참조하는 Storage 객체 이름을 버킷별 set 인덱스로 수집"""
+    references = {bucket: set() for bucket in STORAGE_BUCKETS}
+
+    def add(url, default_bucket):
+        if url and url.strip():
+            bucket, name = storage_url_ref(url, default_bucket)
+            references.setdefault(bucket, set()).add(name)
+
+    for row in iter_table_rows('equipment', 'id, image_urls, documents, details'):
+        for url in split_urls(row.get('image_urls')):
+            add(url, 'equipment_images')
+        for doc in parse_json_list(row.get('documents')):
+            if isinstance(doc, dict):
+                add(doc.get('url'), 'documents')
+        try:
+            details = row.get('details')
+            details = details if isinstance(details, dict) else json.loads(details or '{}')
+        except (TypeError, ValueError):
+            details = {}
+        for url in split_urls(details.get('document_urls') if isinstance(details, dict) else None):
+            add(url, 'documents')
+    for row in iter_table_rows('maintenance_logs', 'id, image_urls'):
+        for url in split_urls(row.get('image_urls')):
+            add(url, 'equipment_images')
+    return references
+
+def run_storage_gc(dry_run=True, min_age_hours=STORAGE_GC_MIN_AGE_HOURS):
+    """참조되지 않는 Storage 객체를 찾아 배치 삭제하고 결과 리포트를 반환"""
+    report = {
+        'dry_run': dry_run,
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'finished_at': None,
+        'buckets': {},
+        'error': None
+    }
     try:
-        response = supabase.table('equipment_templates').select('*').eq('is_active', True).order('created_at').execute()
-        
-        # fields_config가 JSON 문자열이면 파싱 필요
-        if response.data:
-            for template in response.data:
-                if isinstance(template['fields_config'], str):
-                    template['fields_config'] = json.loads(template['fields_config'])
-        
-        return response.data if response.data else []
+        references = collect_storage_references()
+        cutoff = datetime.now().timestamp() - min_age_hours * 3600
+        for bucket in STORAGE_BUCKETS:
+            referenced = references.get(bucket, set())
+            scanned = 0
+            orphans = []
+            for item in iter_bucket_objects(bucket):
+                scanned += 1
+                if item['name'] in referenced:
+                    continue
+                created_at = item.get('created_at')
+                if created_at and datetime.fromisoformat(created_at.replace('Z', '+00:00')).timestamp() > cutoff:
+                    continue
+                orphans.append({'name': item['name'], 'size': (item.get('metadata') or {}).get('size', 0)})
+
+            deleted = 0
+            if not dry_run:
+                names = [orphan['name'] for orphan in orphans]
+                for i in range(0, len(names), STORAGE_GC_DELETE_BATCH):
+                    batch = names[i:i + STORAGE_GC_DELETE_BATCH]
+                    supabase.storage.from_(bucket).remove(batch)
+                    deleted += len(batch)
+
+            report['buckets'][bucket] = {
+                'scanned': scanned,
+                'referenced': len(referenced),
+                'orphans': orphans,
+                'orphan_bytes': sum(orphan['size'] or 0 for orphan in orphans),
+                'deleted': deleted
+            }
     except Exception as e:
-        st.error(f"템플릿 조회 실패: {str(e)}")
+        report['error'] = str(e)
+    report['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    return report
+
+@st.cache_resource
+def get_storage_gc_job():
+    """프로세스 전체에서 공유하는 GC 작업 상태"""
+    return {'thread': None, 'report': None, 'lock': threading.Lock()}
+
+def start_storage_gc(dry_run=True):
+    """백그라운드 스레드에서 GC 실행 (이미 실행 중이면 False)"""
+    job = get_storage_gc_job()
+    with job['lock']:
+        if job['thread'] and job['thread'].is_alive():
+            return False
+
+        def worker():
+            job['report'] = run_storage_gc(dry_run=dry_run)
+
+        job['thread'] = threading.Thread(target=worker, name='storage-gc', daemon=True)
+        job['thread'].start()
+    return True
+
+# ------------------------------------------------------
+# 백그라운드 첨부 업로드 (로컬 스풀 + 워커 스레드)
+# ------------------------------------------------------
+# 작업 하나 = 스풀 폴더 하나: job.json(메타데이터/진행 상황) + files/ (원본 바이트)
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.upload_spool')
+UPLOAD_WORKER_POLL_SECONDS = 5
+UPLOAD_STAGED_EXPIRE_HOURS = 24  # DB 기록까지 가지 못한 스풀은 이 시간 후 삭제
+
+def _write_upload_job(job_dir, job):
+    """job.json 원자적 저장 (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)"""
+    tmp_path = os.path.join(job_dir, 'job.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(job, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(job_dir, 'job.json'))
+
+def _read_upload_job(job_dir):
+    try:
+        with open(os.path.join(job_dir, 'job.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def spool_attachments(kind, attachments, factory_id=None, label=''):
+    """업로드 파일을 스풀에 청크 단위로 복사하고 작업 ID 반환 (DB 기록 전 'staged' 상태)
+
+    attachments: (업로드 파일, 'image' | 'document') 목록
+    """
+    job_id = f"{datetime.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:8]}"
+    job_dir = os.path.join(UPLOAD_SPOOL_DIR, job_id)
+    os.makedirs(os.path.join(job_dir, 'files'))
+    files = []
+    for index, (uploaded_file, role) in enumerate(attachments):
+        relative_path = os.path.join('files', str(index))
+        uploaded_file.seek(0)
+        with open(os.path.join(job_dir, relative_path), 'wb') as out:
+            shutil.copyfileobj(uploaded_file, out, RESUMABLE_CHUNK_SIZE)
+        files.append({
+            'file': relative_path,
+            'name': uploaded_file.name,
+            'content_type': uploaded_file.type,
+            'role': role,
+            'size': get_stream_size(uploaded_file)
+        })
+    _write_upload_job(job_dir, {
+        'id': job_id,
+        'kind': kind,
+        'record_id': None,
+        'factory_id': factory_id,
+        'label': label,
+        'status': 'staged',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'files': files,
+        'uploaded': {},
+        'resume': {},
+        'attempts': 0,
+        'next_attempt_at': 0,
+        'error': None
+    })
+    return job_id
+
+def queue_spooled_attachments(job_id, record_id):
+    """DB 레코드가 생긴 뒤 작업을 업로드 대기열에 올림 (작업을 찾을 수 없으면 False)"""
+    job_dir = os.path.join(UPLOAD_SPOOL_DIR, job_id)
+    job = _read_upload_job(job_dir)
+    if not job:
+        return False  # 스풀이 삭제되었거나 job.json이 손상됨
+    job['record_id'] = record_id
+    job['status'] = 'queued'
+    _write_upload_job(job_dir, job)
+    ensure_upload_worker()['wake'].set()
+    return True
+
+def discard_spooled_attachments(job_id):
+    shutil.rmtree(os.path.join(UPLOAD_SPOOL_DIR, job_id), ignore_errors=True)
+
+def list_upload_jobs():
+    """스풀에 남아 있는 (아직 끝나지 않은) 업로드 작업 목록"""
+    if not os.path.isdir(UPLOAD_SPOOL_DIR):
         return []
+    jobs = []
+    for job_id in sorted(os.listdir(UPLOAD_SPOOL_DIR)):
+        job = _read_upload_job(os.path.join(UPLOAD_SPOOL_DIR, job_id))
+        if job:
+            jobs.append(job)
+    return jobs
+
+def _upload_job_file(job_dir, job, index, item):
+    """작업의 파일 하나를 업로드하고 공개 URL 반환"""
+    bucket = 'equipment_images' if item['role'] == 'image' else 'documents'
+    if not item.get('object_name'):
+        # 재시도 시 같은 객체 이름을 쓰도록 먼저 기록
+        if item['role'] == 'image':
+            item['object_name'] = f"{uuid.uuid4()}.{item['name'].split('.')[-1]}"
+        else:
+            item['object_name'] = make_document_filename(item['name'])
+        _write_upload_job(job_dir, job)
+    with open(os.path.join(job_dir, item['file']), 'rb') as stream:
+        if item['size'] > RESUMABLE_UPLOAD_THRESHOLD:
+            upload_stream_resumable(stream, item['size'], bucket, item['object_name'], item['content_type'], job['resume'], str(index),
+                                    persist=lambda: _write_upload_job(job_dir, job))
+        else:
+            supabase.storage.from_(bucket).upload(item['object_name'], stream.read(), {
+                'content-type': item['content_type'] or 'application/octet-stream',
+                'upsert': 'true'
+            })
+    return supabase.storage.from_(bucket).get_public_url(item['object_name'])
+
+def process_upload_job(job_dir):
+    """대기 중인 작업 하나 처리: 파일 업로드 → DB에 URL 반영 → 스풀 삭제"""
+    job = _read_upload_job(job_dir)
+    if not job:
+        return
+    if job['status'] == 'staged':
+        created_at = datetime.fromisoformat(job['created_at'])
+        if (datetime.now() - created_at).total_seconds() > UPLOAD_STAGED_EXPIRE_HOURS * 3600:
+            shutil.rmtree(job_dir, ignore_errors=True)
+        return
+    if job['status'] != 'queued' or job.get('next_attempt_at', 0) > datetime.now().timestamp():
+        return
 
-def get_template_by_name(name):
-    """특정 이름의 템플릿 조회"""
     try:
-        response = supabase.table('equipment_templates').select('*').eq('name', name).eq('is_active', True).single().execute()  # is_active 체크 추가
-        return response.data
+        for index, item in enumerate(job['files']):
+            if str(index) in job['uploaded']:
+                continue
+            job['uploaded'][str(index)] = _upload_job_file(job_dir, job, index, item)
+            _write_upload_job(job_dir, job)
+
+        image_urls = ','.join(job['uploaded'][str(i)] for i, item in enumerate(job['files']) if item['role'] == 'image')
+        if job['kind'] == 'equipment':
+            documents = [
+                {
+                    '기술 자료명': item['name'],
+                    '취급 설명서': '',
+                    '전기 도면': '',
+                    '유.증압도면': '',
+                    '윤활 기준표': '',
+                    'url': job['uploaded'][str(i)],
+                    'file_type': item['content_type']
+                }
+                for i, item in enumerate(job['files']) if item['role'] == 'document'
+            ]
+            supabase.rpc('append_equipment_attachments', {
+                'p_equipment_id': job['record_id'],
+                'p_image_urls': image_urls or None,
+                'p_documents': documents
+            }).execute()
+        else:
+            supabase.rpc('append_log_attachments', {
+                'p_log_id': job['record_id'],
+                'p_image_urls': image_urls or None
+            }).execute()
+    except Exception as e:
+        job['attempts'] += 1
+        job['error'] = str(e)
+        job['next_attempt_at'] = datetime.now().timestamp() + min(60 * 2 ** job['attempts'], 3600)
+        _write_upload_job(job_dir, job)
+        return
+
+    shutil.rmtree(job_dir, ignore_errors=True)
+    # 작업이 바꾼 행의 캐시만 무효화 (작업 스레드에서 전체 캐시를 비우면 모든 세션이 다시 조회하게 됨)
+    if job['kind'] == 'equipment':
+        get_equipment.clear()
+        get_equipment_by_id.clear()
+    else:
+        get_maintenance_logs.clear()
+
+def _upload_worker_loop(worker):
+    while True:
+        for job in list_upload_jobs():
+            process_upload_job(os.path.join(UPLOAD_SPOOL_DIR, job['id']))
+        worker['wake'].wait(UPLOAD_WORKER_POLL_SECONDS)
+        worker['wake'].clear()
+
+@st.cache_resource
+def get_upload_worker():
+    """프로세스 전체에서 하나만 도는 업로드 워커 상태"""
+    return {'thread': None, 'wake': threading.Event(), 'lock': threading.Lock()}
+
+def ensure_upload_worker():
+    """워커 스레드가 없으면 시작 (재시작 후 남은 스풀 작업도 이어서 처리)"""
+    worker = get_upload_worker()
+    with worker['lock']:
+        if not (worker['thread'] and worker['thread'].is_alive()):
+            os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+            worker['thread'] = threading.Thread(target=_upload_worker_loop, args=(worker,), name='upload-worker', daemon=True)
+            worker['thread'].start()
+    return worker
+
+def render_upload_status(factory_id):
+    """현재 공장의 첨부 업로드 진행 상황 표시"""
+    jobs = [job for job in list_upload_jobs() if job['status'] == 'queued' and job.get('factory_id') == factory_id]
+    if not jobs:
+        return
+    with st.expander(f"⏳ 첨부 파일 업로드 진행 중 ({len(jobs)}건)"):
+        for job in jobs:
+            st.write(f"**{job['label']}**: {len(job['uploaded'])}/{len(job['files'])}개 업로드 완료")
+            if job['error']:
+                st.caption(f"재시도 대기 중 ({job['attempts']}회 실패): {job['error']}")
+        if st.button("🔄 새로고침", key="upload_status_refresh"):
+            st.rerun()
+
+# ------------------------------------------------------
+# 정비 이력 전문 검색 (백그라운드 빌드 + 증분 갱신 역색인)
+# ------------------------------------------------------
+LOG_SEARCH_WEIGHTS = {
+    'action': 3.0,
+    'action_category': 2.0,
+    'notes': 2.0,
+    'engineer': 1.5,
+    'equipment_name': 1.0,
+}
+LOG_SEARCH_COLUMNS = 'id, equipment_id, maintenance_date, engineer, action, notes, action_category, equipment(name, factory_id, factories(name))'
+LOG_SEARCH_BATCH_SIZE = 1000
+LOG_SEARCH_LIMIT = 200
+LOG_SEARCH_REBUILD_MINUTES = int(os.getenv('LOG_SEARCH_REBUILD_MINUTES', '60'))  # 다른 경로의 변경을 따라잡기 위한 전체 재빌드 주기
+LOG_SEARCH_RETRY_SECONDS = 60
+
+@st.cache_resource
+def get_log_search_state():
+    """프로세스 전체에서 공유하는 정비 이력 검색 인덱스.
+    pending/removed_equipment는 빌드 중에만 값이 있으며, 빌드 도중 들어온 변경을 새 인덱스에 다시 적용하는 데 쓴다."""
+    return {'lock': threading.Lock(), 'index': None, 'entries': {}, 'pending': None, 'removed_equipment': None,
+            'thread': None, 'built_at': None, 'attempted_at': None, 'error': None}
+
+def _log_search_entries(rows):
+    """조회한 정비 이력 행을 검색 결과 표시/필터용 항목으로 변환"""
+    entries = []
+    for row in normalize_timestamp_column(rows, 'maintenance_date'):
+        equipment = row.get('equipment') or {}
+        entries.append({
+            'id': row['id'],
+            'equipment_id': row.get('equipment_id'),
+            'equipment_name': equipment.get('name'),
+            'factory_id': equipment.get('factory_id'),
+            'factory_name': (equipment.get('factories') or {}).get('name'),
+            'maintenance_date_value': row['maintenance_date_value'],
+            'maintenance_date_display': row['maintenance_date_display'],
+            'engineer': row.get('engineer'),
+            'action': row.get('action'),
+            'notes': row.get('notes'),
+            'action_category': row.get('action_category'),
+        })
+    return entries
+
+def _apply_log_search_entry(index, entries, log_id, entry):
+    if entry is None:
+        entries.pop(log_id, None)
+        index.remove(log_id)
+    else:
+        entries[log_id] = entry
+        index.add(log_id, {field: entry.get(field) for field in LOG_SEARCH_WEIGHTS})
+
+def _build_log_search_index(state):
+    try:
+        index, entries = SearchIndex(LOG_SEARCH_WEIGHTS), {}
+        start = 0
+        while True:
+            res = supabase.from_('maintenance_logs').select(LOG_SEARCH_COLUMNS).order('id').range(start, start + LOG_SEARCH_BATCH_SIZE - 1).execute()
+            rows = res.data or []
+            for entry in _log_search_entries(rows):
+                _apply_log_search_entry(index, entries, entry['id'], entry)
+            if len(rows) < LOG_SEARCH_BATCH_SIZE:
+                break
+            start += LOG_SEARCH_BATCH_SIZE
+        with state['lock']:
+            for log_id, entry in state['pending'].items():
+                _apply_log_search_entry(index, entries, log_id, entry)
+            _remove_equipment_logs(index, entries, state['removed_equipment'])
+            state.update(index=index, entries=entries, pending=None, removed_equipment=None, built_at=datetime.now(), error=None)
     except Exception as e:
+        with state['lock']:
+            state.update(pending=None, removed_equipment=None, error=str(e))
+
+def ensure_log_search_index():
+    """인덱스가 없거나 오래됐으면 백그라운드 스레드로 (재)빌드. 재빌드 중에는 이전 인덱스로 검색된다."""
+    state = get_log_search_state()
+    now = datetime.now()
+    with state['lock']:
+        if state['thread'] is not None and state['thread'].is_alive():
+            return state
+        if state['index'] is None:
+            due = state['attempted_at'] is None or now - state['attempted_at'] > timedelta(seconds=LOG_SEARCH_RETRY_SECONDS)
+        else:
+            due = state['built_at'] is None or now - state['built_at'] > timedelta(minutes=LOG_SEARCH_REBUILD_MINUTES)
+        if due:
+            state.update(pending={}, removed_equipment=set(), attempted_at=now)
+            state['thread'] = threading.Thread(target=_build_log_search_index, args=(state,), name='log-search-indexer', daemon=True)
+            state['thread'].start()
+    return state
+
+def refresh_log_search_entry(log_id, deleted=False):
+    """정비 이력 추가/수정/삭제 후 해당 이력 한 건만 인덱스에 반영"""
+    state = get_log_search_state()
+    with state['lock']:
+        if state['index'] is None and state['pending'] is None:
+            return  # 아직 빌드 전이면 첫 빌드에서 함께 읽힘
+    entry = None
+    if not deleted:
+        try:
+            res = supabase.from_('maintenance_logs').select(LOG_SEARCH_COLUMNS).eq('id', log_id).execute()
+        except Exception:
+            # 반영하지 못한 변경은 다음 검색 때 전체 재빌드로 따라잡음
+            with state['lock']:
+                state['built_at'] = None
+            return
+        found = _log_search_entries(res.data or [])
+        entry = found[0] if found else None
+    with state['lock']:
+        if state['index'] is not None:
+            _apply_log_search_entry(state['index'], state['entries'], log_id, entry)
+        if state['pending'] is not None:
+            state['pending'][log_id] = entry
+
+def _remove_equipment_logs(index, entries, equipment_ids):
+    for log_id in [log_id for log_id, entry in entries.items() if entry['equipment_id'] in equipment_ids]:
+        _apply_log_search_entry(index, entries, log_id, None)
+
+def remove_equipment_from_log_search(equipment_id):
+    """설비 삭제 시 함께 삭제된 정비 이력을 인덱스에서 제거"""
+    state = get_log_search_state()
+    with state['lock']:
+        if state['index'] is not None:
+            _remove_equipment_logs(state['index'], state['entries'], {equipment_id})
+        if state['removed_equipment'] is not None:
+            state['removed_equipment'].add(equipment_id)
+
+def search_maintenance_logs(query, factory_id=None, categories=None, date_from=None, date_to=None, limit=LOG_SEARCH_LIMIT):
+    """정비 이력 전문 검색. 인덱스가 아직 없으면 None, 있으면 (일치도, 최신순) 정렬된 항목 목록"""
+    state = ensure_log_search_index()
+    with state['lock']:
+        if state['index'] is None:
+            return None
+        ranked = state['index'].search(query)
+        results = []
+        for log_id, score in ranked:
+            entry = state['entries'][log_id]
+            if factory_id is not None and entry['factory_id'] != factory_id:
+                continue
+            if categories and entry['action_category'] not in categories:
+                continue
+            value = entry['maintenance_date_value']
+            if (date_from or date_to) and value is None:
+                continue
+            if date_from and value.date() < date_from:
+                continue
+            if date_to and value.date() > date_to:
+                continue
+            results.append({**entry, 'score': round(score, 2)})
+    results.sort(key=lambda entry: (-entry['score'], -(entry['maintenance_date_value'].timestamp() if entry['maintenance_date_value'] is not None else 0)))
+    return results[:limit]
+
+def log_search_categories():
+    """인덱스에 있는 작업 분류 값 (분류는 입력 당시 언어로 저장되므로 실제 값에서 수집)"""
+    state = get_log_search_state()
+    with state['lock']:
+        return sorted({entry['action_category'] for entry in state['entries'].values() if entry['action_category']})
+
+# ------------------------------------------------------
+# 신뢰성 지표 (상태 이력 구간 -> 고장 횟수 / MTBF / MTTR / 가동률)
+# ------------------------------------------------------
+# 상태 이력을 설비별 시간순 구간(다음 기록 전까지 해당 상태)으로 바꾸고, 기간별 지표는 구간 길이를 잘라 합산한다.
+# 매각 구간은 가동률 분모에서 제외하고, MTTR은 고장 1회당 평균 고장 시간으로 계산한다.
+RELIABILITY_STATES = {'정상': 'up', '고장': 'down', '매각': 'retired'}
+RELIABILITY_STATUS_KEYS = {'normal': '정상', 'faulty': '고장', 'sold': '매각'}
+RELIABILITY_PERIOD_DAYS = {'reliability_last_30_days': 30, 'reliability_last_90_days': 90, 'reliability_last_year': 365}  # 번역 키 → 일수
+# 상태 이력은 마지막으로 받은 시각 이후 행만 추가로 읽고, 수정/삭제나 공장 이동을 반영하도록 가끔 전체를 다시 읽음
+RELIABILITY_SYNC_SECONDS = 30
+RELIABILITY_FULL_SYNC_MINUTES = int(os.getenv('RELIABILITY_FULL_SYNC_MINUTES', '60'))
+RELIABILITY_SYNC_OVERLAP = timedelta(seconds=60)  # 늦게 커밋된 이력을 놓치지 않도록 증분 구간을 겹침
+# 지표 컬럼 → 표시 이름 번역 키
+RELIABILITY_COLUMNS = {
+    'failures': 'reliability_failures',
+    'up_hours': 'reliability_up_hours',
+    'down_hours': 'reliability_down_hours',
+    'mtbf_hours': 'reliability_mtbf_hours',
+    'mttr_hours': 'reliability_mttr_hours',
+    'availability': 'reliability_availability',
+}
+
+@st.cache_resource
+def reliability_state_map():
+    """상태 값 -> 'up'/'down'/'retired'. 상태 기록 폼이 번역된 문자열로 저장한 이력도 모든 언어 카탈로그로 해석"""
+    mapping = dict(RELIABILITY_STATES)
+    for file_name in sorted(os.listdir(LOCALES_DIR)):
+        if file_name.endswith('.json'):
+            catalog = load_translation_catalog(file_name[:-len('.json')])
+            for key, status in RELIABILITY_STATUS_KEYS.items():
+                mapping.setdefault(catalog[key], RELIABILITY_STATES[status])
+    return mapping
+
+def build_status_intervals(history):
+    """상태 이력(equipment_id, status, created_at_value) -> 설비별 상태 구간.
+    구간 끝은 같은 설비의 다음 기록 시각이며 마지막 구간은 열린 구간(end=NaT)"""
+    intervals = history.assign(
+        state=history['status'].map(reliability_state_map()),
+        start=pd.to_datetime(history['created_at_value'])
+    ).dropna(subset=['state', 'start']).sort_values(['equipment_id', 'start'], kind='stable')
+    grouped = intervals.groupby('equipment_id', sort=False)
+    intervals['end'] = grouped['start'].shift(-1)
+    intervals['prev_state'] = grouped['state'].shift(1)
+    return intervals[['equipment_id', 'state', 'prev_state', 'start', 'end']].reset_index(drop=True)
+
+def summarize_reliability(intervals, start, end, by=('equipment_id',)):
+    """기간 [start, end) 안에 걸친 구간 길이로 지표 계산. by=()이면 전체 합계 한 행"""
+    state = intervals['state']
+    hours = ((intervals['end'].fillna(end).clip(upper=end) - intervals['start'].clip(lower=start)).dt.total_seconds() / 3600).clip(lower=0)
+    frame = pd.DataFrame({
+        'up_hours': hours.where(state == 'up', 0.0),
+        'down_hours': hours.where(state == 'down', 0.0),
+        # 정상/매각 -> 고장으로 바뀐 시점이 기간 안에 있으면 고장 1회 (고장 -> 고장 재기록은 제외)
+        'failures': ((state == 'down') & (intervals['prev_state'] != 'down')
+                     & (intervals['start'] >= start) & (intervals['start'] < end)).astype(int),
+    })
+    if by:
+        summary = frame.assign(**{column: intervals[column] for column in by}).groupby(list(by)).sum()
+    else:
+        summary = frame.sum().to_frame().T
+    failures = summary['failures'].where(summary['failures'] > 0)
+    tracked = summary['up_hours'] + summary['down_hours']
+    summary['mtbf_hours'] = summary['up_hours'] / failures
+    summary['mttr_hours'] = summary['down_hours'] / failures
+    summary['availability'] = summary['up_hours'] / tracked.where(tracked > 0)
+    return summary.reset_index() if by else summary.reset_index(drop=True)
+
+def month_periods(months, now):
+    """이번 달을 포함한 최근 months개월의 [시작, 끝) 목록 (이번 달 끝은 현재 시각, 월 경계는 now와 같은 UTC 기준)"""
+    first = pd.Timestamp(now).normalize().replace(day=1)
+    starts = [first - pd.DateOffset(months=offset) for offset in range(months - 1, -1, -1)]
+    return [(period_start, min(period_start + pd.DateOffset(months=1), pd.Timestamp(now))) for period_start in starts]
+
+@st.cache_resource
+def get_reliability_cache():
+    """공장별 상태 구간과 지표 캐시 {factory_id: {'signatures', 'intervals', 'summaries'}} (프로세스 전체 공유)"""
+    return {'lock': threading.Lock(), 'factories': {}}
+
+def fetch_status_history_frame(factory_id, since=None):
+    """공장 설비의 상태 이력 (id, equipment_id, status, created_at_value). since 이후 행만, 페이지 단위로 끝까지 읽음"""
+    def build_query():
+        query = supabase.from_('equipment_status_history').select('id, equipment_id, status, created_at, equipment!inner(factory_id)')
+        query = query.eq('equipment.factory_id', factory_id).order('created_at').order('id')
+        if since is not None:
+            query = query.gte('created_at', f"{since.isoformat()}+00:00")  # created_at_value는 UTC 기준
+        return query
+    rows = normalize_timestamp_column(fetch_all_rows(build_query), 'created_at')
+    return pd.DataFrame(rows, columns=['id', 'equipment_id', 'status', 'created_at_value'])
+
+def mark_status_intervals_stale(full=False):
+    """다음 조회 때 새 이력을 바로 읽도록 표시. full이면 (수정/삭제 반영을 위해) 전체를 다시 읽음"""
+    cache = get_reliability_cache()
+    with cache['lock']:
+        for entry in cache['factories'].values():
+            entry['synced_at'] = None
+            if full:
+                entry['full_synced_at'] = None
+
+def _status_history_fresh(entry, now):
+    """최근에 동기화했고 구간이 만들어져 있으면 True (첫 조회 중인 공장은 끝날 때까지 기다리게 함)"""
+    return (entry['intervals'] is not None and entry['synced_at'] is not None
+            and (now - entry['synced_at']).total_seconds() < RELIABILITY_SYNC_SECONDS)
+
+def _plan_status_history_sync(entry, now):
+    """캐시 잠금 안에서 호출. 이번에 읽을 시작 시각(None이면 전체)을 정하고 동기화 시각을 먼저 기록.
+    조회 중에 mark_status_intervals_stale()가 시각을 지우면 다음 조회에서 다시 읽는다."""
+    history = entry['history']
+    latest = history['created_at_value'].max() if history is not None else None
+    entry['synced_at'] = now
+    if (latest is None or pd.isna(latest) or entry['full_synced_at'] is None
+            or now - entry['full_synced_at'] >= timedelta(minutes=RELIABILITY_FULL_SYNC_MINUTES)):
+        entry['full_synced_at'] = now
         return None
+    return pd.Timestamp(latest) - RELIABILITY_SYNC_OVERLAP
+
+def _merge_status_history(entry, fetched, full):
+    """캐시 잠금 안에서 호출. 읽어 온 이력을 반영하고 바뀌었을 수 있으면 True"""
+    if full:
+        entry['history'] = fetched
+        return True
+    # 겹치는 구간에서 다시 받은 행은 버리고 처음 보는 이력만 추가 (수정/삭제는 전체 갱신 때 반영)
+    added = fetched[~fetched['id'].isin(entry['history']['id'])]
+    if added.empty:
+        return False
+    entry['history'] = pd.concat([entry['history'], added], ignore_index=True)
+    return True
+
+def _refresh_status_intervals(entry):
+    """캐시 잠금 안에서 호출. 이력이 바뀐 설비의 구간만 다시 만들고 지표 캐시를 비움"""
+    history = entry['history'][['equipment_id', 'status', 'created_at_value']]
+    hashes = pd.util.hash_pandas_object(history, index=False).groupby(history['equipment_id']).agg(['sum', 'count'])
+    signatures = {equipment_id: (int(row['sum']), int(row['count'])) for equipment_id, row in hashes.iterrows()}
+    changed = {equipment_id for equipment_id, signature in signatures.items() if entry['signatures'].get(equipment_id) != signature}
+    removed = set(entry['signatures']) - set(signatures)
+    if entry['intervals'] is None or changed or removed:
+        fresh = build_status_intervals(history[history['equipment_id'].isin(changed)])
+        if entry['intervals'] is None:
+            entry['intervals'] = fresh
+        else:
+            kept = entry['intervals'][~entry['intervals']['equipment_id'].isin(changed | removed)]
+            entry['intervals'] = pd.concat([kept, fresh], ignore_index=True)
+        entry['signatures'] = signatures
+        entry['summaries'] = {}
+
+def get_status_intervals(factory_id):
+    """공장 상태 구간과 캐시 항목. 이력이 바뀐 설비(행 해시 합/건수가 다른 설비)의 구간만 다시 계산.
+    이력 조회는 RELIABILITY_SYNC_SECONDS 안에 한 번만 하므로 한 화면에서 여러 번 호출해도 다시 읽지 않음.
+    DB 조회는 프로세스 전체 잠금 밖에서 하고, 같은 공장의 동기화만 공장별 잠금으로 한 번에 하나씩 수행"""
+    cache = get_reliability_cache()
+    now = datetime.now()
+    with cache['lock']:
+        entry = cache['factories'].setdefault(factory_id, {
+            'history': None, 'synced_at': None, 'full_synced_at': None,
+            'signatures': {}, 'intervals': None, 'summaries': {}, 'sync_lock': threading.Lock()
+        })
+        if _status_history_fresh(entry, now):
+            return entry
+    with entry['sync_lock']:
+        with cache['lock']:
+            if _status_history_fresh(entry, now):
+                return entry  # 기다리는 동안 다른 세션이 갱신함
+            since = _plan_status_history_sync(entry, now)
+        try:
+            fetched = fetch_status_history_frame(factory_id, since=since)
+        except Exception:
+            with cache['lock']:
+                entry['synced_at'] = None
+                if since is None:
+                    entry['full_synced_at'] = None
+            raise
+        with cache['lock']:
+            if _merge_status_history(entry, fetched, full=since is None) or entry['intervals'] is None:
+                _refresh_status_intervals(entry)
+    return entry
+
+def get_reliability_summary(factory_id, days=None, months=None, by=('equipment_id',)):
+    """최근 days일 지표(by 단위) 또는 최근 months개월 월별 지표. 구간이 바뀌지 않았으면 같은 시간대 안에서는 캐시된 결과"""
+    entry = get_status_intervals(factory_id)
+    now = utc_now()  # 구간 시각(created_at_value)과 같은 UTC 기준
+    key = (days, months, tuple(by), now.floor('h'))
+    summary = entry['summaries'].get(key)
+    if summary is None:
+        if months:
+            summary = pd.concat([
+                summarize_reliability(entry['intervals'], period_start, period_end, by).assign(period=period_start)
+                for period_start, period_end in month_periods(months, now)
+            ], ignore_index=True)
+        else:
+            summary = summarize_reliability(entry['intervals'], now - pd.Timedelta(days=days), now, by)
+        # 지난 시간대 결과는 버림
+        entry['summaries'] = {cached_key: value for cached_key, value in entry['summaries'].items() if cached_key[-1] == key[-1]}
+        entry['summaries'][key] = summary
+    return summary
+
+# (설비 × 일) 고장 시간 큐브: 최근 DOWNTIME_CUBE_DAYS일을 float32 행렬 하나로 보관
+DOWNTIME_CUBE_DAYS = 730
+DOWNTIME_HEATMAP_RANGES = {  # 번역 키 → (일수, 칸 크기(일))
+    'downtime_heatmap_last_90_days_daily': (90, 1),
+    'downtime_heatmap_last_year_weekly': (365, 7),
+    'downtime_heatmap_last_2_years_weekly': (730, 7),
+}
+
+def _downtime_matrix(intervals, equipment_ids, origin, days, now):
+    """equipment_ids 순서의 (설비 × 일) 고장 시간(h) 행렬. origin은 첫날 0시.
+    구간마다 첫날/마지막 날 부분 시간은 직접 더하고, 사이의 온전한 날(24h)은 차분 배열 누적합으로 채운다."""
+    matrix = np.zeros((len(equipment_ids), days), dtype=np.float32)
+    row_of = {equipment_id: row for row, equipment_id in enumerate(equipment_ids)}
+    down = intervals[(intervals['state'] == 'down') & intervals['equipment_id'].isin(row_of)]
+    if down.empty:
+        return matrix
+    window_hours = days * 24
+    start = ((down['start'] - origin).dt.total_seconds() / 3600).clip(lower=0, upper=window_hours).to_numpy()
+    end = ((down['end'].fillna(now) - origin).dt.total_seconds() / 3600).clip(lower=0, upper=window_hours).to_numpy()
+    rows = down['equipment_id'].map(row_of).to_numpy()
+    keep = end > start
+    start, end, rows = start[keep], end[keep], rows[keep]
+    first_day = np.floor(start / 24).astype(int)
+    last_day = np.ceil(end / 24).astype(int) - 1  # 끝 시각은 포함하지 않음
+
+    same_day = first_day == last_day
+    np.add.at(matrix, (rows[same_day], first_day[same_day]), end[same_day] - start[same_day])
+
+    multi = ~same_day
+    rows, start, end, first_day, last_day = rows[multi], start[multi], end[multi], first_day[multi], last_day[multi]
+    np.add.at(matrix, (rows, first_day), (first_day + 1) * 24 - start)
+    np.add.at(matrix, (rows, last_day), end - last_day * 24)
+    full_days = np.zeros((matrix.shape[0], days + 1), dtype=np.float32)
+    np.add.at(full_days, (rows, first_day + 1), 24)
+    np.add.at(full_days, (rows, last_day), -24)
+    matrix += np.cumsum(full_days, axis=1)[:, :days]
+    return matrix
+
+def get_downtime_cube(factory_id):
+    """공장 고장 시간 큐브 {'origin', 'equipment_ids', 'hours'}.
+    이력이 바뀐 설비와 진행 중인 고장(현재 시각까지 늘어남)이 있는 설비의 행만 다시 계산하고, 날짜가 바뀌면 전체를 다시 만든다."""
+    entry = get_status_intervals(factory_id)
+    now = utc_now()  # 구간 시각과 같은 UTC 기준 (일 경계도 UTC 자정)
+    origin = now.normalize() - pd.Timedelta(days=DOWNTIME_CUBE_DAYS - 1)
+    with get_reliability_cache()['lock']:
+        intervals = entry['intervals']
+        equipment_ids = sorted(entry['signatures'], key=str)
+        cube = entry.get('cube')
+        if cube is None or cube['origin'] != origin:
+            cube = {'origin': origin, 'equipment_ids': equipment_ids,
+                    'hours': _downtime_matrix(intervals, equipment_ids, origin, DOWNTIME_CUBE_DAYS, now)}
+        else:
+            stale = {equipment_id for equipment_id, signature in entry['signatures'].items() if cube['signatures'].get(equipment_id) != signature}
+            stale |= set(intervals.loc[(intervals['state'] == 'down') & intervals['end'].isna(), 'equipment_id'])
+            if equipment_ids != cube['equipment_ids']:
+                # 설비가 추가/삭제되면 남은 행만 새 순서로 옮김
+                old_rows = {equipment_id: row for row, equipment_id in enumerate(cube['equipment_ids'])}
+                hours = np.zeros((len(equipment_ids), DOWNTIME_CUBE_DAYS), dtype=np.float32)
+                for row, equipment_id in enumerate(equipment_ids):
+                    if equipment_id in old_rows:
+                        hours[row] = cube['hours'][old_rows[equipment_id]]
+                cube = {'origin': origin, 'equipment_ids': equipment_ids, 'hours': hours}
+            stale_ids = [equipment_id for equipment_id in equipment_ids if equipment_id in stale]
+            if stale_ids:
+                rows = [equipment_ids.index(equipment_id) for equipment_id in stale_ids]
+                cube['hours'][rows] = _downtime_matrix(intervals, stale_ids, origin, DOWNTIME_CUBE_DAYS, now)
+        cube['signatures'] = dict(entry['signatures'])
+        entry['cube'] = cube
+        return cube
+
+def downtime_heatmap_frame(cube, days, bucket, equipment_names, top_n=None):
+    """큐브에서 최근 days일을 bucket일 단위로 합치고, 고장 시간이 있는 셀만 (설비 ID, 설비, 시작일, 끝일, 시간) 행으로 반환.
+    이름이 같은 설비가 합쳐지지 않도록 행은 설비 ID로 구분하고, 두 번째 값은 표시 순서의 설비 ID(문자열) 목록"""
+    hours = cube['hours'][:, -days:]
+    starts = np.arange(0, days, bucket)
+    binned = np.add.reduceat(hours, starts, axis=1) if bucket > 1 else hours
+    totals = binned.sum(axis=1)
+    order = np.argsort(-totals, kind='stable')
+    order = order[totals[order] > 0][:top_n]
+    if not len(order):
+        return None, []
+    equipment_ids = [cube['equipment_ids'][row] for row in order]
+    names = [equipment_names.get(equipment_id, 'Unknown') for equipment_id in equipment_ids]
+    rows, cols = np.nonzero(binned[order])
+    window_start = cube['origin'] + pd.Timedelta(days=DOWNTIME_CUBE_DAYS - days)
+    window_end = cube['origin'] + pd.Timedelta(days=DOWNTIME_CUBE_DAYS)
+    bucket_starts = window_start + pd.to_timedelta(starts, unit='D')
+    # 마지막 묶음은 bucket일보다 짧을 수 있으므로 끝을 기간 끝(오늘 자정 다음)으로 자름
+    bucket_ends = pd.Series(bucket_starts + pd.Timedelta(days=bucket)).clip(upper=window_end).to_numpy()
+    frame = pd.DataFrame({
+        '설비 ID': np.array([str(equipment_id) for equipment_id in equipment_ids], dtype=object)[rows],
+        '설비': np.array(names, dtype=object)[rows],
+        '시작': bucket_starts[cols],
+        '끝': bucket_ends[cols],
+        '고장 시간(h)': binned[order][rows, cols].round(1),
+    })
+    return frame, [str(equipment_id) for equipment_id in equipment_ids]
+
+def reliability_display_frame(summary, translate=True):
+    """지표 DataFrame을 표시용(반올림, 가동률 %)으로 변환. translate=True면 컬럼 이름을 현재 언어로 바꿈"""
+    display = summary.copy()
+    for column in ('up_hours', 'down_hours', 'mtbf_hours', 'mttr_hours'):
+        display[column] = display[column].round(1)
+    display['availability'] = (display['availability'] * 100).round(2)
+    if not translate:
+        return display
+    return display.rename(columns={column: get_translation(key) for column, key in RELIABILITY_COLUMNS.items()})
+
+# ------------------------------------------------------
+# 차트 데이터 축소 (기간 리샘플링 / LTTB 다운샘플링)
+# ------------------------------------------------------
+# 차트에는 서버에서 줄인 점만 보내 Vega 스펙 크기와 브라우저 렌더링 시간을 제한한다.
+CHART_MAX_POINTS = 400
+CHART_GRANULARITIES = {'일': 'D', '주': 'W-MON', '월': 'MS', '분기': 'QS'}
+
+def resample_time_series(frame, time_column, value_column, rule):
+    """time_column 기준 기간별 합계. 값이 없는 기간은 0으로 채워 선이 끊기지 않게 함"""
+    series = pd.Series(pd.to_numeric(frame[value_column], errors='coerce').fillna(0.0).to_numpy(),
+                       index=pd.to_datetime(frame[time_column]))
+    # 주 단위는 월요일 시작 구간으로, 나머지는 기간 시작일로 표시
+    resampled = series.resample(rule, label='left', closed='left').sum() if rule.startswith('W') else series.resample(rule).sum()
+    return resampled.rename_axis(time_column).reset_index(name=value_column)
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: 모양을 유지하면서 threshold개 점만 고른 인덱스 (첫/마지막 점 포함)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        # 다음 버킷의 평균점
+        next_start = int(np.floor((bucket + 1) * every)) + 1
+        next_end = min(int(np.floor((bucket + 2) * every)) + 1, n)
+        average_x, average_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        # 현재 버킷에서 (이전 선택점, 다음 버킷 평균점)과 만드는 삼각형 넓이가 가장 큰 점
+        start = int(np.floor(bucket * every)) + 1
+        end = int(np.floor((bucket + 1) * every)) + 1
+        areas = np.abs((x[previous] - average_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (average_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+def downsample_time_series(frame, time_column, value_column, max_points=CHART_MAX_POINTS):
+    """점이 max_points보다 많으면 LTTB로 줄임"""
+    if len(frame) <= max_points:
+        return frame
+    x = pd.to_datetime(frame[time_column]).to_numpy(dtype='datetime64[s]').astype(np.float64)
+    y = frame[value_column].to_numpy(dtype=np.float64)
+    return frame.iloc[lttb_indices(x, y, max_points)].reset_index(drop=True)
+
+# ------------------------------------------------------
+# 세션 메모리 관리 (세션별 사용량 집계 / 유휴 세션 정리)
+# ------------------------------------------------------
+SESSION_IDLE_COMPACT_MINUTES = int(os.getenv('SESSION_IDLE_COMPACT_MINUTES', '30'))
+SESSION_SWEEP_INTERVAL_SECONDS = 300
+SESSION_MEASURE_INTERVAL_SECONDS = 60
+# 유휴 세션에서 기본값으로 되돌릴 수 있는 편집용 작업 사본 (다시 선택하면 DB에서 재구성됨)
+COMPACTABLE_SESSION_KEYS = (
+    'accessory_specs', 'spare_part_specs', 'documents', 'screw_specs', 'oil_specs', 'add_eq_images',
+    'edit_accessory_specs', 'edit_spare_part_specs', 'edit_documents', 'edit_oil_specs', 'edit_screw_specs',
+    'edit_oil_notes', 'edit_oil_aftercare', 'edit_spec_errors', 'edit_unread_specs', 'selected_eq_id_admin', 'custom_sections', 'equipment_row_patches'
+)
+
+def estimate_size(obj, seen=None):
+    """객체가 차지하는 대략적인 메모리(byte). DataFrame/업로드 파일은 실제 데이터 크기로 계산"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if hasattr(obj, 'memory_usage') and hasattr(obj, 'columns'):
+        return int(obj.memory_usage(deep=True).sum())
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif hasattr(obj, 'getbuffer') and hasattr(obj, 'size'):
+        # UploadedFile 등 BytesIO 기반 객체
+        size += int(obj.size or 0)
+    return size
+
+@st.cache_resource
+def get_session_registry():
+    """세션 ID → {'last_seen', 'compact', 'size', 'top_keys', 'measured_at'}.
+    다른 세션의 session_state는 그 세션의 실행 스레드만 안전하게 다룰 수 있으므로, 레지스트리에는 각 세션이 스스로 기록한 값만 둔다."""
+    return {'lock': threading.Lock(), 'sessions': {}, 'last_sweep': 0.0}
+
+def _registry_entry(registry, session_id, now):
+    return registry['sessions'].setdefault(session_id, {'last_seen': now, 'compact': False, 'size': 0, 'top_keys': [], 'measured_at': 0.0})
+
+def touch_session():
+    """fragment만 다시 실행될 때도 활동 시각을 갱신 (벽보드처럼 fragment로만 갱신되는 화면이 유휴로 정리되지 않도록)"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    registry = get_session_registry()
+    now = datetime.now().timestamp()
+    with registry['lock']:
+        entry = _registry_entry(registry, ctx.session_id, now)
+        entry['last_seen'] = now
+        entry['compact'] = False
+
+def track_session_activity():
+    """매 실행 시작 시 호출. 정리 예약된 세션이면 자기 session_state를 정리하고, 사용량 기록 / 주기적 유휴 세션 표시를 수행"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    registry = get_session_registry()
+    now = datetime.now().timestamp()
+    with registry['lock']:
+        entry = _registry_entry(registry, ctx.session_id, now)
+        compact_due = entry['compact']
+        entry['compact'] = False
+        entry['last_seen'] = now
+        measure_due = now - entry['measured_at'] >= SESSION_MEASURE_INTERVAL_SECONDS
+        sweep_due = now - registry['last_sweep'] >= SESSION_SWEEP_INTERVAL_SECONDS
+        if sweep_due:
+            registry['last_sweep'] = now
+    if compact_due and compact_session_state():
+        st.info("장시간 사용하지 않아 편집 중이던 임시 내용이 정리되었습니다.")
+    if compact_due or measure_due:
+        record_session_size(ctx.session_id)
+    if sweep_due:
+        mark_idle_sessions()
+
+def compact_session_state():
+    """현재 세션의 편집용 작업 사본을 기본값으로 되돌리고 DataFrame 값은 레코드로 변환. 바뀐 것이 있으면 True"""
+    defaults = session_default_values()
+    changed = False
+    for key in COMPACTABLE_SESSION_KEYS:
+        if key not in st.session_state:
+            continue
+        if key in defaults:
+            if st.session_state[key] != defaults[key]:
+                st.session_state[key] = defaults[key]
+                changed = True
+        else:
+            del st.session_state[key]
+            changed = True
+    for key, value in list(st.session_state.items()):
+        if hasattr(value, 'to_dict') and hasattr(value, 'columns') and key not in COMPACTABLE_SESSION_KEYS:
+            st.session_state[key] = value.to_dict('records')
+            changed = True
+    return changed
+
+def record_session_size(session_id, top_keys=5):
+    """현재 세션의 추정 메모리 사용량을 레지스트리에 기록 (관리자 보고서용)"""
+    key_sizes = sorted(((key, estimate_size(value)) for key, value in st.session_state.items()), key=lambda item: -item[1])
+    registry = get_session_registry()
+    with registry['lock']:
+        entry = _registry_entry(registry, session_id, datetime.now().timestamp())
+        entry['size'] = sum(size for _, size in key_sizes)
+        entry['top_keys'] = key_sizes[:top_keys]
+        entry['measured_at'] = datetime.now().timestamp()
+
+def _session_is_alive(session_id):
+    return not runtime.exists() or runtime.get_instance().is_active_session(session_id)
+
+def mark_idle_sessions(exclude=None):
+    """유휴 시간이 지난 세션에 정리 표시만 남김 (각 세션이 다음 실행 시작 시 스스로 정리). 끝난 세션은 레지스트리에서 제거"""
+    cutoff = datetime.now().timestamp() - SESSION_IDLE_COMPACT_MINUTES * 60
+    registry = get_session_registry()
+    marked = 0
+    with registry['lock']:
+        for session_id, entry in list(registry['sessions'].items()):
+            if not _session_is_alive(session_id):
+                del registry['sessions'][session_id]
+            elif session_id != exclude and entry['last_seen'] <= cutoff and not entry['compact']:
+                entry['compact'] = True
+                marked += 1
+    return marked
+
+def session_memory_report():
+    """세션별 추정 메모리 사용량과 가장 큰 키 목록 (각 세션이 마지막으로 기록한 값, 큰 순서)"""
+    now = datetime.now().timestamp()
+    registry = get_session_registry()
+    with registry['lock']:
+        entries = [(session_id, dict(entry)) for session_id, entry in registry['sessions'].items() if _session_is_alive(session_id)]
+    report = [{
+        '세션': session_id[:8],
+        '유휴(분)': round((now - entry['last_seen']) / 60, 1),
+        '추정 메모리(KB)': round(entry['size'] / 1024, 1),
+        '큰 항목': ', '.join(f"{key} {size / 1024:.0f}KB" for key, size in entry['top_keys']),
+        '정리 예약': entry['compact']
+    } for session_id, entry in entries]
+    report.sort(key=lambda row: -row['추정 메모리(KB)'])
+    return report
+
+# ============ 설비 템플릿 관리 함수 ============
+
+def get_equipment_templates():
+    """모든 활성화된 설비 템플릿 조회 (레지스트리)"""
+    return load_schema_registry()['templates']
+
+def get_template_by_name(name):
+    """특정 이름의 템플릿 조회 (레지스트리)"""
+    return load_schema_registry()['templates_by_name'].get(name)
 
 def add_equipment_template(name, display_name, fields_config):
     """새 설비 템플릿 추가"""
@@ -501,6 +2239,7 @@ def add_equipment_template(name, display_name, fields_config):
             'fields_config': fields_config
         }
         response = supabase.table('equipment_templates').insert(data).execute()
+        refresh_schema_registry()
         return True, "템플릿이 추가되었습니다."
     except Exception as e:
         return False, str(e)
@@ -528,10 +2267,21 @@ def update_equipment_template(template_id, name, display_name, fields_config):
             'updated_at': datetime.now().isoformat()
         }
         response = supabase.table('equipment_templates').update(data).eq('id', template_id).execute()
+        refresh_schema_registry()
         return True, "템플릿이 수정되었습니다."
     except Exception as e:
         return False, str(e)
 
+def delete_equipment_template(template_id):
+    """설비 템플릿 삭제 (soft delete)"""
+    try:
+        data = {'is_active': False, 'updated_at': datetime.now().isoformat()}
+        response = supabase.table('equipment_templates').update(data).eq('id', template_id).execute()
+        refresh_schema_registry()
+        return True, "템플릿이 삭제되었습니다."
+    except Exception as e:
+        return False, str(e)
+
 # UI 함수
 def render_delete_ui(template_id):
     st.warning(f"템플릿(ID={template_id})을 삭제하시겠습니까? 이 작업은 되돌릴 수 없습니다.")
@@ -549,686 +2299,123 @@ def render_delete_ui(template_id):
         if st.button("❌ 취소", key=f"cancel_{template_id}"):
             st.info("삭제가 취소되었습니다.")
 
-# 필드 정의 (모든 가능한 필드)
-@st.cache_data(ttl=300)  # 5분 캐시
-def load_field_definitions():
-    """DB에서 필드 정의를 로드하여 딕셔너리로 반환"""
-    fields = get_field_definitions()
-    field_dict = {}
-    for field in fields:
-        if field['category'] == 'specific':
-            field_dict[field['field_key']] = {
-                'label': field['field_label'],
-                'type': field['field_type']
-            }
-    return field_dict
-
 # ------------------------------------------------------
-# 5. 다국어 지원 딕셔너리
+# 5. 다국어 지원 (locales/<언어>.json 카탈로그)
 # ------------------------------------------------------
-TRANSLATIONS = {
-    'ko': {
-        'title': '공장 설비 관리 시스템',
-        'login_title': '로그인',
-        'select_factory': '공장 선택',
-        "equipment_age": "설비 연식",
-        "years": "년 경과",
-        'enter_password': '비밀번호',
-        'login_button': '로그인',
-        'login_success': '로그인 성공',
-        'specific_fields': '전용 사양',
-        'login_fail': '비밀번호 오류',
-        'current_factory': '현재 공장',
-        'action_category': '정비 이력 세부 분류',
-        'electrical': '전장',
-        'mechanical': '기구부',
-        'drive': '구동부',
-        'other_category': '기타',
-        'custom_sections': '커스텀 섹션',
-        'no_specific_fields': '전용 사양 정보가 없습니다.',
-        'logout': '로그아웃',
-        'dashboard': '대시보드',
-        'add_equipment': '설비 추가',
-        'add_maintenance_log': '정비 이력 추가',
-        'view_maintenance_log': '정비 이력 확인',
-        'add_row_instruction': '테이블에서 '+' 버튼을 눌러 행을 추가하세요.',
-        'record_status': '상태 기록',
-        'admin_mode': '관리자',
-        'no_equipment_registered': '등록된 설비가 없습니다. 새로운 설비를 추가해 보세요.',
-        'status': '상태',
-        'normal': '정상',
-        'faulty': '고장',
-        'sold': '매각',
-        'change_status': '상태 변경',
-        'notes': '비고',
-        'record_button': '기록',
-        'recent_maintenance_logs': '최근 정비 이력 (최대 5개)',
-        'no_recent_logs': '최근 정비 이력이 없습니다.',
-        'equipment_name': '설비 이름',
-        'maker': '제조사',
-        'model': '모델',
-        'details': '세부 사항',
-        'upload_image': '설비 이미지 (여러 개 선택 가능)',
-        'add_equipment_button': '설비 추가',
-        'add_success': '설비 추가 완료',
-        'select_equipment': '정비할 설비 선택',
-        'engineer_name': '엔지니어 이름',
-        'maintenance_action': '정비 작업 내용',
-        'maintenance_date': '정비 날짜',
-        'maintenance_time': '정비 시간',
-        'add_log_button': '이력 추가',
-        'no_logs': '선택한 설비의 정비 이력이 없습니다.',
-        'view_detail_log': '상세 이력을 볼 항목 선택',
-        'attachments': '첨부 이미지',
-        'no_attachments': '첨부된 이미지가 없습니다.',
-        'recent_status_history': '최근 상태 기록',
-        'no_status_history': '기록된 상태 이력이 없습니다.',
-        'admin_password': '관리자 비밀번호를 입력하세요',
-        'admin_login_success': '관리자 모드 로그인 성공',
-        'admin_login_fail': '관리자 비밀번호가 올바르지 않습니다.',
-        'update_delete_equipment': '설비 수정/삭제',
-        'select_equipment_admin': '수정/삭제할 설비 선택',
-        'update_button': '수정',
-        'delete_button': '삭제',
-        'update_log_admin': '정비 이력 수정/삭제',
-        'select_log_admin': '수정/삭제할 정비 이력 선택',
-        'update_status_admin': '상태 기록 수정/삭제',
-        'select_status_admin': '수정/삭제할 상태 기록 선택',
-        'add_factory': '공장 추가',
-        'factory_name': '공장 이름',
-        'password': '비밀번호',
-        'add_factory_button': '추가',
-        'factory_update_delete': '공장 수정/삭제',
-        'select_factory_admin': '수정/삭제할 공장 선택',
-        'update_success': '설비 정보가 업데이트 되었습니다.',
-        'log_update_success': '정비 이력 업데이트 완료',
-        'log_delete_success': '정비 이력 삭제 완료',
-        'status_update_success': '상태 기록이 업데이트 되었습니다.',
-        'status_delete_success': '상태 기록이 삭제 되었습니다.',
-        'factory_add_success': ' 공장 추가 완료',
-        'factory_update_success': '공장 정보 업데이트 완료',
-        'factory_delete_success': '공장 삭제 완료',
-        'basic_info': '기본 정보',
-        'equipment_details': '설비 상세 정보',
-        'capacity_specs': '용량 및 규격 명세서',
-        'add_accessory_row': '부속기기 행 추가',
-        'accessory_specs': '부속기기 명세서',
-        'add_spare_part_row': 'SPARE PART 행 추가',
-        'spare_part_specs': 'SPARE PART 부품 교체 주기',
-        'add_document_row': '기타 문서 행 추가',
-        'documents': '기타 문서',
-        'screw_specs': '스크류 교체 주기 및 표준',
-        'screw_material_specs': '스크류 재료 사양',
-        'screw_table_general': '일반용 SCREW',
-        'screw_table_wear': '내마모성 SCREW',
-        'oil_specs': '작동유 교체 주기 및 표준',
-        'oil_table_standard': '교체 주기 및 표준',
-        'oil_notes': '1년 경과 후 사후 관리 방안',
-        'other_notes': '기타사항',
-        'purchase_company': '구입처',
-        'spec': 'SPEC',
-        'amount': '주유량',
-        'viscosity_date': '점도 일자',
-        'viscosity_result': '측정 결과',
-        'log_details': '상세 정비 이력',
-        'col_seq': '순번',
-        'col_accessory_name': '부속기기 명',
-        'col_accessory_type': '형식',
-        'col_accessory_serial': '제작번호',
-        'col_capacity_spec': '용량 및 규격',
-        'col_maker': '제조처',
-        'col_notes': '비고',
-        'col_spare_part': 'SPARE PART',
-        'col_maintenance_cycle': '교체 주기',
-        'col_replacement_date': '교체 일자',
-        'col_doc_name': '기술 자료명',
-        'col_manual': '취급 설명서',
-        'col_electric_drawing': '전기 도면',
-        'col_hydraulic_drawing': '유.증압도면',
-        'col_lubrication_std': '윤활 기준표',
-        'col_relevant_item': '해당사항',
-        'col_category': '구분',
-        'col_applicable_oil': '적용 작동유 SPCE',
-        'col_log_id': '이력 ID',
-        'col_history_id': '기록 ID',
-        'col_created_at': '생성일',
-        'col_equipment_name': '설비명',
-        'col_status': '상태',
-        'col_engineer': '엔지니어',
-        'col_action': '작업 내용',
-        'no_custom_sections': '커스텀 섹션 설정이 없습니다.',
-        'no_active_custom_sections': '활성화된 커스텀 섹션이 없습니다.',
-        'col_image_urls': '첨부 이미지 URL',
-        "product_name": "제품 이름",
-        "serial_number": "일련번호",
-        "production_date": "제조일",
-        "acquisition_cost": "취득 원가",
-        "acquisition_date": "취득일",
-        "acquisition_basis": "취득 근거",
-        "purchase_date": "구입일",
-        "installation_location": "설치 위치",
-        "equipment_grade": "설비 등급",
-        "min_mold_thickness": "최소 금형 두께",
-        "max_mold_thickness": "최대 금형 두께",
-        "tie_bar_spacing": "타이바 간격",
-        "plate_thickness": "형판 두께",
-        "oil_flow_rate": "기계 유량",
-        "max_displacement": "최대 계량량",
-        'motor_capacity_specs': 'MOTOR 용량',
-        'heater_capacity_specs': '히터 용량',
-        'total_weight': '기계 총 중량(ton)',
-        'error_loading_data': '데이터 로딩 오류',
-        'status_updated': '상태가 업데이트되었습니다.',
-        'general_screw': '일반용 SCREW',
-        'wear_resistant_screw': '내마모성 SCREW',
-        'material_spec_description': '재료 사양',
-        'no_active_sections': '활성화된 섹션이 없습니다.'
-    },
-    'vi': {
-        'title': 'Hệ thống Quản lý Thiết bị Nhà máy',
-        'login_title': 'Đăng nhập',
-        'select_factory': 'Chọn nhà máy',
-        "equipment_age": "Tuổi thiết bị",
-        "years": "năm đã qua",
-        'enter_password': 'Mật khẩu',
-        'login_button': 'Đăng nhập',
-        'login_success': 'Đăng nhập thành công',
-        'login_fail': 'Mật khẩu sai',
-        'current_factory': 'Nhà máy hiện tại',
-        'logout': 'Đăng xuất',
-        'dashboard': 'Trang chủ',
-        'add_equipment': 'Thêm thiết bị',
-        'add_maintenance_log': 'Thêm lịch sử bảo trì',
-        'action_category': 'Phân loại chi tiết lịch sử bảo trì',
-        'electrical': 'Điện',
-        'mechanical': 'Cơ khí',
-        'drive': 'Truyền động',
-        'other_category': 'Khác',
-        'view_maintenance_log': 'Xem lịch sử bảo trì',
-        'custom_sections': 'Phần tùy chỉnh',
-        'specific_fields': 'Thông số chuyên dụng',
-        'record_status': 'Ghi lại trạng thái',
-        'admin_mode': 'Quản trị viên',
-        'no_equipment_registered': 'Chưa có thiết bị nào được đăng ký. Hãy thử thêm một thiết bị mới.',
-        'no_custom_sections': 'Không có cài đặt phần tùy chỉnh.',
-        'no_active_custom_sections': 'Không có phần tùy chỉnh được kích hoạt.',
-        'status': 'Trạng thái',
-        'normal': 'Bình thường',
-        'faulty': 'Hỏng',
-        'sold': 'bán',
-        'no_specific_fields': 'Không có thông tin thông số chuyên dụng.',
-        'change_status': 'Thay đổi trạng thái',
-        'notes': 'Ghi chú',
-        'record_button': 'Ghi lại',
-        'recent_maintenance_logs': 'Lịch sử bảo trì gần đây (tối đa 5)',
-        'add_row_instruction': 'Nhấn nút '+' trong bảng để thêm hàng.',
-        'no_recent_logs': 'Không có lịch sử bảo trì gần đây.',
-        'equipment_name': 'Tên thiết bị',
-        'maker': 'Nhà sản xuất',
-        'model': 'Mẫu mã',
-        'details': 'Chi tiết',
-        'upload_image': 'Hình ảnh thiết bị (có thể chọn nhiều)',
-        'add_equipment_button': 'Thêm thiết bị',
-        'add_success': 'Đã thêm thiết bị thành công',
-        'select_equipment': 'Chọn thiết bị để bảo trì',
-        'engineer_name': 'Tên kỹ sư',
-        'maintenance_action': 'Nội dung công việc bảo trì',
-        'maintenance_date': 'Ngày bảo trì',
-        'maintenance_time': 'Thời gian bảo trì',
-        'add_log_button': 'Thêm lịch sử',
-        'no_logs': 'Không có lịch sử bảo trì cho thiết bị đã chọn.',
-        'view_detail_log': 'Chọn mục để xem chi tiết',
-        'attachments': 'Tệp đính kèm',
-        'no_attachments': 'Không có hình ảnh đính kèm.',
-        'recent_status_history': 'Lịch sử trạng thái gần đây',
-        'no_status_history': 'Không có lịch sử trạng thái được ghi lại.',
-        'admin_password': 'Nhập mật khẩu quản trị viên',
-        'admin_login_success': 'Đăng nhập quản trị viên thành công',
-        'admin_login_fail': 'Mật khẩu quản trị viên không chính xác.',
-        'update_delete_equipment': 'Cập nhật/Xóa thiết bị',
-        'select_equipment_admin': 'Chọn thiết bị để cập nhật/xóa',
-        'update_button': 'Cập nhật',
-        'delete_button': 'Xóa',
-        'update_log_admin': 'Cập nhật/Xóa lịch sử bảo trì',
-        'select_log_admin': 'Chọn lịch sử bảo trì để cập nhật/xóa',
-        'update_status_admin': 'Cập nhật/Xóa lịch sử trạng thái',
-        'select_status_admin': 'Chọn lịch sử trạng thái để cập nhật/xóa',
-        'add_factory': 'Thêm nhà máy',
-        'factory_name': 'Tên nhà máy',
-        'password': 'Mật khẩu',
-        'add_factory_button': 'Thêm',
-        'factory_update_delete': 'Cập nhật/Xóa nhà máy',
-        'select_factory_admin': 'Chọn nhà máy để cập nhật/xóa',
-        'update_success': 'Thông tin thiết bị đã được cập nhật.',
-        'log_update_success': 'Đã cập nhật lịch sử bảo trì thành công',
-        'log_delete_success': 'Đã xóa lịch sử bảo trì thành công',
-        'status_update_success': 'Đã cập nhật lịch sử trạng thái thành công.',
-        'status_delete_success': 'Đã xóa lịch sử trạng thái thành công.',
-        'factory_add_success': 'Đã thêm nhà máy thành công',
-        'factory_update_success': 'Đã cập nhật thông tin nhà máy thành công',
-        'factory_delete_success': 'Đã xóa nhà máy thành công',
-        'basic_info': 'Thông tin cơ bản',
-        'equipment_details': 'Chi tiết thiết bị',
-        'capacity_specs': 'Dung tích và thông số kỹ thuật',
-        'add_accessory_row': 'Thêm dòng phụ kiện',
-        'accessory_specs': 'Thông số kỹ thuật phụ kiện',
-        'add_spare_part_row': 'Thêm dòng phụ tùng thay thế',
-        'spare_part_specs': 'Chu kỳ thay thế phụ tùng',
-        'add_document_row': 'Thêm dòng tài liệu khác',
-        'documents': 'Tài liệu khác',
-        'screw_specs': 'Chu kỳ thay thế và tiêu chuẩn vít',
-        'screw_material_specs': 'Thông số kỹ thuật vật liệu vít',
-        'screw_table_general': 'Vít thông thường',
-        'screw_table_wear': 'Vít chống mài mòn',
-        'oil_specs': 'Chu kỳ thay thế và tiêu chuẩn dầu thủy lực',
-        'oil_table_standard': 'Tiêu chuẩn và chu kỳ thay thế',
-        'oil_notes': 'Kế hoạch bảo trì sau 1 năm',
-        'other_notes': 'Các ghi chú khác',
-        'purchase_company': 'Công ty mua hàng',
-        'spec': 'SPEC',
-        'amount': 'Số lượng dầu đã đổ',
-        'viscosity_date': 'Ngày đo độ nhớt',
-        'viscosity_result': 'Kết quả đo',
-        'log_details': 'Chi tiết lịch sử bảo trì',
-        'col_seq': 'STT',
-        'col_accessory_name': 'Tên phụ kiện',
-        'col_accessory_type': 'Loại',
-        'col_accessory_serial': 'Sê-ri',
-        'col_capacity_spec': 'Dung tích và TS kỹ thuật',
-        'col_maker': 'Nhà sản xuất',
-        'col_notes': 'Ghi chú',
-        'col_spare_part': 'PHỤ TÙNG',
-        'col_maintenance_cycle': 'Chu kỳ bảo trì',
-        'col_replacement_date': 'Ngày thay thế',
-        'col_doc_name': 'Tên tài liệu kỹ thuật',
-        'col_manual': 'Sách hướng dẫn sử dụng',
-        'col_electric_drawing': 'Bản vẽ điện',
-        'col_hydraulic_drawing': 'Bản vẽ thủy lực',
-        'col_lubrication_std': 'Bảng tiêu chuẩn bôi trơn',
-        'col_relevant_item': 'Mục liên quan',
-        'col_category': 'Phân loại',
-        'col_applicable_oil': 'TS kỹ thuật dầu áp dụng',
-        'col_log_id': 'ID Lịch sử',
-        'col_history_id': 'ID Ghi lại',
-        'col_created_at': 'Ngày tạo',
-        'col_equipment_name': 'Tên TB',
-        'col_status': 'Trạng thái',
-        'col_engineer': 'Kỹ sư',
-        'col_action': 'Nội dung công việc',
-        'col_image_urls': 'URL hình ảnh đính kèm',
-        'product_name': 'Tên sản phẩm',
-        'serial_number': 'Số seri',
-        'production_date': 'Ngày sản xuất',
-        'acquisition_cost': 'Giá mua lại',
-        'acquisition_date': 'Ngày mua lại',
-        'acquisition_basis': 'Cơ sở mua lại',
-        'purchase_date': 'Ngày mua',
-        'installation_location': 'Vị trí lắp đặt',
-        "equipment_grade": "Cấp độ thiết bị",
-        'min_mold_thickness': 'Độ dày khuôn tối thiểu',
-        'max_mold_thickness': 'Độ dày khuôn tối đa',
-        'tie_bar_spacing': 'Khoảng cách thanh giằng',
-        'plate_thickness': 'Độ dày tấm',
-        'oil_flow_rate': 'Tốc độ dòng dầu',
-        'max_displacement': 'Độ dịch chuyển tối đa',
-        'no_active_sections': 'Không có phần nào được kích hoạt.',
-        'total_weight': "Tổng trọng lượng"
-    },
-    'th': {
-        'title': 'ระบบจัดการอุปกรณ์โรงงาน',
-        'login_title': 'เข้าสู่ระบบ',
-        'select_factory': 'เลือกโรงงาน',
-        "equipment_age": "อายุของอุปกรณ์",
-        "years": "ปีที่ผ่านมา",
-        'enter_password': 'รหัสผ่าน',
-        'login_button': 'เข้าสู่ระบบ',
-        'login_success': 'เข้าสู่ระบบสำเร็จ',
-        'login_fail': 'รหัสผ่านผิด',
-        'current_factory': 'โรงงานปัจจุบัน',
-        'logout': 'ออกจากระบบ',
-        'dashboard': 'แดชบอร์ด',
-        'add_equipment': 'เพิ่มอุปกรณ์',
-        'add_maintenance_log': 'เพิ่มประวัติการบำรุงรักษา',
-        'view_maintenance_log': 'ดูประวัติการบำรุงรักษา',
-        'record_status': 'บันทึกสถานะ',
-        'specific_fields': 'ข้อกำหนดเฉพาะ',
-        'admin_mode': 'ผู้ดูแลระบบ',
-        'no_equipment_registered': 'ยังไม่มีอุปกรณ์ที่ลงทะเบียน โปรดลองเพิ่มอุปกรณ์ใหม่',
-        'capacity_specs': 'ปริมาณและข้อมูลจำเพาะ',
-        'motor_capacity_specs': 'ความจุ MOTOR',
-        'heater_capacity_specs': 'ความจุของฮีตเตอร์',
-        'total_weight': 'น้ำหนักรวมเครื่องจักร (ตัน)',
-        'add_row_instruction': 'กดปุ่ม '+' ในตารางเพื่อเพิ่มแถว',
-        'status': 'สถานะ',
-        'no_specific_fields': 'ไม่มีข้อมูลข้อกำหนดเฉพาะ.',
-        'normal': 'ปกติ',
-        'faulty': 'ชำรุด',
-        'sold': 'ขาย',
-        'change_status': 'เปลี่ยนสถานะ',
-        'notes': 'หมายเหตุ',
-        'custom_sections': 'ส่วนที่กำหนดเอง',
-        'no_custom_sections': 'ไม่มีส่วนที่กำหนดเอง.',
-        'no_active_custom_sections': 'ไม่มีส่วนที่กำหนดเองที่เปิดใช้งาน.',
-        'record_button': 'บันทึก',
-        'recent_maintenance_logs': 'ประวัติการบำรุงรักษาล่าสุด (สูงสุด 5 รายการ)',
-        'no_recent_logs': 'ไม่มีประวัติการบำรุงรักษาล่าสุด',
-        'equipment_name': 'ชื่ออุปกรณ์',
-        'maker': 'ผู้ผลิต',
-        'model': 'รุ่น',
-        'details': 'รายละเอียด',
-        'upload_image': 'รูปภาพอุปกรณ์ (สามารถเลือกได้หลายไฟล์)',
-        'action_category': 'หมวดหมู่ประวัติการบำรุงรักษา',
-        'electrical': 'ไฟฟ้า',
-        'mechanical': 'กลไก',
-        'drive': 'ระบบขับเคลื่อน',
-        'other_category': 'อื่นๆ',
-        'add_equipment_button': 'เพิ่มอุปกรณ์',
-        'add_success': 'เพิ่มอุปกรณ์สำเร็จ',
-        'select_equipment': 'เลือกอุปกรณ์สำหรับการบำรุงรักษา',
-        'engineer_name': 'ชื่อวิศวกร',
-        'maintenance_action': 'รายละเอียดการบำรุงรักษา',
-        'maintenance_date': 'วันที่บำรุงรักษา',
-        'maintenance_time': 'เวลาบำรุงรักษา',
-        'add_log_button': 'เพิ่มประวัติ',
-        'no_logs': 'ไม่มีประวัติการบำรุงรักษาสำหรับอุปกรณ์ที่เลือก',
-        'view_detail_log': 'เลือกรายการเพื่อดูรายละเอียด',
-        'attachments': 'รูปภาพที่แนบ',
-        'no_attachments': 'ไม่มีรูปภาพแนบ',
-        'recent_status_history': 'ประวัติสถานะล่าสุด',
-        'no_status_history': 'ไม่มีประวัติสถานะที่บันทึกไว้',
-        'admin_password': 'ป้อนรหัสผ่านผู้ดูแลระบบ',
-        'admin_login_success': 'เข้าสู่ระบบผู้ดูแลระบบสำเร็จ',
-        'admin_login_fail': 'รหัสผ่านผู้ดูแลระบบไม่ถูกต้อง',
-        'update_delete_equipment': 'แก้ไข/ลบอุปกรณ์',
-        'select_equipment_admin': 'เลือกอุปกรณ์ที่จะแก้ไข/ลบ',
-        'update_button': 'แก้ไข',
-        'delete_button': 'ลบ',
-        'update_log_admin': 'แก้ไข/ลบประวัติการบำรุงรักษา',
-        'select_log_admin': 'เลือกประวัติการบำรุงรักษาที่จะแก้ไข/ลบ',
-        'update_status_admin': 'แก้ไข/ลบประวัติสถานะ',
-        'select_status_admin': 'เลือกประวัติสถานะที่จะแก้ไข/ลบ',
-        'add_factory': 'เพิ่มโรงงาน',
-        'factory_name': 'ชื่อโรงงาน',
-        'password': 'รหัสผ่าน',
-        'add_factory_button': 'เพิ่ม',
-        'factory_update_delete': 'แก้ไข/ลบโรงงาน',
-        'select_factory_admin': 'เลือกโรงงานที่จะแก้ไข/ลบ',
-        'update_success': 'อัปเดตข้อมูลอุปกรณ์แล้ว',
-        'log_update_success': 'อัปเดตประวัติการบำรุงรักษาสำเร็จ',
-        'log_delete_success': 'ลบประวัติการบำรุงรักษาสำเร็จ',
-        'status_update_success': 'อัปเดตประวัติสถานะแล้ว',
-        'status_delete_success': 'ลบประวัติสถานะแล้ว',
-        'factory_add_success': 'เพิ่มโรงงานสำเร็จ',
-        'factory_update_success': 'อัปเดตข้อมูลโรงงานสำเร็จ',
-        'factory_delete_success': 'ลบโรงงานสำเร็จ',
-        'basic_info': 'ข้อมูลพื้นฐาน',
-        'equipment_details': 'รายละเอียดอุปกรณ์',
-        'capacity_specs': 'ปริมาณและข้อมูลจำเพาะ',
-        'add_accessory_row': 'เพิ่มแถวอุปกรณ์เสริม',
-        'accessory_specs': 'ข้อมูลจำเพาะอุปกรณ์เสริม',
-        'add_spare_part_row': 'เพิ่มแถวอะไหล่',
-        'spare_part_specs': 'รอบการเปลี่ยนอะไหล่',
-        'add_document_row': 'เพิ่มแถวเอกสารอื่น ๆ',
-        'documents': 'เอกสารอื่น ๆ',
-        'screw_specs': 'รอบการเปลี่ยนและมาตรฐานสกรู',
-        'screw_material_specs': 'ข้อมูลจำเพาะวัสดุสกรู',
-        'screw_table_general': 'สกรูทั่วไป',
-        'screw_table_wear': 'สกรูทนการสึกหรอ',
-        'oil_specs': 'รอบการเปลี่ยนและมาตรฐานน้ำมันไฮดรอลิก',
-        'oil_table_standard': 'มาตรฐานและรอบการเปลี่ยน',
-        'oil_notes': 'แผนการบำรุงรักษาหลัง 1 ปี',
-        'other_notes': 'บันทึกอื่นๆ',
-        'purchase_company': 'บริษัทที่ซื้อ',
-        'spec': 'SPEC',
-        'amount': 'ปริมาณน้ำมันที่เติม',
-        'viscosity_date': 'วันที่วัดความหนืด',
-        'viscosity_result': 'ผลการวัด',
-        'log_details': 'รายละเอียดประวัติการบำรุงรักษา',
-        'col_seq': 'ลำดับ',
-        'col_accessory_name': 'ชื่ออุปกรณ์เสริม',
-        'col_accessory_type': 'รูปแบบ',
-        'col_accessory_serial': 'หมายเลขการผลิต',
-        'col_capacity_spec': 'ปริมาณและข้อมูลจำเพาะ',
-        'col_maker': 'ผู้ผลิต',
-        'col_notes': 'หมายเหตุ',
-        'col_spare_part': 'อะไหล่',
-        'col_maintenance_cycle': 'รอบการบำรุงรักษา',
-        'col_replacement_date': 'วันที่เปลี่ยน',
-        'col_doc_name': 'ชื่อข้อมูลทางเทคนิค',
-        'col_manual': 'คู่มือการใช้งาน',
-        'col_electric_drawing': 'แบบไฟฟ้า',
-        'col_hydraulic_drawing': 'แบบไฮดรอลิก',
-        'col_lubrication_std': 'ตารางมาตรฐานการหล่อลื่น',
-        'col_relevant_item': 'รายการที่เกี่ยวข้อง',
-        'col_category': 'หมวดหมู่',
-        'col_applicable_oil': 'น้ำมันที่ใช้',
-        'col_log_id': 'ID ประวัติ',
-        'col_history_id': 'ID บันทึก',
-        'col_created_at': 'วันที่สร้าง',
-        'col_equipment_name': 'ชื่ออุปกรณ์',
-        'col_status': 'สถานะ',
-        'col_engineer': 'วิศวกร',
-        'col_action': 'รายละเอียดงาน',
-        'col_image_urls': 'URL รูปภาพที่แนบ',
-        'no_active_sections': 'ไม่มีส่วนที่เปิดใช้งาน.',
-        "product_name": "ชื่อผลิตภัณฑ์",
-        "serial_number": "หมายเลขซีเรียล",
-        "production_date": "วันที่ผลิต",
-        "acquisition_cost": "ต้นทุนการได้มา",
-        "acquisition_date": "วันที่ได้มา",
-        "acquisition_basis": "เกณฑ์การได้มา",
-        "purchase_date": "วันที่ซื้อ",
-        "installation_location": "สถานที่ติดตั้ง",
-        "equipment_grade": "ระดับอุปกรณ์",
-        "min_mold_thickness": "ความหนาของแม่พิมพ์ขั้นต่ำ",
-        "max_mold_thickness": "ความหนาของแม่พิมพ์สูงสุด",
-        "tie_bar_spacing": "ระยะห่างของแกนยึด",
-        "plate_thickness": "ความหนาของแผ่นเพลท",
-        "oil_flow_rate": "อัตราการไหลของน้ำมัน",
-        "max_displacement": "การเคลื่อนที่สูงสุด",
-    },
-    'es-MX': {
-        'title': 'Sistema de Gestión de Equipos de Fábrica',
-        'login_title': 'Iniciar sesión',
-        'select_factory': 'Seleccionar fábrica',
-        "equipment_age": "Edad del equipo",
-        "years": "años transcurridos",
-        'enter_password': 'Contraseña',
-        'login_button': 'Iniciar sesión',
-        'login_success': 'Inicio de sesión exitoso',
-        'login_fail': 'Contraseña incorrecta',
-        'current_factory': 'Fábrica actual',
-        'logout': 'Cerrar sesión',
-        'dashboard': 'Panel de control',
-        'add_equipment': 'Añadir equipo',
-        'add_maintenance_log': 'Añadir registro de mantenimiento',
-        'view_maintenance_log': 'Ver registro de mantenimiento',
-        'no_custom_sections': 'No hay configuraciones de secciones personalizadas.',
-        'no_active_custom_sections': 'No hay secciones personalizadas activadas.',
-        'record_status': 'Registrar estado',
-        'no_specific_fields': 'No hay información de especificaciones dedicadas.',
-        'admin_mode': 'Administrador',
-        'custom_sections': 'Secciones personalizadas',
-        'no_equipment_registered': 'No hay equipos registrados. Intente añadir uno nuevo.',
-        'add_row_instruction': 'Presiona el botón '+' en la tabla para agregar una fila.',
-        'capacity_specs': 'Capacidad y especificaciones',
-        'motor_capacity_specs': 'Capacidad del MOTOR',
-        'heater_capacity_specs': 'Capacidad del calentador',
-        'total_weight': 'Peso total de la máquina (ton)',
-        'status': 'Estado',
-        'normal': 'Normal',
-        'faulty': 'Defectuoso',
-        'sold': 'Vendido',
-        'change_status': 'Cambiar estado',
-        'notes': 'Notas',
-        'record_button': 'Registrar',
-        'recent_maintenance_logs': 'Registros de mantenimiento recientes (máximo 5)',
-        'no_recent_logs': 'No hay registros de mantenimiento recientes.',
-        'equipment_name': 'Nombre del equipo',
-        'maker': 'Fabricante',
-        'model': 'Modelo',
-        'details': 'Detalles',
-        'upload_image': 'Imagen del equipo (se pueden seleccionar varias)',
-        'add_equipment_button': 'Añadir equipo',
-        'specific_fields': 'Especificaciones dedicadas',
-        'add_success': 'Equipo añadido con éxito',
-        'select_equipment': 'Seleccionar equipo para mantenimiento',
-        'action_category': 'Categoría detallada del historial de mantenimiento',
-        'electrical': 'Eléctrico',
-        'mechanical': 'Mecánico',
-        'drive': 'Transmisión',
-        'other_category': 'Otro',
-        'engineer_name': 'Nombre del ingeniero',
-        'maintenance_action': 'Contenido del trabajo de mantenimiento',
-        'maintenance_date': 'Fecha de mantenimiento',
-        'maintenance_time': 'Hora de mantenimiento',
-        'add_log_button': 'Añadir registro',
-        'no_logs': 'No hay registros de mantenimiento para el equipo seleccionado.',
-        'view_detail_log': 'Seleccionar un elemento para ver los detalles',
-        'attachments': 'Archivos adjuntos',
-        'no_attachments': 'No hay imágenes adjuntas.',
-        'recent_status_history': 'Historial de estado reciente',
-        'no_status_history': 'No hay historial de estado registrado.',
-        'admin_password': 'Introduzca la contraseña de administrador',
-        'admin_login_success': 'Inicio de sesión de administrador exitoso',
-        'admin_login_fail': 'La contraseña de administrador es incorrecta.',
-        'update_delete_equipment': 'Actualizar/Eliminar equipo',
-        'select_equipment_admin': 'Seleccionar equipo para actualizar/eliminar',
-        'update_button': 'Actualizar',
-        'delete_button': 'Eliminar',
-        'update_log_admin': 'Actualizar/Eliminar registro de mantenimiento',
-        'select_log_admin': 'Seleccionar registro de mantenimiento para actualizar/eliminar',
-        'update_status_admin': 'Actualizar/Eliminar historial de estado',
-        'select_status_admin': 'Seleccionar historial de estado para actualizar/eliminar',
-        'add_factory': 'Añadir fábrica',
-        'factory_name': 'Nombre de la fábrica',
-        'password': 'Contraseña',
-        'add_factory_button': 'Añadir',
-        'factory_update_delete': 'Actualizar/Eliminar fábrica',
-        'select_factory_admin': 'Seleccionar fábrica para actualizar/eliminar',
-        'update_success': 'La información del equipo ha sido actualizada.',
-        'log_update_success': 'Registro de mantenimiento actualizado con éxito',
-        'log_delete_success': 'Registro de mantenimiento eliminado con éxito',
-        'status_update_success': 'El historial de estado ha sido actualizado.',
-        'status_delete_success': 'El historial de estado ha sido eliminado.',
-        'factory_add_success': 'Fábrica añadida con éxito',
-        'factory_update_success': 'Información de la fábrica actualizada con éxito',
-        'factory_delete_success': 'Fábrica eliminada con éxito',
-        'basic_info': 'Información básica',
-        'equipment_details': 'Detalles del equipo',
-        'capacity_specs': 'Capacidad y especificaciones',
-        'add_accessory_row': 'Añadir fila de accesorios',
-        'accessory_specs': 'Especificaciones de accesorios',
-        'add_spare_part_row': 'Añadir fila de piezas de repuesto',
-        'spare_part_specs': 'Ciclo de reemplazo de piezas de repuesto',
-        'add_document_row': 'Añadir fila de otros documentos',
-        'documents': 'Otros documentos',
-        'screw_specs': 'Ciclo de reemplazo y estándar de tornillos',
-        'screw_material_specs': 'Especificaciones de material de tornillo',
-        'screw_table_general': 'Tornillos generales',
-        'screw_table_wear': 'Tornillos resistentes al desgaste',
-        'oil_specs': 'Ciclo de reemplazo y estándar de aceite hidráulico',
-        'oil_table_standard': 'Estándar y ciclo de reemplazo',
-        'oil_notes': 'Plan de mantenimiento después de 1 año',
-        'other_notes': 'Otras notas',
-        'purchase_company': 'Empresa de compra',
-        'spec': 'SPEC',
-        'amount': 'Cantidad de aceite',
-        'viscosity_date': 'Fecha de viscosidad',
-        'viscosity_result': 'Resultado de la medición',
-        'log_details': 'Detalles del registro de mantenimiento',
-        'col_seq': 'Secuencia',
-        'col_accessory_name': 'Nombre del accesorio',
-        'col_accessory_type': 'Tipo',
-        'col_accessory_serial': 'Número de serie de fabricación',
-        'col_capacity_spec': 'Capacidad y especificaciones',
-        'col_maker': 'Fabricante',
-        'col_notes': 'Notas',
-        'col_spare_part': 'PIEZA DE REPUESTO',
-        'col_maintenance_cycle': 'Ciclo de mantenimiento',
-        'col_replacement_date': 'Fecha de reemplazo',
-        'col_doc_name': 'Nombre del documento técnico',
-        'col_manual': 'Manual de instrucciones',
-        'col_electric_drawing': 'Plano eléctrico',
-        'col_hydraulic_drawing': 'Plano hidráulico',
-        'col_lubrication_std': 'Tabla de estándar de lubricación',
-        'col_relevant_item': 'Artículo relevante',
-        'col_category': 'Categoría',
-        'col_applicable_oil': 'Aceite aplicable',
-        'col_log_id': 'ID Registro',
-        'col_history_id': 'ID Historial',
-        'col_created_at': 'Fecha de creación',
-        'col_equipment_name': 'Nombre del equipo',
-        'col_status': 'Estado',
-        'col_engineer': 'Ingeniero',
-        'col_action': 'Contenido del trabajo',
-        'col_image_urls': 'URL de imágenes adjuntas',
-        'no_active_sections': 'No hay secciones activadas.',
-        "product_name": "Nombre del producto",
-        "serial_number": "Número de serie",
-        "production_date": "Fecha de producción",
-        "acquisition_cost": "Costo de adquisición",
-        "acquisition_date": "Fecha de adquisición",
-        "acquisition_basis": "Base de adquisición",
-        "purchase_date": "Fecha de compra",
-        "installation_location": "Ubicación de la instalación",
-        "equipment_grade": "Grado de equipo",
-        "min_mold_thickness": "Espesor mínimo del molde",
-        "max_mold_thickness": "Espesor máximo del molde",
-        "tie_bar_spacing": "Espacio entre barras de sujeción",
-        "plate_thickness": "Espesor de la placa",
-        "oil_flow_rate": "Tasa de flujo de aceite",
-        "max_displacement": "Desplazamiento máximo",
-    }
-}
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+DEFAULT_LANGUAGE = 'ko'
+
+class TranslationCatalog(dict):
+    """언어 하나의 번역 사전. 없는 키는 기본 언어 → 키 그대로 순으로 대체하고 누락 목록에 기록"""
+    def __init__(self, lang, entries, fallback=None):
+        super().__init__(entries)
+        self.lang = lang
+        self.fallback = fallback
+        self.missing = set()
+
+    def __missing__(self, key):
+        self.missing.add(key)
+        if self.fallback is not None:
+            return self.fallback[key]
+        return key
+
+@st.cache_resource
+def get_translation_catalogs():
+    """로드된 언어별 카탈로그 {언어: TranslationCatalog} (프로세스 전체 공유)"""
+    return {}
+
+def load_translation_catalog(lang):
+    """프로세스당 언어마다 한 번만 읽음. 실제로 선택된 언어의 파일만 로드됨"""
+    catalogs = get_translation_catalogs()
+    catalog = catalogs.get(lang)
+    if catalog is not None:
+        return catalog
+    path = os.path.join(LOCALES_DIR, f"{lang}.json")
+    if lang != DEFAULT_LANGUAGE and not os.path.exists(path):
+        catalog = load_translation_catalog(DEFAULT_LANGUAGE)
+    else:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        fallback = None if lang == DEFAULT_LANGUAGE else load_translation_catalog(DEFAULT_LANGUAGE)
+        catalog = TranslationCatalog(lang, entries, fallback)
+    catalogs[lang] = catalog
+    return catalog
+
+def bind_translation(lang):
+    """세션에 언어별 조회 함수를 묶어 둠 (get_translation 호출마다 언어/사전을 다시 찾지 않음)"""
+    translate = load_translation_catalog(lang).__getitem__
+    st.session_state['translate'] = translate
+    return translate
 
 def get_translation(key):
-    lang = st.session_state.get('language', 'ko')
-    return TRANSLATIONS.get(lang, TRANSLATIONS['ko']).get(key, key)
+    translate = st.session_state.get('translate') or bind_translation(st.session_state.get('language', DEFAULT_LANGUAGE))
+    return translate(key)
 
 def set_language(lang):
     st.session_state['language'] = lang
+    bind_translation(lang)
     st.rerun()
 
-# 추가 세션 상태 초기화
-if 'authenticated' not in st.session_state:
-    st.session_state['authenticated'] = False
-if 'current_factory' not in st.session_state:
-    st.session_state['current_factory'] = None
-if 'selected_eq_id_admin' not in st.session_state:
-    st.session_state['selected_eq_id_admin'] = None
-if 'selected_log_id_admin' not in st.session_state:
-    st.session_state['selected_log_id_admin'] = None
-if 'selected_factory_id_admin' not in st.session_state:
-    st.session_state['selected_factory_id_admin'] = None
-if 'selected_status_id_admin' not in st.session_state:
-    st.session_state['selected_status_id_admin'] = None
-if 'selected_log_id' not in st.session_state:
-    st.session_state['selected_log_id'] = None
-if 'accessory_specs' not in st.session_state:
-    st.session_state.accessory_specs = []
-if 'edit_accessory_specs' not in st.session_state:
-    st.session_state.edit_accessory_specs = []
-if 'spare_part_specs' not in st.session_state:
-    st.session_state.spare_part_specs = []
-if 'edit_spare_part_specs' not in st.session_state:
-    st.session_state.edit_spare_part_specs = []
-if 'documents' not in st.session_state:
-    st.session_state.documents = []
-if 'edit_documents' not in st.session_state:
-    st.session_state.edit_documents = []
-if 'selected_eq_id_admin_temp' not in st.session_state:
-    st.session_state.selected_eq_id_admin_temp = None
-if 'language' not in st.session_state:
-    st.session_state.language = 'ko'
-if 'edit_oil_specs' not in st.session_state:
-    st.session_state.edit_oil_specs = []
-if 'edit_screw_specs' not in st.session_state:
-    st.session_state.edit_screw_specs = {}
-if 'edit_oil_notes' not in st.session_state:
-    st.session_state.edit_oil_notes = ''
-if 'edit_oil_aftercare' not in st.session_state:
-    st.session_state.edit_oil_aftercare = ''
+def get_missing_translations():
+    """로드된 카탈로그에서 요청되었지만 없던 키 목록 {언어: [키, ...]}"""
+    report = {}
+    for lang, catalog in sorted(get_translation_catalogs().items()):
+        if catalog.lang == lang and catalog.missing:
+            report[lang] = sorted(catalog.missing)
+    return report
+
+@st.cache_resource
+def get_table_columns(lang):
+    """언어별 정비/상태 이력 표의 열 이름 변환 맵과 표시 순서 (언어당 한 번만 계산)"""
+    t = load_translation_catalog(lang).__getitem__
+    return {
+        'recent_logs': {
+            'rename': {
+                'id': t('col_log_id'),
+                'maintenance_date': t('maintenance_date'),
+                'engineer': t('col_engineer'),
+                'action': t('col_action'),
+                'action_category': t('action_category'),
+                'notes': t('col_notes'),
+                'image_urls': t('col_image_urls')
+            },
+            'order': [t('col_log_id'), t('maintenance_date'), t('col_engineer'), t('action_category'), t('col_action'), t('col_notes'), t('col_image_urls')]
+        },
+        'log_view': {
+            'rename': {
+                'maintenance_date': t('maintenance_date'),
+                'engineer': t('col_engineer'),
+                'action': t('col_action'),
+                'notes': t('col_notes'),
+                'image_urls': t('col_image_urls'),
+                'id': t('col_log_id'),
+                'cost': "정비 비용"
+            },
+            'order': [t('maintenance_date'), t('col_engineer'), t('col_action'), t('col_notes'), "정비 비용", t('col_image_urls'), t('col_log_id')]
+        },
+        'recent_status': {
+            'rename': {
+                'id': t('col_history_id'),
+                'created_at': t('col_created_at'),
+                'status': t('col_status'),
+                'notes': t('col_notes')
+            },
+            'order': [t('col_history_id'), t('col_created_at'), t('col_status'), t('col_notes')]
+        },
+        'status_history': {
+            'rename': {
+                'id': t('col_history_id'),
+                'created_at': t('col_created_at'),
+                'status': t('col_status'),
+                'notes': t('col_notes'),
+                'equipment_name': t('col_equipment_name')
+            },
+            'order': [t('col_history_id'), t('col_created_at'), t('col_equipment_name'), t('col_status'), t('col_notes')]
+        },
+    }
+
+def table_columns(table):
+    return get_table_columns(st.session_state.get('language', DEFAULT_LANGUAGE))[table]
 
 def reset_add_equipment_form_state():
     if 'accessory_specs' in st.session_state:
@@ -1263,8 +2450,8 @@ D:400℃이상 온도 사용 제품""",
         st.session_state.custom_sections = {}
 
 def set_selected_equipment():
-    selected_name = st.session_state.get('selected_equipment_name_admin_selectbox')
-    if not selected_name or selected_name == '설비를 선택하세요':
+    selected_id = st.session_state.get('selected_equipment_id_admin_selectbox')
+    if not selected_id:
         st.session_state.selected_eq_id_admin = None
         st.session_state.edit_accessory_specs = []
         st.session_state.edit_spare_part_specs = []
@@ -1273,60 +2460,41 @@ def set_selected_equipment():
         st.session_state.edit_screw_specs = {}
         st.session_state.edit_oil_notes = ''
         st.session_state.edit_oil_aftercare = ''
+        st.session_state.edit_spec_errors = []
+        st.session_state.edit_unread_specs = {}
         return
 
-    equipment_list_admin = get_equipment()
-    eq_data = next((eq for eq in equipment_list_admin if eq['name'] == selected_name), None)
-    
+    eq_data = get_equipment_by_id(selected_id)
+
     if eq_data:
         st.session_state.selected_eq_id_admin = eq_data['id']
-        try:
-            st.session_state.edit_accessory_specs = json.loads(eq_data.get('accessory_specs') or '[]')
-        except:
-            st.session_state.edit_accessory_specs = []
-        try:
-            st.session_state.edit_spare_part_specs = json.loads(eq_data.get('spare_part_specs') or '[]')
-        except:
-            st.session_state.edit_spare_part_specs = []
-        try:
-            st.session_state.edit_documents = json.loads(eq_data.get('documents') or '[]')
-        except:
-            st.session_state.edit_documents = []
-        try:
-            oil_specs_data = json.loads(eq_data.get('oil_specs') or '[]')
-            st.session_state.edit_oil_specs = [item for item in oil_specs_data if 'notes' not in item and 'aftercare' not in item]
-            st.session_state.edit_oil_notes = next((item['notes'] for item in oil_specs_data if 'notes' in item), '')
-            st.session_state.edit_oil_aftercare = next((item['aftercare'] for item in oil_specs_data if 'aftercare' in item), '')
-        except:
-            st.session_state.edit_oil_specs = []
-            st.session_state.edit_oil_notes = ''
-            st.session_state.edit_oil_aftercare = ''
-        
-        try:
-            screw_data = json.loads(eq_data.get('screw_specs') or '{}')
-            if not isinstance(screw_data, dict):
-                screw_data = {}
-            general_cycle_data = screw_data.get('general_cycle', [{'해당 사양': '교체 주기 (월)', 'A': '5', 'B': '5', 'C': '3', 'D': '3'}])
-            wear_cycle_data = screw_data.get('wear_resistant_cycle', [{'해당 사양': '교체 주기 (월)', 'A': '10', 'B': '10', 'C': '5', 'D': '5'}])
-            st.session_state.edit_screw_specs = {
-                'material_spec_description': screw_data.get('material_spec_description', ''),
-                'screw_type_general': screw_data.get('screw_type_general', ''),
-                'applicable_general': screw_data.get('applicable_general', ''),
-                'screw_type_wear': screw_data.get('screw_type_wear', ''),
-                'applicable_wear': screw_data.get('applicable_wear', ''),
-                'general_cycle_df': pd.DataFrame(general_cycle_data),
-                'wear_resistant_cycle_df': pd.DataFrame(wear_cycle_data)
-            }
-        except:
-            st.session_state.edit_screw_specs = {
-                'material_spec_description': '',
-                'screw_type_general': '',
-                'applicable_general': '',
-                'screw_type_wear': '',
-                'applicable_wear': '',
-                'general_cycle_df': pd.DataFrame([{'해당 사양': '교체 주기 (월)', 'A': '5', 'B': '5', 'C': '3', 'D': '3'}]),
-                'wear_resistant_cycle_df': pd.DataFrame([{'해당 사양': '교체 주기 (월)', 'A': '10', 'B': '10', 'C': '5', 'D': '5'}])
-            }
+        # 캐시된 사양 모델에서 편집용 복사본을 만듦 (모델은 세션 간 공유되므로 직접 수정하지 않음)
+        specs = get_equipment_specs(eq_data)
+        # 읽지 못한 행은 편집 사본에 없으므로 원본을 따로 보관 (저장 시 되돌려 쓸지 수정 폼에서 선택)
+        st.session_state.edit_spec_errors = list(specs.errors)
+        st.session_state.edit_unread_specs = {
+            'rows': {column: list(rows) for column, rows in specs.unread_rows.items()},
+            'columns': dict(specs.unread_columns)
+        } if specs.unread_rows or specs.unread_columns else {}
+        st.session_state.pop('edit_unread_specs_choice', None)
+        st.session_state.pop('edit_unread_specs_drop_confirm', None)
+        st.session_state.edit_accessory_specs = [row.to_record() for row in specs.accessory_specs]
+        st.session_state.edit_spare_part_specs = [row.to_record() for row in specs.spare_part_specs]
+        st.session_state.edit_documents = [row.to_record() for row in specs.documents]
+        st.session_state.edit_oil_specs = [row.to_record() for row in specs.oil_specs]
+        st.session_state.edit_oil_notes = specs.oil_notes
+        st.session_state.edit_oil_aftercare = specs.oil_aftercare
+        screw_specs = specs.screw_specs
+        st.session_state.edit_screw_specs = {
+            'material_spec_description': screw_specs.material_spec_description,
+            'screw_type_general': screw_specs.screw_type_general,
+            'applicable_general': screw_specs.applicable_general,
+            'screw_type_wear': screw_specs.screw_type_wear,
+            'applicable_wear': screw_specs.applicable_wear,
+            # 세션에는 DataFrame 대신 레코드 목록으로 보관 (편집기에서 필요할 때만 DataFrame 생성)
+            'general_cycle': [dict(row) for row in (screw_specs.general_cycle if 'general_cycle' in screw_specs.model_fields_set else DEFAULT_GENERAL_CYCLE)],
+            'wear_resistant_cycle': [dict(row) for row in (screw_specs.wear_resistant_cycle if 'wear_resistant_cycle' in screw_specs.model_fields_set else DEFAULT_WEAR_CYCLE)]
+        }
     else:
         st.session_state.selected_eq_id_admin = None
 
@@ -1374,10 +2542,709 @@ def set_selected_log():
         else:
             st.session_state.selected_log_id = None
 
+# ------------------------------------------------------
+# 정적 자산 (로그인 화면 로고/배경)
+# ------------------------------------------------------
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+REMOTE_LOGO_URL = "https://xvudytcfwnzjxhaortik.supabase.co/storage/v1/object/public/equipment_images/logo_image/logo.png"
+REMOTE_BACKGROUND_URL = "https://xvudytcfwnzjxhaortik.supabase.co/storage/v1/object/public/equipment_images/logo_image/background.png"
+
+@st.cache_resource
+def load_static_manifest():
+    """scripts/build_static_assets.py가 생성한 매니페스트 로드 (빌드 전이면 빈 dict)"""
+    try:
+        with open(os.path.join(STATIC_DIR, 'manifest.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def static_asset_url(asset, variant, fallback_url):
+    """로컬 정적 자산 URL. ?v=<해시>가 붙으면 서버가 장기 캐시 헤더로 응답한다."""
+    entry = load_static_manifest().get(asset, {}).get(variant)
+    if not entry or not os.path.exists(os.path.join(STATIC_DIR, entry['file'])):
+        return fallback_url
+    base_path = (st.get_option('server.baseUrlPath') or '').strip('/')
+    prefix = f"/{base_path}" if base_path else ''
+    return f"{prefix}/app/static/{entry['file']}?v={entry['hash']}"
+
+# ------------------------------------------------------
+# 대시보드 설비 카드 (요약 행 + 지연 렌더링되는 상세)
+# ------------------------------------------------------
+def equipment_status_text(status):
+    if status == '정상':
+        return get_translation('normal')
+    if status == '고장':
+        return get_translation('faulty')
+    return get_translation('sold')
+
+@st.fragment
+def render_equipment_card(eq):
+    """설비 한 대의 요약 행. 상세 영역은 열었을 때만 만들고, 카드 안 조작은 이 fragment만 다시 실행"""
+    touch_session()
+    eq = apply_equipment_patch(eq)
+    status_icon = "🟢" if eq.get('status') == '정상' else "🔴" if eq.get('status') == '고장' else "💰"
+    pending_mark = " ⏳ 첨부 업로드 중" if eq.get('attachments_pending') else ""
+    with st.container(border=True):
+        summary_cols = st.columns([3, 2, 2, 2, 1])
+        with summary_cols[0]:
+            st.markdown(f"{status_icon} **{eq['name']}**{pending_mark}")
+        with summary_cols[1]:
+            st.caption(f"{get_translation('model')}: {eq.get('model') or '-'}")
+        with summary_cols[2]:
+            st.caption(f"{get_translation('maker')}: {eq.get('maker') or '-'}")
+        with summary_cols[3]:
+            st.caption(f"{get_translation('status')}: {equipment_status_text(eq.get('status'))}")
+        with summary_cols[4]:
+            is_open = st.toggle(get_translation('equipment_card_details'), key=f"eq_card_open_{eq['id']}")
+        flash = st.session_state.pop(f"eq_card_flash_{eq['id']}", None)
+        if flash:
+            st.success(flash)
+        if is_open:
+            render_equipment_detail(eq)
+
+def render_equipment_detail(eq):
+    """설비 상세 (이미지, 사양, 문서, 상태 변경, 최근 이력)"""
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        # 이미지 표시
+        if eq.get('image_urls'):
+            image_urls = eq['image_urls'].split(',') if isinstance(eq['image_urls'], str) else []
+            if image_urls:
+                for url in image_urls:
+                    url = url.strip()
+                    try:
+                        st.image(url, width=300, caption=f"{eq['name']} 이미지")
+                    except Exception as e:
+                        st.warning(f"이미지 로드 실패 ({url}): {str(e)}")
+            else:
+                st.warning(get_translation('no_valid_image_urls'))
+        else:
+            st.warning(get_translation('no_attachments'))
+
+        # 상태 변경 폼
+        st.subheader(get_translation('record_status'))
+        with st.form(f"status_form_{eq['id']}", clear_on_submit=True):
+            history_date = st.date_input(get_translation('maintenance_date'), value=date.today())
+            history_time = st.time_input(get_translation('maintenance_time'), value=time(datetime.now().hour, datetime.now().minute))
+            new_status = st.radio(get_translation('change_status'), [f'🟢 {get_translation("normal")}', f'🔴 {get_translation("faulty")}', f'💰 {get_translation("sold")}'], index=0 if eq.get('status') == '정상' else 1 if eq.get('status') == '고장' else 2)
+            notes = st.text_area(get_translation('notes'))
+            if st.form_submit_button(get_translation('record_button')):
+                if new_status.startswith('🟢'):
+                    final_status = '정상'
+                elif new_status.startswith('🔴'):
+                    final_status = '고장'
+                elif new_status.startswith('💰'):
+                    final_status = '매각'
+                add_status_history(eq['id'], final_status, notes, history_date, history_time)
+                # 이 카드만 다시 그려 요약 행과 이력을 갱신
+                st.session_state[f"eq_card_flash_{eq['id']}"] = f"상태 '{final_status}' 기록 완료"
+                st.rerun(scope="fragment")
+    with col2:
+        # 설비 상세 정보 (통합 표시)
+        st.subheader(get_translation('equipment_details'))
+
+        # 연식 강조 표시 (조회 시점에 계산된 age_years 사용)
+        if eq.get('age_years') is not None:
+            st.markdown(
+                f"<b>{get_translation('equipment_age')}:</b> {eq['age_years']} {get_translation('years')}",
+                unsafe_allow_html=True
+            )
+        else:
+            st.markdown(
+                f"<b>{get_translation('equipment_age')}:</b> {get_translation('not_available')}",
+                unsafe_allow_html=True
+            )
+
+        try:
+            # 사양 JSON은 행 버전별로 한 번만 파싱된 모델을 사용
+            specs = get_equipment_specs(eq)
+            spec_frames = get_equipment_spec_frames(eq)
+            details = specs.details
+
+            fields_config = specs.fields_config
+
+            # === 1. 기본 정보 (2열 레이아웃) ===
+            with st.container():
+                details_list = [
+                    (get_translation('maker'), eq.get('maker', 'N/A')),
+                    (get_translation('model'), eq.get('model', 'N/A')),
+                    (get_translation('status'), eq.get('status', 'N/A')),
+                    (get_translation('product_name'), eq.get('product_name', 'N/A')),
+                    (get_translation('serial_number'), eq.get('serial_number', 'N/A')),
+                    (get_translation('production_date'), eq.get('production_date', 'N/A')),
+                    (get_translation('acquisition_cost'), eq.get('acquisition_cost', 'N/A')),
+                    (get_translation('acquisition_date'), eq.get('acquisition_date', 'N/A')),
+                    (get_translation('acquisition_basis'), eq.get('acquisition_basis', 'N/A')),
+                    (get_translation('purchase_date'), eq.get('purchase_date', 'N/A')),
+                    (get_translation('installation_location'), eq.get('installation_location', 'N/A')),
+                    (get_translation('equipment_grade'), eq.get('equipment_grade', 'N/A')),
+                    (get_translation('motor_capacity_specs'), eq.get('motor_capacity', 'N/A')),
+                    (get_translation('heater_capacity_specs'), eq.get('heater_capacity', 'N/A')),
+                    (get_translation('total_weight'), eq.get('total_weight', 'N/A')),
+                ]
+
+                cols = st.columns(2)
+                for i, (label, value) in enumerate(details_list):
+                    with cols[i % 2]:
+                        st.write(f"**{label}:** {value}")
+
+            # === 2. 특화 필드 추가 (equipment 테이블에서 직접 가져오기) ===
+            with st.container():
+                specific_field_keys = fields_config.get('specific_fields', [])
+                if specific_field_keys:
+                    st.subheader(get_translation('specific_fields'))
+                    specific_details = []
+                    for field_key in specific_field_keys:
+                        field_def = get_field_spec(field_key)
+                        field_value = eq.get(field_key, '') or details.get(field_key, '')
+                        if field_value and str(field_value).strip() and str(field_value) != 'N/A':
+                            translated_label = get_translation(field_def['label'])
+                            specific_details.append((translated_label, field_value))
+
+                    if specific_details:
+                        # 2열 레이아웃으로 표시
+                        cols = st.columns(2)
+                        for i, (label, value) in enumerate(specific_details):
+                            with cols[i % 2]:
+                                # 긴 텍스트는 줄바꿈 적용
+                                if isinstance(value, str) and '\n' in value:
+                                    st.markdown(f"**{label}:**")
+                                    st.markdown(value.replace('\n', '  \n'))
+                                else:
+                                    st.markdown(f"**{label}:** {value}")
+                    else:
+                        st.info(get_translation('no_specific_fields'))
+                else:
+                    st.info(get_translation('no_specific_fields'))
+
+            # === 3. 커스텀 섹션 필드 추가 (텍스트 형태) - 별도로 표시 ===
+            default_sections = ['has_accessory_specs', 'has_spare_part_specs', 'has_screw_specs', 'has_oil_specs', 'has_documents']
+            custom_section_list = []
+
+            for config_key, config_value in fields_config.items():
+                if config_key.startswith('has_') and config_value == True and config_key not in default_sections and config_key != 'has_other_notes':
+                    section_key = config_key.replace('has_', '')
+                    field_def = get_field_definition(section_key)
+                    if field_def:
+                        custom_value = eq.get(section_key, '') or details.get(section_key, '')
+                        if custom_value and str(custom_value).strip():
+                            custom_section_list.append((field_def['field_label'], custom_value))
+
+            # 커스텀 섹션이 있을 경우에만 표시
+            if custom_section_list:
+                st.markdown("---")
+                st.subheader("추가 정보")
+                cols = st.columns(2)
+                for i, (label, value) in enumerate(custom_section_list):
+                    with cols[i % 2]:
+                        # 긴 텍스트는 줄바꿈 적용
+                        if isinstance(value, str) and '\n' in value:
+                            st.markdown(f"**{label}:**")
+                            st.markdown(value.replace('\n', '  \n'))
+                        else:
+                            st.markdown(f"**{label}:** {value}")
+
+            # === 4. 기타사항 추가 ===
+            other_notes = eq.get('other_notes', '') or details.get('other_notes', '')
+            if other_notes and str(other_notes).strip():
+                st.markdown("---")
+                st.subheader(get_translation('other_notes'))
+                st.markdown(other_notes.replace('\n', '  \n'))
+
+            # === 5. 테이블 형태 섹션 (선택적 섹션들) - 항상 제목 표시 ===
+            st.markdown("---")
+            st.markdown("##### 📋 상세 사양")
+
+            # 부속기기
+            if fields_config.get('has_accessory_specs', False):
+                st.markdown(f"**{get_translation('accessory_specs')}**")
+                if spec_frames['accessory_specs'] is not None:
+                    st.dataframe(spec_frames['accessory_specs'], width='stretch')
+                else:
+                    st.info("등록된 부속기기가 없습니다.")
+                st.markdown("")
+
+            # SPARE PART
+            if fields_config.get('has_spare_part_specs', False):
+                st.markdown(f"**{get_translation('spare_part_specs')}**")
+                if spec_frames['spare_part_specs'] is not None:
+                    st.dataframe(spec_frames['spare_part_specs'], width='stretch')
+                else:
+                    st.info("등록된 SPARE PART가 없습니다.")
+                st.markdown("")
+
+            # 스크류 사양
+            if fields_config.get('has_screw_specs', False):
+                st.markdown(f"**{get_translation('screw_specs')}**")
+                screw_data = specs.screw_specs
+                if screw_data.has_content():
+                    if screw_data.material_spec_description:
+                        st.markdown("*재료 사양:*")
+                        # 원본 줄바꿈 유지
+                        st.text(screw_data.material_spec_description)
+                    if spec_frames['screw_general_cycle'] is not None:
+                        st.markdown("*일반용 SCREW 교체 주기*")
+                        st.dataframe(spec_frames['screw_general_cycle'], width='stretch')
+                    if spec_frames['screw_wear_cycle'] is not None:
+                        st.markdown("*내마모성 SCREW 교체 주기*")
+                        st.dataframe(spec_frames['screw_wear_cycle'], width='stretch')
+                else:
+                    st.info("등록된 스크류 사양이 없습니다.")
+                st.markdown("")
+
+            # 작동유
+            if fields_config.get('has_oil_specs', False):
+                st.markdown(f"**{get_translation('oil_specs')}**")
+                if spec_frames['oil_specs'] is not None:
+                    st.dataframe(spec_frames['oil_specs'], width='stretch')
+
+                    # oil_notes와 aftercare
+                    oil_notes = specs.oil_notes
+                    oil_aftercare = specs.oil_aftercare
+                    if oil_notes:
+                        st.markdown(f"*{oil_notes}*")
+                    if oil_aftercare and oil_aftercare.strip():
+                        st.markdown(f"*1년 경과 후:*  \n{oil_aftercare.replace(chr(10), '  ' + chr(10))}")
+                else:
+                    st.info("등록된 작동유 정보가 없습니다.")
+                st.markdown("")
+
+            # 문서
+            st.markdown(f"**{get_translation('documents')}**")
+            # 중복 제거 (이름 기반)
+            unique_doc_data = {d.name: d for d in specs.documents}.values()  # 이름 중복 시 마지막 항목만 유지
+            if unique_doc_data:
+                for item in unique_doc_data:
+                    doc_name = item.name or 'Unnamed Document'
+                    doc_url = item.url
+                    if doc_url:
+                        st.write(f"문서: {doc_name}")
+                        # 서버에서 파일 전체를 받아오지 않고 Storage 공개 URL로 바로 연결
+                        st.link_button(f"다운로드 {doc_name}", doc_url)
+            else:
+                st.info("등록된 문서가 없습니다.")
+
+        except Exception as e:
+            st.error(f"설비 정보 표시 중 오류: {str(e)}")
+            import traceback
+            st.error(traceback.format_exc())
+
+    # 최근 정비 이력
+    st.markdown("---")
+    st.subheader(get_translation('recent_maintenance_logs'))
+    maintenance_logs = get_maintenance_logs(equipment_id=eq['id'])
+    if maintenance_logs:
+        recent_logs = maintenance_logs[:5]
+        log_df = pd.DataFrame(recent_logs)
+        log_df['maintenance_date'] = log_df['maintenance_date_display']
+        columns = table_columns('recent_logs')
+        st.dataframe(
+            log_df.rename(columns=columns['rename'])[columns['order']],
+            width='stretch',
+            hide_index=True
+        )
+    else:
+        st.info(get_translation('no_recent_logs'))
+
+    # 최근 상태 이력
+    st.markdown("---")
+    st.subheader(get_translation('recent_status_history'))
+    status_history = get_status_history(equipment_id=eq['id'])
+    if status_history:
+        status_df = pd.DataFrame(status_history)
+        status_df['created_at'] = status_df['created_at_display']
+        columns = table_columns('recent_status')
+        st.dataframe(
+            status_df.rename(columns=columns['rename'])[columns['order']],
+            width='stretch'
+        )
+    else:
+        st.info(get_translation('no_status_history'))
+
+# ------------------------------------------------------
+# 정비 이력 / 상태 기록 입력 영역 (fragment 단위 재실행)
+# ------------------------------------------------------
+@st.fragment
+def render_add_log_form(equipment_list):
+    """정비 이력 추가 폼. 제출해도 이 영역만 다시 실행"""
+    touch_session()
+    eq_options = {eq['name']: eq['id'] for eq in equipment_list}
+    selected_eq_name = st.selectbox(get_translation('select_equipment'), options=list(eq_options.keys()), key='add_log_equipment_select')
+    selected_eq_id = eq_options.get(selected_eq_name, None)
+
+    if selected_eq_id:
+        with st.form("add_log_form", clear_on_submit=True):
+            engineer = st.text_input(get_translation('engineer_name'))
+            action_category = st.selectbox(
+                get_translation('action_category'),
+                options=[
+                    get_translation('electrical'),
+                    get_translation('mechanical'),
+                    get_translation('drive'),
+                    get_translation('other_category')
+                ],
+                key='add_log_action_category'
+            )
+            action = st.text_input(get_translation('maintenance_action'))
+            notes = st.text_area(get_translation('notes'))
+            col_dt1, col_dt2 = st.columns(2)
+            with col_dt1:
+                maintenance_date = st.date_input(
+                    get_translation('maintenance_date'),
+                    value=date.today(),
+                    min_value=date(1900, 1, 1)
+                )
+            with col_dt2:
+                maintenance_time = st.time_input(
+                    get_translation('maintenance_time'),
+                    value=time(datetime.now().hour, datetime.now().minute)
+                )
+            cost = st.number_input("정비 비용", min_value=0.0, format="%.2f", key="add_log_cost")
+            uploaded_images = st.file_uploader(
+                get_translation('upload_image'),
+                type=['png', 'jpg', 'jpeg'],
+                accept_multiple_files=True
+            )
+            submitted = st.form_submit_button(get_translation('add_log_button'))
+            if submitted:
+                attachments = [(f, 'image') for f in uploaded_images or []]
+                add_log(selected_eq_id, engineer, action, notes, maintenance_date, maintenance_time, None, cost, action_category, attachments=attachments)
+                st.success("정비 이력이 성공적으로 추가되었습니다.")
+
+@st.fragment
+def render_status_record_panel(factory_id, equipment_list):
+    """상태 기록 폼과 최근 상태 이력. 제출해도 이 영역만 다시 실행"""
+    touch_session()
+    eq_options = {eq['name']: eq['id'] for eq in equipment_list}
+    selected_eq_name = st.selectbox(get_translation('select_equipment'), options=list(eq_options.keys()), key='record_status_equipment_select')
+    selected_eq_id = eq_options.get(selected_eq_name, None)
+
+    if selected_eq_id:
+        with st.form("record_status_form", clear_on_submit=True):
+            status = st.radio(get_translation('change_status'), [get_translation('normal'), get_translation('faulty'), get_translation('sold')])
+            notes = st.text_area(get_translation('notes'))
+            col_dt1, col_dt2 = st.columns(2)
+            with col_dt1:
+                history_date = st.date_input(get_translation('maintenance_date'), value=date.today())
+            with col_dt2:
+                history_time = st.time_input(get_translation('maintenance_time'), value=time(datetime.now().hour, datetime.now().minute))
+            submitted = st.form_submit_button(get_translation('record_button'))
+            if submitted:
+                add_status_history(selected_eq_id, status, notes, history_date, history_time)
+
+    st.subheader(get_translation('recent_status_history'))
+    status_history = get_status_history(factory_id)
+    if not status_history:
+        st.info(get_translation('no_status_history'))
+    else:
+        history_df = pd.DataFrame(status_history)
+        history_df['created_at'] = history_df['created_at_display']
+        history_df['equipment_name'] = history_df['equipment'].apply(
+            lambda x: x['name'] if isinstance(x, dict) and 'name' in x else 'Unknown'
+        )
+        columns = table_columns('status_history')
+        history_df = history_df.rename(columns=columns['rename'])
+        st.dataframe(
+            history_df[columns['order']],
+            width='stretch',
+            hide_index=True
+        )
+
+@st.fragment
+def render_factory_cost_summary(factory_id):
+    """공장 정비 비용 요약. 추이/분류는 공장 월 집계, 설비 순위는 DB 합산 상위 N건으로 계산"""
+    touch_session()
+    this_month = date.today().replace(day=1)
+    since = (pd.Timestamp(this_month) - pd.DateOffset(months=COST_SUMMARY_MONTHS - 1)).date()
+    rollup = get_factory_cost_rollup(factory_id, since=since)
+    if not rollup:
+        st.info(get_translation('cost_summary_empty'))
+        return
+    cost_df = pd.DataFrame(rollup)
+    cost_df['month'] = pd.to_datetime(cost_df['month'])
+    cost_df['cost'] = pd.to_numeric(cost_df['cost'], errors='coerce').fillna(0.0)
+    cost_df['action_category'] = cost_df['action_category'].replace('', get_translation('cost_uncategorized'))
+    month_title = get_translation('cost_month')
+    cost_title = get_translation('cost_amount')
+
+    metric_cols = st.columns(3)
+    metric_cols[0].metric(get_translation('cost_this_month'), f"{cost_df.loc[cost_df['month'] == pd.Timestamp(this_month), 'cost'].sum():,.0f}")
+    metric_cols[1].metric(get_translation('cost_recent_months').format(months=COST_SUMMARY_MONTHS), f"{cost_df['cost'].sum():,.0f}")
+    metric_cols[2].metric(get_translation('cost_log_count'), f"{int(cost_df['log_count'].sum()):,}")
+
+    monthly = cost_df.groupby(['month', 'action_category'], as_index=False)['cost'].sum()
+    chart = alt.Chart(monthly).mark_bar().encode(
+        x=alt.X('yearmonth(month):T', title=month_title),
+        y=alt.Y('cost:Q', title=cost_title),
+        color=alt.Color('action_category:N', title=get_translation('action_category')),
+        tooltip=[alt.Tooltip('yearmonth(month):T', title=month_title), alt.Tooltip('action_category:N', title=get_translation('action_category')), alt.Tooltip('cost:Q', title=cost_title, format=',.0f')]
+    ).properties(
+        width='container'
+    )
+    st.altair_chart(chart)
+
+    equipment_names = {eq['id']: eq['name'] for eq in get_equipment(factory_id)}
+    top_equipment = pd.DataFrame(get_factory_equipment_costs(factory_id, since=since), columns=['equipment_id', 'cost', 'log_count'])
+    top_equipment['cost'] = pd.to_numeric(top_equipment['cost'], errors='coerce').fillna(0.0)
+    top_equipment.insert(0, get_translation('equipment_name'), top_equipment['equipment_id'].map(equipment_names).fillna('Unknown'))
+    st.dataframe(
+        top_equipment.drop(columns='equipment_id').rename(columns={'cost': cost_title, 'log_count': get_translation('cost_log_count')}),
+        width='stretch',
+        hide_index=True
+    )
+
+@st.fragment
+def render_reliability_summary(factory_id):
+    """공장 신뢰성 지표 요약과 설비별 지표 (기간을 바꿔도 이 영역만 다시 실행)"""
+    touch_session()
+    period_key = st.selectbox(get_translation('period'), options=list(RELIABILITY_PERIOD_DAYS), index=1, format_func=get_translation, key="reliability_period")
+    days = RELIABILITY_PERIOD_DAYS[period_key]
+    totals = get_reliability_summary(factory_id, days=days, by=())
+    if totals.empty or not (totals.loc[0, 'up_hours'] + totals.loc[0, 'down_hours']):
+        st.info(get_translation('no_status_history'))
+        return
+    total = totals.iloc[0]
+    metric_cols = st.columns(4)
+    metric_cols[0].metric(get_translation('reliability_failures'), f"{int(total['failures']):,}")
+    metric_cols[1].metric("MTBF", '-' if pd.isna(total['mtbf_hours']) else f"{total['mtbf_hours']:,.1f} h")
+    metric_cols[2].metric("MTTR", '-' if pd.isna(total['mttr_hours']) else f"{total['mttr_hours']:,.1f} h")
+    metric_cols[3].metric(get_translation('reliability_availability_short'), '-' if pd.isna(total['availability']) else f"{total['availability'] * 100:.2f}%")
+
+    by_equipment = get_reliability_summary(factory_id, days=days)
+    equipment_names = {eq['id']: eq['name'] for eq in get_equipment(factory_id)}
+    by_equipment = by_equipment.sort_values(['down_hours', 'failures'], ascending=False)
+    by_equipment.insert(0, get_translation('equipment_name'), by_equipment['equipment_id'].map(equipment_names).fillna('Unknown'))
+    st.dataframe(reliability_display_frame(by_equipment.drop(columns='equipment_id')), width='stretch', hide_index=True)
+
+@st.fragment
+def render_downtime_heatmap(factory_id):
+    """설비별 고장 일자 히트맵. 집계된 셀(고장 시간이 있는 칸)만 브라우저로 보냄"""
+    touch_session()
+    option_cols = st.columns(2)
+    with option_cols[0]:
+        range_key = st.selectbox(get_translation('period'), options=list(DOWNTIME_HEATMAP_RANGES), format_func=get_translation, key="downtime_heatmap_range")
+    with option_cols[1]:
+        top_n = st.selectbox(
+            get_translation('downtime_heatmap_equipment_shown'), options=[20, 50, 100, None], index=1,
+            format_func=lambda n: get_translation('downtime_heatmap_all') if n is None else get_translation('downtime_heatmap_top_n').format(n=n),
+            key="downtime_heatmap_top"
+        )
+    days, bucket = DOWNTIME_HEATMAP_RANGES[range_key]
+    cube = get_downtime_cube(factory_id)
+    equipment_names = {eq['id']: eq['name'] for eq in get_equipment(factory_id)}
+    heatmap, row_ids = downtime_heatmap_frame(cube, days, bucket, equipment_names, top_n)
+    if heatmap is None:
+        st.success(get_translation('downtime_heatmap_no_faults'))
+        return
+    # 행은 설비 ID로 나누고 축 라벨만 설비 이름으로 표시 (필드 이름은 그대로, 제목만 번역)
+    down_hours_title = get_translation('reliability_down_hours')
+    row_labels = dict(zip(heatmap['설비 ID'], heatmap['설비']))
+    chart = alt.Chart(heatmap).mark_rect().encode(
+        x=alt.X('시작:T', title=None),
+        x2='끝:T',
+        y=alt.Y('설비 ID:N', sort=row_ids, title=None, axis=alt.Axis(labelExpr=f"{json.dumps(row_labels, ensure_ascii=False)}[datum.value]")),
+        color=alt.Color('고장 시간(h):Q', scale=alt.Scale(scheme='reds'), title=down_hours_title),
+        tooltip=[
+            alt.Tooltip('설비:N', title=get_translation('col_equipment_name')),
+            alt.Tooltip('시작:T', title=get_translation('downtime_heatmap_date'), format='%Y-%m-%d'),
+            alt.Tooltip('고장 시간(h):Q', title=down_hours_title),
+        ]
+    ).properties(
+        width='container',
+        height=max(120, 18 * len(row_ids))
+    )
+    st.altair_chart(chart)
+    st.caption(get_translation('downtime_heatmap_caption').format(
+        rows=len(row_ids), cells=len(heatmap), equipment=cube['hours'].shape[0], days=cube['hours'].shape[1]
+    ))
+
+@st.fragment
+def render_admin_overview():
+    """관리자 전체 현황 (공장별 설비 상태, 진행 중 고장, 이번 달 정비 건수/비용)"""
+    touch_session()
+    overview = get_admin_overview(date.today())
+    if not overview:
+        st.info(get_translation('admin_overview_no_factories'))
+        return
+    overview_df = pd.DataFrame(overview)
+    metric_cols = st.columns(4)
+    metric_cols[0].metric(get_translation('admin_overview_equipment_total'), f"{int(overview_df['equipment_total'].sum()):,}")
+    metric_cols[1].metric(get_translation('admin_overview_open_faults'), f"{int(overview_df['faulty_count'].sum()):,}")
+    metric_cols[2].metric(get_translation('admin_overview_logs_this_month'), f"{int(overview_df['logs_this_month'].sum()):,}")
+    metric_cols[3].metric(get_translation('admin_overview_cost_this_month'), f"{pd.to_numeric(overview_df['cost_this_month']).sum():,.0f}")
+
+    overview_df['oldest_fault_since'] = parse_datetime_column(overview_df['oldest_fault_since'].tolist()).dt.strftime(DISPLAY_DATETIME_FORMAT).fillna('')
+    overview_df['cost_this_month'] = pd.to_numeric(overview_df['cost_this_month']).round(0)
+    st.dataframe(
+        overview_df.drop(columns='factory_id').rename(columns={
+            'factory_name': get_translation('col_factory'),
+            'equipment_total': get_translation('admin_overview_equipment'),
+            'normal_count': get_translation('normal'),
+            'faulty_count': get_translation('faulty'),
+            'sold_count': get_translation('sold'),
+            'oldest_fault_since': get_translation('admin_overview_oldest_fault'),
+            'logs_this_month': get_translation('admin_overview_logs_this_month'),
+            'cost_this_month': get_translation('admin_overview_cost_this_month'),
+        }),
+        width='stretch',
+        hide_index=True
+    )
+    if st.button(get_translation('refresh'), key="admin_overview_refresh"):
+        get_admin_overview.clear()
+        st.rerun(scope="fragment")
+
+@st.fragment
+def render_log_search(current_factory_id):
+    """정비 이력 전문 검색. 검색어/필터를 바꿔도 이 영역만 다시 실행.
+    공장 사용자는 로그인한 공장의 이력만, 관리자 인증 후에는 다른 공장/전체 공장도 검색할 수 있다."""
+    touch_session()
+    log_query = st.text_input(get_translation('log_search_query'), placeholder=get_translation('log_search_placeholder'), key="log_search_query")
+    is_admin = st.session_state.get('admin_authenticated', False)
+    filter_cols = st.columns(4 if is_admin else 3)
+    if is_admin:
+        factories = {factory['id']: factory['name'] for factory in get_factories()}
+        with filter_cols[0]:
+            search_factory_id = st.selectbox(
+                get_translation('log_search_factory'),
+                options=[None] + list(factories),
+                index=list(factories).index(current_factory_id) + 1 if current_factory_id in factories else 0,
+                format_func=lambda fid: get_translation('log_search_all_factories') if fid is None else factories[fid],
+                key="log_search_factory"
+            )
+    elif current_factory_id is None:
+        return
+    else:
+        search_factory_id = current_factory_id
+    with filter_cols[-3]:
+        search_categories = st.multiselect(get_translation('action_category'), options=log_search_categories(), key="log_search_categories")
+    with filter_cols[-2]:
+        search_date_from = st.date_input(get_translation('log_search_date_from'), value=None, key="log_search_date_from")
+    with filter_cols[-1]:
+        search_date_to = st.date_input(get_translation('log_search_date_to'), value=None, key="log_search_date_to")
+
+    if not log_query.strip():
+        ensure_log_search_index()  # 검색 전에 미리 빌드 시작
+        return
+    results = search_maintenance_logs(log_query, search_factory_id, search_categories, search_date_from, search_date_to)
+    state = get_log_search_state()
+    if results is None:
+        if state['error']:
+            st.warning(get_translation('log_search_index_failed').format(error=state['error']))
+        else:
+            st.info(get_translation('log_search_index_building'))
+        if st.button(get_translation('log_search_retry'), key="log_search_retry"):
+            st.rerun(scope="fragment")
+        return
+    if not results:
+        st.warning(get_translation('log_search_no_results'))
+    else:
+        st.dataframe(
+            pd.DataFrame([{
+                get_translation('maintenance_date'): entry['maintenance_date_display'],
+                get_translation('log_search_factory'): entry['factory_name'],
+                get_translation('equipment_name'): entry['equipment_name'],
+                get_translation('action_category'): entry['action_category'],
+                get_translation('col_engineer'): entry['engineer'],
+                get_translation('col_action'): entry['action'],
+                get_translation('col_notes'): entry['notes'],
+                get_translation('log_search_score'): entry['score'],
+            } for entry in results]),
+            width='stretch',
+            hide_index=True
+        )
+    built_at = state['built_at']
+    st.caption(get_translation('log_search_summary').format(count=len(results), limit=LOG_SEARCH_LIMIT, indexed=len(state['entries']))
+               + (get_translation('log_search_rebuilt_at').format(time=f"{built_at:%H:%M}") if built_at else ''))
+
+# ------------------------------------------------------
+# 현황판 (작업장 TV용, 변경 토큰 기반 증분 갱신)
+# ------------------------------------------------------
+WALLBOARD_REFRESH_SECONDS = int(os.getenv('WALLBOARD_REFRESH_SECONDS', '15'))
+WALLBOARD_COLUMNS = 'id, name, model, status, installation_location, updated_at'
+# 토큰 조회 직전에 시작해 늦게 커밋된 트랜잭션을 놓치지 않도록 증분 조회 구간을 겹치게 잡음
+WALLBOARD_SYNC_OVERLAP = timedelta(seconds=60)
+WALLBOARD_STATUS_COLORS = {'정상': '#2e7d32', '고장': '#c62828', '매각': '#6d6d6d'}
+
+def get_equipment_change_token(factory_id):
+    """공장 설비의 {max_updated_at, row_count}. 현황판이 매 주기마다 호출하는 저비용 조회"""
+    return supabase.rpc('equipment_change_token', {'p_factory_id': factory_id}).execute().data or {}
+
+def fetch_wallboard_rows(factory_id, since=None):
+    query = supabase.from_('equipment').select(WALLBOARD_COLUMNS).eq('factory_id', factory_id)
+    if since:
+        query = query.gte('updated_at', since)
+    return query.execute().data or []
+
+def sync_wallboard(factory_id):
+    """변경 토큰이 바뀐 경우에만 바뀐 행을 읽어 세션의 현황판 행에 반영"""
+    board = st.session_state.get('wallboard')
+    if not board or board['factory_id'] != factory_id:
+        board = {'factory_id': factory_id, 'rows': {}, 'token': None}
+    token = get_equipment_change_token(factory_id)
+    if token != board['token']:
+        previous = (board['token'] or {}).get('max_updated_at')
+        if board['rows'] and previous:
+            since = (datetime.fromisoformat(previous) - WALLBOARD_SYNC_OVERLAP).isoformat()
+            for row in fetch_wallboard_rows(factory_id, since):
+                board['rows'][row['id']] = row
+        if len(board['rows']) != token.get('row_count', 0):
+            # 처음 열었거나 삭제/이동이 있으면 가벼운 컬럼만 전체 다시 읽기
+            board['rows'] = {row['id']: row for row in fetch_wallboard_rows(factory_id)}
+        board['token'] = token
+    board['checked_at'] = datetime.now()
+    st.session_state['wallboard'] = board
+    return board
+
+@st.fragment(run_every=WALLBOARD_REFRESH_SECONDS)
+def render_wallboard(factory_id):
+    """설비 상태 격자. 주기적으로 이 fragment만 다시 실행되며 전체 스크립트는 다시 실행하지 않음"""
+    touch_session()
+    try:
+        board = sync_wallboard(factory_id)
+    except Exception as e:
+        st.warning(get_translation('wallboard_refresh_failed').format(error=e))
+        board = st.session_state.get('wallboard')
+        if not board:
+            return
+    rows = sorted(board['rows'].values(), key=lambda row: row.get('name') or '')
+
+    metric_cols = st.columns(4)
+    metric_cols[0].metric(get_translation('wallboard_total'), len(rows))
+    for col, status in zip(metric_cols[1:], ('정상', '고장', '매각')):
+        col.metric(equipment_status_text(status), sum(1 for row in rows if row.get('status') == status))
+
+    # 설비 수가 많아도 요소 하나로 그리도록 격자를 HTML 한 덩어리로 생성
+    cells = []
+    for row in rows:
+        color = WALLBOARD_STATUS_COLORS.get(row.get('status'), '#6d6d6d')
+        location = html.escape(row.get('installation_location') or '')
+        cells.append(
+            f'<div class="wb-cell" style="background:{color}">'
+            f'<div class="wb-name">{html.escape(row.get("name") or "")}</div>'
+            f'<div class="wb-meta">{html.escape(row.get("model") or "")}{" · " + location if location else ""}</div>'
+            f'<div class="wb-status">{html.escape(equipment_status_text(row.get("status")))}</div>'
+            '</div>'
+        )
+    st.markdown(
+        """
+        <style>
+        .wb-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(180px, 1fr)); gap: 8px; }
+        .wb-cell { color: #fff; border-radius: 8px; padding: 10px 12px; }
+        .wb-name { font-size: 1.2rem; font-weight: 700; }
+        .wb-meta { font-size: 0.8rem; opacity: 0.85; }
+        .wb-status { font-size: 1rem; margin-top: 4px; }
+        </style>
+        """ + f'<div class="wb-grid">{"".join(cells)}</div>',
+        unsafe_allow_html=True
+    )
+    st.caption(get_translation('wallboard_last_checked').format(time=f"{board['checked_at']:%H:%M:%S}", seconds=WALLBOARD_REFRESH_SECONDS))
+
 # ------------------------------------------------------
 # Streamlit UI
 # ------------------------------------------------------
 st.set_page_config(page_title=get_translation('title'), layout="wide")
+ensure_upload_worker()
+track_session_activity()
 
 # 언어 선택 버튼
 header_cols = st.columns([1, 1, 1, 0.1, 0.1, 0.1, 0.1])
@@ -1392,12 +3259,29 @@ with header_cols[6]:
 
 # 로그인 화면
 if not st.session_state['authenticated']:
-    # 회사 로고를 타이틀 위로 이동
-    logo_url = "https://xvudytcfwnzjxhaortik.supabase.co/storage/v1/object/public/equipment_images/logo_image/logo.png"
-    st.image(logo_url, width=200)  # use_column_width 대체
+    # 회사 로고를 타이틀 위로 이동 (빌드된 로컬 자산 우선, 없으면 원격 URL)
+    logo_url = static_asset_url('logo', 'desktop', REMOTE_LOGO_URL)
+    if logo_url == REMOTE_LOGO_URL:
+        st.image(logo_url, width=200)  # use_column_width 대체
+    else:
+        logo_2x_url = static_asset_url('logo', 'desktop_2x', logo_url)
+        logo_mobile_url = static_asset_url('logo', 'mobile', logo_url)
+        logo_mobile_2x_url = static_asset_url('logo', 'mobile_2x', logo_mobile_url)
+        st.markdown(
+            f"""
+            <div class="login-logo">
+                <picture>
+                    <source media="(max-width: 600px)" srcset="{logo_mobile_url} 1x, {logo_mobile_2x_url} 2x">
+                    <img src="{logo_url}" srcset="{logo_url} 1x, {logo_2x_url} 2x" width="200" alt="logo">
+                </picture>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
     
-    # 배경 이미지 CSS 설정
-    background_url = "https://xvudytcfwnzjxhaortik.supabase.co/storage/v1/object/public/equipment_images/logo_image/background.png"
+    # 배경 이미지 CSS 설정 (모바일은 작은 변형 사용)
+    background_url = static_asset_url('background', 'desktop', REMOTE_BACKGROUND_URL)
+    background_mobile_url = static_asset_url('background', 'mobile', background_url)
     st.markdown(
         f"""
         <style>
@@ -1411,6 +3295,7 @@ if not st.session_state['authenticated']:
         }}
         @media (max-width: 600px) {{
             .stApp {{
+                background-image: url("{background_mobile_url}");
                 background-size: cover;
                 background-attachment: scroll;
                 background-position: center;  /* 모바일에서는 중앙으로 */
@@ -1423,8 +3308,12 @@ if not st.session_state['authenticated']:
             margin-left: auto;
             margin-right: auto;
         }}
+        .login-logo {{
+            margin-bottom: 20px;
+            margin-top: 10px;
+        }}
         @media (max-width: 600px) {{
-            .stImage > img {{
+            .stImage > img, .login-logo img {{
                 width: 120px !important;
             }}
         }}
@@ -1472,382 +3361,50 @@ else:
     factory_id = st.session_state.current_factory['id']
     factory_name = st.session_state.current_factory['name']
     st.title(get_translation('title') + f" - {factory_name}")
+    render_upload_status(factory_id)
 
-    # 탭 초기화
-    tabs = st.tabs([
-        get_translation('dashboard'),
-        get_translation('add_equipment'),
-        get_translation('add_maintenance_log'),
-        get_translation('view_maintenance_log'),
-        get_translation('record_status'),
-        get_translation('admin_mode')
-    ])
+    # 페이지 정의 (st.navigation이 현재 선택된 페이지 함수만 실행)
 
 # ------------------------ 대시보드 ------------------------
-    with tabs[0]:
+    def page_dashboard():
         st.header(get_translation('dashboard'))
-        equipment_search = st.text_input("설비 검색", placeholder="설비 이름, 제조사, 모델, 상태로 검색...", key="dashboard_eq_search")
+        with st.expander(get_translation('cost_summary_expander').format(months=COST_SUMMARY_MONTHS)):
+            render_factory_cost_summary(factory_id)
+        with st.expander(get_translation('reliability_expander')):
+            render_reliability_summary(factory_id)
+        equipment_search = st.text_input("설비 검색", placeholder="설비 이름, 모델, 제조사, 시리얼, 위치, 특화 필드로 검색 (오타 허용)...", key="dashboard_eq_search")
+        # 전체 실행에서는 설비 목록을 새로 조회하므로 fragment용 행 패치는 필요 없음
+        reset_equipment_patches()
         equipment_list = get_equipment(factory_id)
-        if equipment_search:
-            filtered_equipment = [eq for eq in equipment_list if
-                                 equipment_search.lower() in eq['name'].lower() or
-                                 equipment_search.lower() in eq.get('maker', '').lower() or
-                                 equipment_search.lower() in eq.get('model', '').lower() or
-                                 equipment_search.lower() in eq.get('status', '').lower()]
+        if equipment_search.strip():
+            # 일치도 순으로 정렬된 결과
+            filtered_equipment = search_equipment_list(equipment_list, equipment_search, factory_id)
         else:
             filtered_equipment = equipment_list
         if not filtered_equipment:
             st.info(get_translation('no_equipment_registered'))
         else:
-            for eq in filtered_equipment:
-                status_color = "green" if eq.get('status') == '정상' else "red" if eq.get('status') == '고장' else "orange"  # 매각에 orange 색상 추가
-                status_text = get_translation('normal') if eq.get('status') == '정상' else get_translation('faulty') if eq.get('status') == '고장' else get_translation('sold')
-                with st.expander(
-                        f"[{status_text}] {eq['name']} ({eq.get('model', '')})",
-                        expanded=False):
-                    col1, col2 = st.columns([1, 2])
-                    with col1:
-                        # 이미지 표시
-                        if eq.get('image_urls'):
-                            image_urls = eq['image_urls'].split(',') if isinstance(eq['image_urls'], str) else []
-                            if image_urls:
-                                for url in image_urls:
-                                    url = url.strip()
-                                    try:
-                                        st.image(url, width=300, caption=f"{eq['name']} 이미지")
-                                    except Exception as e:
-                                        st.warning(f"이미지 로드 실패 ({url}): {str(e)}")
-                            else:
-                                st.warning(get_translation('no_valid_image_urls'))
-                        else:
-                            st.warning(get_translation('no_attachments'))
-                        
-                        # 상태 변경 폼
-                        st.subheader(get_translation('record_status'))
-                        with st.form(f"status_form_{eq['id']}", clear_on_submit=True):
-                            history_date = st.date_input(get_translation('maintenance_date'), value=date.today())
-                            history_time = st.time_input(get_translation('maintenance_time'), value=time(datetime.now().hour, datetime.now().minute))
-                            new_status = st.radio(get_translation('change_status'), [f'🟢 {get_translation("normal")}', f'🔴 {get_translation("faulty")}', f'💰 {get_translation("sold")}'], index=0 if eq.get('status') == '정상' else 1 if eq.get('status') == '고장' else 2)
-                            notes = st.text_area(get_translation('notes'))
-                            if st.form_submit_button(get_translation('record_button')):
-                                if new_status.startswith('🟢'):
-                                    final_status = '정상'
-                                elif new_status.startswith('🔴'):
-                                    final_status = '고장'
-                                elif new_status.startswith('💰'):
-                                    final_status = '매각'
-                                add_status_history(eq['id'], final_status, notes, history_date, history_time)
-                                st.rerun()
-                    with col2:
-                        # 설비 상세 정보 (통합 표시)
-                        st.subheader(get_translation('equipment_details'))
-
-                        # 연식 계산 및 강조 표시
-                        production_date_str = eq.get('production_date', 'N/A')
-                        if production_date_str and production_date_str != 'N/A':
-                            production_date = get_date_value(production_date_str)
-                            if production_date:
-                                current_date = date.today()
-                                years = current_date.year - production_date.year
-                                # 월/일을 고려한 정확한 연식 계산
-                                if (current_date.month, current_date.day) < (production_date.month, production_date.day):
-                                    years -= 1
-                                st.markdown(
-                                    f"<b>{get_translation('equipment_age')}:</b> {years} {get_translation('years')}",
-                                    unsafe_allow_html=True
-                                )
-                            else:
-                                st.markdown(
-                                    f"<b>{get_translation('equipment_age')}:</b> {get_translation('not_available')}",
-                                    unsafe_allow_html=True
-                                )
-                        else:
-                            st.markdown(
-                                f"<b>{get_translation('equipment_age')}:</b> {get_translation('not_available')}",
-                                unsafe_allow_html=True
-                            )
-        
-                        try:
-                            # details JSON 로드
-                            raw_details = eq.get('details')
-                            details = raw_details if isinstance(raw_details, dict) else json.loads(raw_details if raw_details else '{}')
-
-                            # fields_config 로드
-                            raw_fields_config = eq.get('fields_config')
-                            if raw_fields_config is None:
-                                fields_config = {}
-                            elif isinstance(raw_fields_config, dict):
-                                fields_config = raw_fields_config
-                            else:
-                                fields_config = json.loads(str(raw_fields_config) if raw_fields_config else '{}')
-
-                            all_fields = get_field_definitions()
-                            
-                            # === 1. 기본 정보 (2열 레이아웃) ===
-                            with st.container():
-                                details_list = [
-                                    (get_translation('maker'), eq.get('maker', 'N/A')),
-                                    (get_translation('model'), eq.get('model', 'N/A')),
-                                    (get_translation('status'), eq.get('status', 'N/A')),
-                                    (get_translation('product_name'), eq.get('product_name', 'N/A')),
-                                    (get_translation('serial_number'), eq.get('serial_number', 'N/A')),
-                                    (get_translation('production_date'), eq.get('production_date', 'N/A')),
-                                    (get_translation('acquisition_cost'), eq.get('acquisition_cost', 'N/A')),
-                                    (get_translation('acquisition_date'), eq.get('acquisition_date', 'N/A')),
-                                    (get_translation('acquisition_basis'), eq.get('acquisition_basis', 'N/A')),
-                                    (get_translation('purchase_date'), eq.get('purchase_date', 'N/A')),
-                                    (get_translation('installation_location'), eq.get('installation_location', 'N/A')),
-                                    (get_translation('equipment_grade'), eq.get('equipment_grade', 'N/A')),
-                                    (get_translation('motor_capacity_specs'), eq.get('motor_capacity', 'N/A')),
-                                    (get_translation('heater_capacity_specs'), eq.get('heater_capacity', 'N/A')),
-                                    (get_translation('total_weight'), eq.get('total_weight', 'N/A')),
-                                ]
-
-                                cols = st.columns(2)
-                                for i, (label, value) in enumerate(details_list):
-                                    with cols[i % 2]:
-                                        st.write(f"**{label}:** {value}")
-
-                            # === 2. 특화 필드 추가 (equipment 테이블에서 직접 가져오기) ===
-                            with st.container():
-                                specific_field_keys = fields_config.get('specific_fields', [])
-                                if specific_field_keys:
-                                    st.subheader(get_translation('specific_fields'))
-                                    specific_details = []
-                                    for field_key in specific_field_keys:
-                                        field_def = FIELD_DEFINITIONS.get(field_key, {'label': field_key, 'type': 'text'})
-                                        field_value = eq.get(field_key, '') or details.get(field_key, '')
-                                        if field_value and str(field_value).strip() and str(field_value) != 'N/A':
-                                            translated_label = get_translation(field_def['label'])
-                                            specific_details.append((translated_label, field_value))
-
-                                    if specific_details:
-                                        # 2열 레이아웃으로 표시
-                                        cols = st.columns(2)
-                                        for i, (label, value) in enumerate(specific_details):
-                                            with cols[i % 2]:
-                                                # 긴 텍스트는 줄바꿈 적용
-                                                if isinstance(value, str) and '\n' in value:
-                                                    st.markdown(f"**{label}:**")
-                                                    st.markdown(value.replace('\n', '  \n'))
-                                                else:
-                                                    st.markdown(f"**{label}:** {value}")
-                                    else:
-                                        st.info(get_translation('no_specific_fields'))
-                                else:
-                                    st.info(get_translation('no_specific_fields'))
-                    
-                            # === 3. 커스텀 섹션 필드 추가 (텍스트 형태) - 별도로 표시 ===
-                            default_sections = ['has_accessory_specs', 'has_spare_part_specs', 'has_screw_specs', 'has_oil_specs', 'has_documents']
-                            custom_section_list = []
-
-                            for config_key, config_value in fields_config.items():
-                                if config_key.startswith('has_') and config_value == True and config_key not in default_sections and config_key != 'has_other_notes':
-                                    section_key = config_key.replace('has_', '')
-                                    field_def = next((f for f in all_fields if f['field_key'] == section_key), None)
-                                    if field_def:
-                                        custom_value = eq.get(section_key, '') or details.get(section_key, '')
-                                        if custom_value and str(custom_value).strip():
-                                            custom_section_list.append((field_def['field_label'], custom_value))
-
-                            # 커스텀 섹션이 있을 경우에만 표시
-                            if custom_section_list:
-                                st.markdown("---")
-                                st.subheader("추가 정보")
-                                cols = st.columns(2)
-                                for i, (label, value) in enumerate(custom_section_list):
-                                    with cols[i % 2]:
-                                        # 긴 텍스트는 줄바꿈 적용
-                                        if isinstance(value, str) and '\n' in value:
-                                            st.markdown(f"**{label}:**")
-                                            st.markdown(value.replace('\n', '  \n'))
-                                        else:
-                                            st.markdown(f"**{label}:** {value}")
-                    
-                            # === 4. 기타사항 추가 ===
-                            other_notes = eq.get('other_notes', '') or details.get('other_notes', '')
-                            if other_notes and str(other_notes).strip():
-                                st.markdown("---")
-                                st.subheader(get_translation('other_notes'))
-                                st.markdown(other_notes.replace('\n', '  \n'))
-                    
-                            # === 5. 테이블 형태 섹션 (선택적 섹션들) - 항상 제목 표시 ===
-                            st.markdown("---")
-                            st.markdown("##### 📋 상세 사양")
-                    
-                            # 부속기기
-                            if fields_config.get('has_accessory_specs', False):
-                                st.markdown(f"**{get_translation('accessory_specs')}**")
-                                accessory_data = eq.get('accessory_specs', [])
-                                if isinstance(accessory_data, str):
-                                    accessory_data = json.loads(accessory_data if accessory_data else '[]')
-                                if accessory_data:
-                                    df = pd.DataFrame(accessory_data)
-                                    df = df.rename(columns={
-                                        '순번': get_translation('col_seq'),
-                                        '부속기기 명': get_translation('col_accessory_name'),
-                                        '형식': get_translation('col_accessory_type'),
-                                        '제작번호': get_translation('col_accessory_serial'),
-                                        '용량 및 규격': get_translation('col_capacity_spec'),
-                                        '제조처': get_translation('col_maker'),
-                                        '비고': get_translation('col_notes')
-                                    })
-                                    st.dataframe(df, width='stretch')
-                                else:
-                                    st.info("등록된 부속기기가 없습니다.")
-                                st.markdown("")
-                    
-                            # SPARE PART
-                            if fields_config.get('has_spare_part_specs', False):
-                                st.markdown(f"**{get_translation('spare_part_specs')}**")
-                                spare_data = eq.get('spare_part_specs', [])
-                                if isinstance(spare_data, str):
-                                    spare_data = json.loads(spare_data if spare_data else '[]')
-                                if spare_data:
-                                    df = pd.DataFrame(spare_data)
-                                    df = df.rename(columns={
-                                        'SPARE PART': get_translation('col_spare_part'),
-                                        '교체 주기': get_translation('col_maintenance_cycle'),
-                                        '교체 일자': get_translation('col_replacement_date')
-                                    })
-                                    st.dataframe(df, width='stretch')
-                                else:
-                                    st.info("등록된 SPARE PART가 없습니다.")
-                                st.markdown("")
-                    
-                            # 스크류 사양
-                            if fields_config.get('has_screw_specs', False):
-                                st.markdown(f"**{get_translation('screw_specs')}**")
-                                screw_data = eq.get('screw_specs', {})
-                                if isinstance(screw_data, str):
-                                    screw_data = json.loads(screw_data if screw_data else '{}')
-                                if screw_data and (screw_data.get('material_spec_description') or screw_data.get('general_cycle') or screw_data.get('wear_resistant_cycle')):
-                                    if screw_data.get('material_spec_description'):
-                                        st.markdown("*재료 사양:*")
-                                        # 원본 줄바꿈 유지
-                                        material_spec = screw_data['material_spec_description']
-                                        st.text(material_spec)
-                                    if screw_data.get('general_cycle'):
-                                        st.markdown("*일반용 SCREW 교체 주기*")
-                                        df_general = pd.DataFrame(screw_data['general_cycle'])
-                                        st.dataframe(df_general, width='stretch')
-                                    if screw_data.get('wear_resistant_cycle'):
-                                        st.markdown("*내마모성 SCREW 교체 주기*")
-                                        df_wear = pd.DataFrame(screw_data['wear_resistant_cycle'])
-                                        st.dataframe(df_wear, width='stretch')
-                                else:
-                                    st.info("등록된 스크류 사양이 없습니다.")
-                                st.markdown("")
-                    
-                            # 작동유
-                            if fields_config.get('has_oil_specs', False):
-                                st.markdown(f"**{get_translation('oil_specs')}**")
-                                oil_data = eq.get('oil_specs', [])
-                                if isinstance(oil_data, str):
-                                    oil_data = json.loads(oil_data if oil_data else '[]')
-                                oil_specs_only = [item for item in oil_data if 'notes' not in item and 'aftercare' not in item]
-                                if oil_specs_only:
-                                    df = pd.DataFrame(oil_specs_only)
-                                    df = df.rename(columns={
-                                        '구분': get_translation('col_category'),
-                                        '적용 작동유 SPCE': get_translation('col_applicable_oil'),
-                                        '교체 주기': get_translation('col_maintenance_cycle')
-                                    })
-                                    st.dataframe(df, width='stretch')
-                                
-                                    # oil_notes와 aftercare
-                                    oil_notes = next((item['notes'] for item in oil_data if 'notes' in item), '')
-                                    oil_aftercare = next((item['aftercare'] for item in oil_data if 'aftercare' in item), '')
-                                    if oil_notes:
-                                        st.markdown(f"*{oil_notes}*")
-                                    if oil_aftercare and oil_aftercare.strip():
-                                        st.markdown(f"*1년 경과 후:*  \n{oil_aftercare.replace(chr(10), '  ' + chr(10))}")
-                                else:
-                                    st.info("등록된 작동유 정보가 없습니다.")
-                                st.markdown("")
-                    
-                            # 문서
-                            st.markdown(f"**{get_translation('documents')}**")
-                            doc_data = eq.get('documents', [])
-                            if isinstance(doc_data, str):
-                                doc_data = json.loads(doc_data if doc_data else '[]')
-                            # 중복 제거 (이름 기반)
-                            unique_doc_data = {d['기술 자료명']: d for d in doc_data}.values()  # 이름 중복 시 마지막 항목만 유지
-                            if unique_doc_data:
-                                for item in unique_doc_data:
-                                    doc_name = item.get(get_translation('col_doc_name'), 'Unnamed Document')
-                                    doc_url = item.get('url')
-                                    if doc_url:
-                                        st.write(f"문서: {doc_name}")
-                                        st.download_button(
-                                            label=f"다운로드 {doc_name}",
-                                            data=requests.get(doc_url).content,
-                                            file_name=doc_name,
-                                            mime=item.get('file_type', 'application/octet-stream'),
-                                            key=f"download_doc_{uuid.uuid4().hex}_{eq['id']}"
-                                        )
-                            else:
-                                st.info("등록된 문서가 없습니다.")
-
-                        except Exception as e:
-                            st.error(f"설비 정보 표시 중 오류: {str(e)}")
-                            import traceback
-                            st.error(traceback.format_exc())
+            # 페이지 단위로 요약 행만 렌더링하고, 상세 내용은 카드를 열었을 때만 생성
+            page_cols = st.columns([1, 1, 4])
+            with page_cols[0]:
+                page_size = st.selectbox(get_translation('dashboard_page_size'), [10, 20, 50, 100], index=1, key="dashboard_page_size")
+            total_pages = max(1, -(-len(filtered_equipment) // page_size))
+            # 검색어가 바뀌어 페이지 수가 줄어들면 현재 페이지를 범위 안으로 맞춤
+            if st.session_state.get('dashboard_page', 1) > total_pages:
+                st.session_state['dashboard_page'] = total_pages
+            with page_cols[1]:
+                page = st.number_input(get_translation('dashboard_page'), min_value=1, max_value=total_pages, step=1, key="dashboard_page")
+            with page_cols[2]:
+                st.caption(get_translation('dashboard_page_summary').format(total=len(filtered_equipment), page=page, pages=total_pages))
+            page_start = (page - 1) * page_size
+            page_equipment = filtered_equipment[page_start:page_start + page_size]
+            # 사양 파싱 오류는 카드마다 숨기지 않고 현재 페이지 단위로 모아서 표시
+            report_spec_errors(page_equipment)
+            for eq in page_equipment:
+                render_equipment_card(eq)
 
-                    # 최근 정비 이력
-                    st.markdown("---")
-                    st.subheader(get_translation('recent_maintenance_logs'))
-                    maintenance_logs = get_maintenance_logs(equipment_id=eq['id'])
-                    if maintenance_logs:
-                        recent_logs = maintenance_logs[:5]
-                        log_df = pd.DataFrame(recent_logs)
-                        st.dataframe(
-                            log_df.rename(columns={
-                                'id': get_translation('col_log_id'),
-                                'maintenance_date': get_translation('maintenance_date'),
-                                'engineer': get_translation('col_engineer'),
-                                'action': get_translation('col_action'),
-                                'action_category': get_translation('action_category'),  # 추가
-                                'notes': get_translation('col_notes'),
-                                'image_urls': get_translation('col_image_urls')
-                                # 'equipment_name': get_translation('col_equipment_name')  # 필요 시 주석 해제
-                            })[[
-                                get_translation('col_log_id'),
-                                get_translation('maintenance_date'),
-                                get_translation('col_engineer'),
-                                get_translation('action_category'),  # 추가
-                                get_translation('col_action'),
-                                get_translation('col_notes'),
-                                get_translation('col_image_urls')
-                                # get_translation('col_equipment_name'),  # 필요 시 주석 해제
-                            ]],
-                            width='stretch',
-                            hide_index=True
-                        )
-                    else:
-                        st.info(get_translation('no_recent_logs'))
-
-                    # 최근 상태 이력
-                    st.markdown("---")
-                    st.subheader(get_translation('recent_status_history'))
-                    status_history = get_status_history(equipment_id=eq['id'])
-                    if status_history:
-                        status_df = pd.DataFrame(status_history)
-                        st.dataframe(
-                            status_df.rename(columns={
-                                'id': get_translation('col_history_id'),
-                                'created_at': get_translation('col_created_at'),
-                                'status': get_translation('col_status'),
-                                'notes': get_translation('col_notes')
-                            })[[get_translation('col_history_id'), get_translation('col_created_at'),
-                                get_translation('col_status'), get_translation('col_notes')]],
-                            width='stretch'
-                        )
-                    else:
-                        st.info(get_translation('no_status_history'))
-    
 # ------------------------ 설비 추가 ------------------------
-    with tabs[1]:
+    def page_add_equipment():
         st.header(get_translation('add_equipment'))
     
         # 내용 초기화 버튼 (상단에 배치)
@@ -1991,7 +3548,7 @@ else:
                             idx = i + j
                             if idx < len(specific_fields):
                                 field_key = specific_fields[idx]
-                                field_def = FIELD_DEFINITIONS.get(field_key, {'label': field_key, 'type': 'text'})
+                                field_def = get_field_spec(field_key)
                                 with cols[j]:
                                     value = st.text_input(get_translation(field_key), key=f"add_spec_{field_key}")
                                     if value.strip():  # 빈 값 제외
@@ -1999,6 +3556,7 @@ else:
                     st.markdown("---")
             
                 # ========== 조건부 섹션들 ==========
+                uploaded_documents = []
             
                 # 부속기기 사양
                 if fields_config.get('has_accessory_specs', True):
@@ -2045,28 +3603,22 @@ else:
                         )
                         if uploaded_documents:
                             for uploaded_file in uploaded_documents:
+                                # 바이트는 업로더에만 두고 세션에는 목록 표시용 정보만 저장 (제출 시 스풀로 복사)
                                 file_data = {
                                     'filename': uploaded_file.name,
                                     'file_type': uploaded_file.type,
-                                    'content': uploaded_file.getvalue()  # 파일 바이너리 데이터
+                                    'size': uploaded_file.size
                                 }
                                 if file_data not in st.session_state.documents:  # 중복 방지
                                     st.session_state.documents.append(file_data)
                         
-                        # 업로드된 문서 테이블 표시
-                        documents_df = pd.DataFrame(
-                            st.session_state.documents if st.session_state.documents else [],
-                            columns=['파일명', '파일 유형', '다운로드']
-                        )
-                        for idx, doc in documents_df.iterrows():
-                            if st.button("다운로드", key=f"download_doc_{idx}"):
-                                st.download_button(
-                                    label="다운로드",
-                                    data=doc['content'],
-                                    file_name=doc['filename'],
-                                    mime=doc['file_type']
-                                )
+                        # 업로드된 문서 목록 표시
                         if st.session_state.documents:
+                            st.dataframe(
+                                pd.DataFrame(st.session_state.documents).rename(columns={'filename': '파일명', 'file_type': '파일 유형', 'size': '크기(byte)'}),
+                                width='stretch',
+                                hide_index=True
+                            )
                             st.write(f"**현재 {len(st.session_state.documents)}개의 문서가 등록되어 있습니다.**")
                     st.markdown("---")
             
@@ -2151,7 +3703,7 @@ else:
                         st.markdown("---")
                     
                         st.markdown("###### 2) 일반용 SCREW")
-                        st.session_state.screw_specs['general_cycle_df'] = st.data_editor(
+                        general_cycle_df = st.data_editor(
                             pd.DataFrame(st.session_state.screw_specs.get('general_cycle', [])),
                             key="general_screw_cycle_editor",
                             hide_index=True,
@@ -2166,10 +3718,10 @@ else:
                             },
                             width='stretch'
                         )
-                        st.session_state.screw_specs['general_cycle'] = st.session_state.screw_specs['general_cycle_df'].to_dict('records')
+                        st.session_state.screw_specs['general_cycle'] = general_cycle_df.to_dict('records')
                     
                         st.markdown("###### 3) 내마모성 SCREW")
-                        st.session_state.screw_specs['wear_resistant_cycle_df'] = st.data_editor(
+                        wear_resistant_cycle_df = st.data_editor(
                             pd.DataFrame(st.session_state.screw_specs.get('wear_resistant_cycle', [])),
                             key="wear_resistant_screw_cycle_editor",
                             hide_index=True,
@@ -2184,7 +3736,7 @@ else:
                             },
                             width='stretch'
                         )
-                        st.session_state.screw_specs['wear_resistant_cycle'] = st.session_state.screw_specs['wear_resistant_cycle_df'].to_dict('records')
+                        st.session_state.screw_specs['wear_resistant_cycle'] = wear_resistant_cycle_df.to_dict('records')
                     st.markdown("---")
             
                 # 작동유 사양
@@ -2238,8 +3790,7 @@ else:
                         section_key = config_key.replace('has_', '')  # 먼저 section_key 계산
         
                         # field_definitions에서 라벨 찾기 (prefix 제거 후 매칭)
-                        all_fields = get_field_definitions()
-                        field_def = next((f for f in all_fields if f['field_key'] == section_key), None)
+                        field_def = get_field_definition(section_key)
         
                         if field_def:
                             field_label = field_def['field_label']
@@ -2269,16 +3820,9 @@ else:
             
                 # 설비 추가 최종 제출 버튼
                 if st.form_submit_button(get_translation('add_equipment_button'), type="primary"):
-                    image_urls_str = upload_images(uploaded_images) if uploaded_images else ""
-                
                     if factory_id and name and model:
-                        # 문서 업로드 (부속기기 관련 문서만 처리)
-                        document_urls = []
-                        if uploaded_documents:
-                            for doc in uploaded_documents:
-                                url = upload_document_to_supabase(doc)
-                                if url:
-                                    document_urls.append(url)
+                        # 이미지/문서는 백그라운드 워커가 업로드 (폼은 DB 기록 후 바로 반환)
+                        attachments = [(f, 'image') for f in uploaded_images or []] + [(f, 'document') for f in uploaded_documents or []]
                         
                         # details_dict 구성 (공통 필드 + 특화 필드 + 커스텀 섹션)
                         details_dict = {
@@ -2296,7 +3840,6 @@ else:
                             'total_weight': total_weight,
                             'other_notes': st.session_state.other_notes,
                             'fields_config': fields_config,  # fields_config 추가
-                            'document_urls': ','.join(document_urls) if document_urls else '',  # 문서 URL 추가
                             **specific_fields_data,  # 특화 필드
                             **st.session_state.custom_sections  # 커스텀 섹션
                         }
@@ -2333,7 +3876,7 @@ else:
                             documents=st.session_state.documents,
                             screw_specs=screw_specs_to_add,
                             oil_specs=oil_specs_to_add,
-                            image_urls=image_urls_str
+                            attachments=attachments
                         )
                     
                         if success:
@@ -2348,59 +3891,19 @@ else:
             st.info("👆 먼저 설비 종류를 선택해주세요.")
 
 # ------------------------ 정비 이력 추가 ------------------------
-    with tabs[2]:
+    def page_add_log():
         st.header(get_translation('add_maintenance_log'))
         equipment_list = get_equipment(factory_id)
         if not equipment_list:
             st.warning(get_translation('no_equipment_registered'))
         else:
-            eq_options = {eq['name']: eq['id'] for eq in equipment_list}
-            selected_eq_name = st.selectbox(get_translation('select_equipment'), options=list(eq_options.keys()), key='add_log_equipment_select')
-            selected_eq_id = eq_options.get(selected_eq_name, None)
-
-            if selected_eq_id:
-                with st.form("add_log_form", clear_on_submit=True):
-                    engineer = st.text_input(get_translation('engineer_name'))
-                    action_category = st.selectbox(
-                        get_translation('action_category'),
-                        options=[
-                            get_translation('electrical'),
-                            get_translation('mechanical'),
-                            get_translation('drive'),
-                            get_translation('other_category')
-                        ],
-                        key='add_log_action_category'
-                    )
-                    action = st.text_input(get_translation('maintenance_action'))
-                    notes = st.text_area(get_translation('notes'))
-                    col_dt1, col_dt2 = st.columns(2)
-                    with col_dt1:
-                        maintenance_date = st.date_input(
-                            get_translation('maintenance_date'),
-                            value=date.today(),
-                            min_value=date(1900, 1, 1)
-                        )
-                    with col_dt2:
-                        maintenance_time = st.time_input(
-                            get_translation('maintenance_time'),
-                            value=time(datetime.now().hour, datetime.now().minute)
-                        )
-                    cost = st.number_input("정비 비용", min_value=0.0, format="%.2f", key="add_log_cost")
-                    uploaded_images = st.file_uploader(
-                        get_translation('upload_image'),
-                        type=['png', 'jpg', 'jpeg'],
-                        accept_multiple_files=True
-                    )
-                    submitted = st.form_submit_button(get_translation('add_log_button'))
-                    if submitted:
-                        image_urls = upload_images(uploaded_images) if uploaded_images else None
-                        add_log(selected_eq_id, engineer, action, notes, maintenance_date, maintenance_time, image_urls, cost, action_category)
-                        st.success("정비 이력이 성공적으로 추가되었습니다.")
-                        st.rerun()
+            render_add_log_form(equipment_list)
 
 # ------------------------ 정비 이력 확인 ------------------------
-    with tabs[3]:
+    def page_view_logs():
         st.header(get_translation('view_maintenance_log'))
+        with st.expander(get_translation('log_search_expander')):
+            render_log_search(factory_id)
         equipment_list = get_equipment(factory_id)
         if not equipment_list:
             st.warning(get_translation('no_equipment_registered'))
@@ -2417,17 +3920,10 @@ else:
                     st.info(get_translation('no_logs'))
                 else:
                     logs_df = pd.DataFrame(logs)
-                    logs_df['maintenance_date'] = pd.to_datetime(logs_df['maintenance_date']).dt.strftime('%Y-%m-%d %H:%M')
+                    logs_df['maintenance_date'] = logs_df['maintenance_date_display']
                     logs_df['equipment_name'] = logs_df['equipment'].apply(lambda x: x['name'])
-                    logs_df = logs_df.rename(columns={
-                        'maintenance_date': get_translation('maintenance_date'),
-                        'engineer': get_translation('col_engineer'),
-                        'action': get_translation('col_action'),
-                        'notes': get_translation('col_notes'),
-                        'image_urls': get_translation('col_image_urls'),
-                        'id': get_translation('col_log_id'),
-                        'cost': "정비 비용"
-                    })
+                    columns = table_columns('log_view')
+                    logs_df = logs_df.rename(columns=columns['rename'])
 
                     logs_df[get_translation('maintenance_date')] = logs_df[get_translation('maintenance_date')].fillna('')
                     logs_df[get_translation('col_engineer')] = logs_df[get_translation('col_engineer')].fillna('')
@@ -2447,9 +3943,9 @@ else:
                     if log_search and logs_df.empty:
                         st.warning("검색 조건에 맞는 이력이 없습니다.")
                     else:
-                        st.dataframe(logs_df[[get_translation('maintenance_date'), get_translation('col_engineer'), get_translation('col_action'), get_translation('col_notes'), "정비 비용", get_translation('col_image_urls'), get_translation('col_log_id')]], width='stretch')
+                        st.dataframe(logs_df[columns['order']], width='stretch')
 
-                    log_options = {f"날짜: {log['maintenance_date']}, 작업: {log['action']}": log['id'] for log in logs}
+                    log_options = {f"날짜: {log['maintenance_date_display']}, 작업: {log['action']}": log['id'] for log in logs}
                     selected_log_id_view = st.selectbox(get_translation('view_detail_log'), options=[''] + list(log_options.keys()), key='view_detail_log_select')
 
                     if selected_log_id_view:
@@ -2458,7 +3954,7 @@ else:
                         if selected_log_data:
                             with st.expander(f"**{get_translation('log_details')}**", expanded=True):
                                 st.write(f"**{get_translation('equipment_name')}:** {selected_log_data['equipment']['name']}")
-                                st.write(f"**{get_translation('maintenance_date')}:** {selected_log_data['maintenance_date']}")
+                                st.write(f"**{get_translation('maintenance_date')}:** {selected_log_data['maintenance_date_display']}")
                                 st.write(f"**{get_translation('engineer_name')}:** {selected_log_data['engineer']}")
                                 st.write(f"**{get_translation('maintenance_action')}:** {selected_log_data['action']}")
                                 st.write(f"**{get_translation('notes')}:** {selected_log_data['notes']}")
@@ -2476,79 +3972,48 @@ else:
 
                     if not logs_df.empty:
                         st.subheader("정비 비용 추이 분석")
-                        logs_df['날짜'] = pd.to_datetime(logs_df[get_translation('maintenance_date')]).dt.date
-                        cost_trend = logs_df.groupby('날짜')['정비 비용'].sum().reset_index()
-                        cost_trend['날짜'] = pd.to_datetime(cost_trend['날짜'])
-                        cost_trend = cost_trend.sort_values('날짜')
-                        st.dataframe(cost_trend, width='stretch')
-
-                        chart = alt.Chart(cost_trend).mark_line().encode(
+                        if log_search:
+                            # 검색된 이력 기준 추이: 조회 시 파싱된 maintenance_date_value를 일 단위로 묶음
+                            logs_df['날짜'] = pd.to_datetime(logs_df['maintenance_date_value']).dt.normalize()
+                            cost_trend = logs_df.groupby('날짜')['정비 비용'].sum().reset_index()
+                        else:
+                            # 전체 이력 추이는 일별 비용 집계 테이블에서 읽음 (작업 분류별 행을 날짜로 합산)
+                            cost_trend = pd.DataFrame(get_cost_rollup('day', equipment_id=selected_eq_id_view), columns=['day', 'cost'])
+                            cost_trend = cost_trend.groupby('day', as_index=False)['cost'].sum().rename(columns={'day': '날짜', 'cost': '정비 비용'})
+                            cost_trend['날짜'] = pd.to_datetime(cost_trend['날짜'])
+                        # 기간 단위로 리샘플링한 뒤 점이 많으면 LTTB로 줄여 차트에 전달
+                        granularity = st.segmented_control("집계 단위", options=list(CHART_GRANULARITIES), default='월', key="cost_trend_granularity") or '월'
+                        cost_trend = resample_time_series(cost_trend, '날짜', '정비 비용', CHART_GRANULARITIES[granularity])
+                        chart_data = downsample_time_series(cost_trend, '날짜', '정비 비용')
+
+                        chart = alt.Chart(chart_data).mark_line(point=len(chart_data) <= 60).encode(
                             x=alt.X('날짜:T', title=get_translation('maintenance_date')),
                             y=alt.Y('정비 비용:Q', title='정비 비용'),
-                            tooltip=['날짜', '정비 비용']
+                            tooltip=[alt.Tooltip('날짜:T', format='%Y-%m-%d'), alt.Tooltip('정비 비용:Q', format=',.0f')]
                         ).properties(
                             width='container'
                         )
                         st.altair_chart(chart)
+                        if len(chart_data) < len(cost_trend):
+                            st.caption(f"{granularity} 단위 {len(cost_trend):,}개 구간 중 {len(chart_data):,}개 점으로 줄여 표시 (LTTB)")
+                        with st.expander(f"{granularity} 단위 비용 표"):
+                            st.dataframe(cost_trend, width='stretch', hide_index=True)
                     else:
                         st.info("분석할 정비 이력이 없습니다.")
 
 # ------------------------ 상태 기록 ------------------------
-    with tabs[4]:
+    def page_record_status():
         st.header(get_translation('record_status'))
         equipment_list = get_equipment(factory_id)
         if not equipment_list:
             st.warning(get_translation('no_equipment_registered'))
         else:
-            eq_options = {eq['name']: eq['id'] for eq in equipment_list}
-            selected_eq_name = st.selectbox(get_translation('select_equipment'), options=list(eq_options.keys()), key='record_status_equipment_select')
-            selected_eq_id = eq_options.get(selected_eq_name, None)
-
-            if selected_eq_id:
-                with st.form("record_status_form", clear_on_submit=True):
-                    status = st.radio(get_translation('change_status'), [get_translation('normal'), get_translation('faulty'), get_translation('sold')])
-                    notes = st.text_area(get_translation('notes'))
-                    col_dt1, col_dt2 = st.columns(2)
-                    with col_dt1:
-                        history_date = st.date_input(get_translation('maintenance_date'), value=date.today())
-                    with col_dt2:
-                        history_time = st.time_input(get_translation('maintenance_time'), value=time(datetime.now().hour, datetime.now().minute))
-                    submitted = st.form_submit_button(get_translation('record_button'))
-                    if submitted:
-                        add_status_history(selected_eq_id, status, notes, history_date, history_time)
-                        st.rerun()
-
-            st.subheader(get_translation('recent_status_history'))
-            status_history = get_status_history(factory_id)
-            if not status_history:
-                st.info(get_translation('no_status_history'))
-            else:
-                history_df = pd.DataFrame(status_history)
-                history_df['created_at'] = pd.to_datetime(history_df['created_at']).dt.strftime('%Y-%m-%d %H:%M')
-                history_df['equipment_name'] = history_df['equipment'].apply(
-                    lambda x: x['name'] if isinstance(x, dict) and 'name' in x else 'Unknown'
-                )
-                history_df = history_df.rename(columns={
-                    'id': get_translation('col_history_id'),
-                    'created_at': get_translation('col_created_at'),
-                    'status': get_translation('col_status'),
-                    'notes': get_translation('col_notes'),
-                    'equipment_name': get_translation('col_equipment_name')
-                })
-                st.dataframe(
-                    history_df[[
-                        get_translation('col_history_id'),
-                        get_translation('col_created_at'),
-                        get_translation('col_equipment_name'),
-                        get_translation('col_status'),
-                        get_translation('col_notes')
-                    ]],
-                    width='stretch',
-                    hide_index=True
-                )
+            render_status_record_panel(factory_id, equipment_list)
+            st.subheader(get_translation('downtime_heatmap'))
+            render_downtime_heatmap(factory_id)
 
 # ------------------------ 관리자 모드 ------------------------
-    with tabs[5]:
+    def page_admin():
         st.header(get_translation('admin_mode'))
         if 'admin_authenticated' not in st.session_state:
             st.session_state.admin_authenticated = False
@@ -2564,13 +4029,31 @@ else:
                     else:
                         st.error(get_translation('admin_login_fail'))
         else:
+            st.subheader(get_translation('admin_overview'))
+            render_admin_overview()
+            # 번역 카탈로그에 없어 대체값으로 표시된 키 (로드된 언어만)
+            missing_translations = get_missing_translations()
+            if missing_translations:
+                with st.expander(f"🌐 번역 누락 키 {sum(len(keys) for keys in missing_translations.values())}개"):
+                    for lang, keys in missing_translations.items():
+                        st.markdown(f"**{lang}** ({len(keys)}개)")
+                        st.code('\n'.join(keys))
+            with st.expander("🧠 세션 메모리 사용량"):
+                memory_report = session_memory_report()
+                st.caption(f"활성 세션 {len(memory_report)}개 · {SESSION_IDLE_COMPACT_MINUTES}분 이상 유휴 세션은 편집용 임시 데이터를 자동 정리")
+                if memory_report:
+                    st.dataframe(pd.DataFrame(memory_report), width='stretch', hide_index=True)
+                if st.button("지금 유휴 세션 정리", key="compact_idle_sessions_now"):
+                    st.success(f"{mark_idle_sessions(exclude=get_script_run_ctx().session_id)}개 세션에 정리를 예약했습니다. 각 세션이 다음에 실행될 때 정리됩니다.")
             admin_tabs = st.tabs([
                 get_translation('add_factory'),
                 get_translation('factory_update_delete'),
                 get_translation('update_delete_equipment'),
                 "⚙️ 설비 템플릿 관리",  # 새 탭
                 get_translation('update_log_admin'),
-                get_translation('update_status_admin')
+                get_translation('update_status_admin'),
+                "🧹 스토리지 정리",
+                get_translation('reliability_report')
             ])
 
             # 공장 추가
@@ -2617,17 +4100,32 @@ else:
             # 설비 수정/삭제 탭
             with admin_tabs[2]:
                 st.header(get_translation('update_delete_equipment'))
-                equipment_list = get_equipment()
-                equipment_names = ['설비를 선택하세요'] + [eq['name'] for eq in equipment_list]
-                selected_equipment_name = st.selectbox(
+                # 전체 설비를 읽지 않고 서버 측 검색 결과(최대 EQUIPMENT_SEARCH_LIMIT건)만 선택지로 사용
+                equipment_search_term = st.text_input(
+                    get_translation('search_equipment_admin'),
+                    key='equipment_search_admin',
+                    placeholder=get_translation('search_equipment_admin_placeholder')
+                )
+                equipment_hits = search_equipment(equipment_search_term)
+                hit_labels = {hit['id']: format_equipment_hit(hit) for hit in equipment_hits}
+                selected_id = st.session_state.selected_eq_id_admin
+                if selected_id and selected_id not in hit_labels:
+                    # 검색어가 바뀌어도 현재 선택한 설비는 선택지에 남겨 둠
+                    selected_hit = get_equipment_by_id(selected_id)
+                    if selected_hit:
+                        hit_labels = {selected_id: format_equipment_hit(selected_hit), **hit_labels}
+                if len(equipment_hits) >= EQUIPMENT_SEARCH_LIMIT:
+                    st.caption(get_translation('search_equipment_admin_truncated').format(limit=EQUIPMENT_SEARCH_LIMIT))
+                st.selectbox(
                     get_translation('select_equipment_admin'),
-                    options=equipment_names,
-                    key='selected_equipment_name_admin_selectbox',
+                    options=[None] + list(hit_labels),
+                    format_func=lambda eq_id: hit_labels.get(eq_id, '설비를 선택하세요'),
+                    key='selected_equipment_id_admin_selectbox',
                     on_change=set_selected_equipment
                 )
 
                 if st.session_state.selected_eq_id_admin:
-                    eq_data = next((eq for eq in equipment_list if eq['id'] == st.session_state.selected_eq_id_admin), None)
+                    eq_data = get_equipment_by_id(st.session_state.selected_eq_id_admin)
                     if eq_data:
 
                         # 설비 ID 변경 감지 및 초기화
@@ -2662,15 +4160,8 @@ else:
                         if 'edit_documents' not in st.session_state:
                             st.session_state.edit_documents = eq_data.get('documents', []) or []
 
-                        # details에서 특화 필드 추출
-                        details_json = eq_data.get('details', '{}')
-                        if isinstance(details_json, str):
-                            try:
-                                extra_fields = json.loads(details_json)
-                            except:
-                                extra_fields = {}
-                        else:
-                            extra_fields = details_json if details_json else {}
+                        # details에서 특화 필드 추출 (캐시된 모델의 복사본)
+                        extra_fields = dict(get_equipment_specs(eq_data).details)
 
                         with st.form("update_equipment_form"):
 
@@ -2691,7 +4182,7 @@ else:
                             with col6:
                                 production_date = st.date_input(
                                     get_translation('production_date'),
-                                    value=get_date_value(eq_data.get('production_date', None)),
+                                    value=eq_data.get('production_date_value'),
                                     key="update_eq_production_date"
                                 )
 
@@ -2701,7 +4192,7 @@ else:
                             with col8:
                                 acquisition_date = st.date_input(
                                     get_translation('acquisition_date'),
-                                    value=get_date_value(eq_data.get('acquisition_date', None)),
+                                    value=eq_data.get('acquisition_date_value'),
                                     key="update_eq_acquisition_date"
                                 )
                             with col9:
@@ -2711,7 +4202,7 @@ else:
                             with col10:
                                 purchase_date = st.date_input(
                                     get_translation('purchase_date'),
-                                    value=get_date_value(eq_data.get('purchase_date', None)),
+                                    value=eq_data.get('purchase_date_value'),
                                     key="update_eq_purchase_date"
                                 )
                             with col11:
@@ -2750,7 +4241,7 @@ else:
                                             idx = i + j
                                             if idx < len(specific_fields):
                                                 field_key = specific_fields[idx]
-                                                field_def = FIELD_DEFINITIONS.get(field_key, {'label': field_key, 'type': 'text'})
+                                                field_def = get_field_spec(field_key)
                                                 with cols[j]:
                                                     translated_label = get_translation(field_def['label'])
                                                     if field_def['type'] == 'text':
@@ -2928,8 +4419,8 @@ else:
 
                                 st.markdown("---")
                                 st.markdown("###### 2) 일반용 SCREW")
-                                st.session_state.edit_screw_specs['general_cycle_df'] = st.data_editor(
-                                    pd.DataFrame(st.session_state.edit_screw_specs.get('general_cycle', [{'해당 사양': '교체 주기 (월)', 'A': '5', 'B': '5', 'C': '3', 'D': '3'}])),
+                                general_cycle_df = st.data_editor(
+                                    pd.DataFrame(st.session_state.edit_screw_specs.get('general_cycle', DEFAULT_GENERAL_CYCLE)),
                                     key="update_general_screw_cycle_editor",
                                     hide_index=True,
                                     column_order=("해당 사양", "A", "B", "C", "D"),
@@ -2942,9 +4433,10 @@ else:
                                     },
                                     width='stretch'
                                 )
+                                st.session_state.edit_screw_specs['general_cycle'] = general_cycle_df.to_dict('records')
                                 st.markdown("###### 3) 내마모성 SCREW")
-                                st.session_state.edit_screw_specs['wear_resistant_cycle_df'] = st.data_editor(
-                                    pd.DataFrame(st.session_state.edit_screw_specs.get('wear_resistant_cycle', [{'해당 사양': '교체 주기 (월)', 'A': '10', 'B': '10', 'C': '5', 'D': '5'}])),
+                                wear_resistant_cycle_df = st.data_editor(
+                                    pd.DataFrame(st.session_state.edit_screw_specs.get('wear_resistant_cycle', DEFAULT_WEAR_CYCLE)),
                                     key="update_wear_resistant_screw_cycle_editor",
                                     hide_index=True,
                                     column_order=("해당 사양", "A", "B", "C", "D"),
@@ -2957,6 +4449,7 @@ else:
                                     },
                                     width='stretch'
                                 )
+                                st.session_state.edit_screw_specs['wear_resistant_cycle'] = wear_resistant_cycle_df.to_dict('records')
                                 st.markdown("---")
 
                             # 작동유 사양 (강제 렌더링)
@@ -3052,10 +4545,27 @@ else:
                                 key="update_eq_images"
                             )
 
+                            # 읽지 못한 사양 데이터: 기본은 원본 그대로 보존, 삭제는 확인 후에만
+                            unread_specs = st.session_state.get('edit_unread_specs') or {}
+                            keep_unread_specs = True
+                            drop_confirmed = False
+                            if unread_specs:
+                                st.warning(get_translation('spec_unread_warning').format(errors=' / '.join(st.session_state.get('edit_spec_errors', []))))
+                                keep_unread_specs = st.radio(
+                                    get_translation('spec_unread_choice'),
+                                    [True, False],
+                                    format_func=lambda keep: get_translation('spec_unread_keep' if keep else 'spec_unread_drop'),
+                                    key='edit_unread_specs_choice'
+                                )
+                                drop_confirmed = st.checkbox(get_translation('spec_unread_drop_confirm'), key='edit_unread_specs_drop_confirm')
+
                             # 제출 및 삭제 버튼
                             col1, col2 = st.columns(2)
                             with col1:
-                                if st.form_submit_button(get_translation('update_button'), type="primary"):
+                                update_clicked = st.form_submit_button(get_translation('update_button'), type="primary")
+                                if update_clicked and unread_specs and not keep_unread_specs and not drop_confirmed:
+                                    st.error(get_translation('spec_unread_drop_unconfirmed'))
+                                elif update_clicked:
                                     details_dict = {
                                         'product_name': product_name,
                                         'maker': maker,
@@ -3082,8 +4592,8 @@ else:
                                             'applicable_general': st.session_state.edit_screw_specs.get('applicable_general', ''),
                                             'screw_type_wear': st.session_state.edit_screw_specs.get('screw_type_wear', ''),
                                             'applicable_wear': st.session_state.edit_screw_specs.get('applicable_wear', ''),
-                                            'general_cycle': st.session_state.edit_screw_specs['general_cycle_df'].to_dict('records'),
-                                            'wear_resistant_cycle': st.session_state.edit_screw_specs['wear_resistant_cycle_df'].to_dict('records')
+                                            'general_cycle': st.session_state.edit_screw_specs.get('general_cycle', []),
+                                            'wear_resistant_cycle': st.session_state.edit_screw_specs.get('wear_resistant_cycle', [])
                                         }
 
                                     final_image_urls = st.session_state.get('current_images_to_keep', [])
@@ -3108,10 +4618,16 @@ else:
                                         uploaded_images=uploaded_images,
                                         uploaded_documents=uploaded_documents,
                                         oil_notes=st.session_state.edit_oil_notes,
-                                        oil_aftercare=st.session_state.edit_oil_aftercare
+                                        oil_aftercare=st.session_state.edit_oil_aftercare,
+                                        equipment_type=selected_equipment_type,
+                                        unread_specs=unread_specs if keep_unread_specs else None
                                     )
                                     if success:
                                         st.session_state.edit_other_notes = ''
+                                        if not keep_unread_specs:
+                                            # 삭제를 확인하고 저장했으면 다음 저장에서 되살리지 않음
+                                            st.session_state.edit_unread_specs = {}
+                                            st.session_state.edit_spec_errors = []
                                         if 'current_images_to_keep' in st.session_state:
                                             del st.session_state.current_images_to_keep
                                         st.success("설비 정보가 성공적으로 업데이트되었습니다.")
@@ -3191,7 +4707,8 @@ else:
                                         all_fields = get_field_definitions()
                                         specific_fields = [f for f in all_fields if f['category'] == 'specific']
                     
-                                        selected_fields = template['fields_config'].get('specific_fields', [])
+                                        # 레지스트리의 템플릿은 공유 객체이므로 복사본을 편집
+                                        selected_fields = list(template['fields_config'].get('specific_fields', []))
                                         cols = st.columns(4)
                                         for idx, field in enumerate(specific_fields):
                                             with cols[idx % 4]:
@@ -3235,7 +4752,6 @@ else:
                                                 if success:
                                                     st.session_state[f"editing_template_{tid}"] = False
                                                     st.success(message)
-                                                    st.cache_data.clear()
                                                     st.rerun()
                                                 else:
                                                     st.error(f"템플릿 업데이트 실패: {message}")
@@ -3308,7 +4824,6 @@ else:
                     
                                 if success:
                                     st.success(message)
-                                    st.cache_data.clear()  # 캐시 초기화
                                     st.rerun()
                                 else:
                                     st.error(f"템플릿 추가 실패: {message}")
@@ -3337,7 +4852,6 @@ else:
                                     success, msg = delete_field_definition(field['id'])
                                     if success:
                                         st.success(msg)
-                                        st.cache_data.clear()
                                         st.rerun()
                                     else:
                                         st.error(msg)
@@ -3354,7 +4868,6 @@ else:
                                     success, msg = delete_field_definition(field['id'])
                                     if success:
                                         st.success(msg)
-                                        st.cache_data.clear()
                                         st.rerun()
                                     else:
                                         st.error(msg)
@@ -3398,7 +4911,6 @@ else:
                     
                                 if success:
                                     st.success(message)
-                                    st.cache_data.clear()  # 캐시 초기화
                                     st.rerun()
                                 else:
                                     st.error(f"필드 추가 실패: {message}")
@@ -3512,3 +5024,174 @@ else:
                                                 st.rerun()
                                 else:
                                     st.warning("선택한 상태 기록 데이터를 찾을 수 없습니다.")
+
+            # 스토리지 정리 (고아 파일 GC)
+            with admin_tabs[6]:
+                st.header("🧹 스토리지 정리")
+                st.caption(f"DB에서 참조하지 않는 파일을 찾아 삭제합니다. 최근 {STORAGE_GC_MIN_AGE_HOURS}시간 내 업로드된 파일은 제외됩니다.")
+                gc_job = get_storage_gc_job()
+                gc_running = bool(gc_job['thread'] and gc_job['thread'].is_alive())
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    if st.button("🔍 점검 (Dry run)", disabled=gc_running, key="storage_gc_dry_run"):
+                        start_storage_gc(dry_run=True)
+                        st.rerun()
+                with col2:
+                    if st.button("🗑️ 고아 파일 삭제", disabled=gc_running, type="primary", key="storage_gc_delete"):
+                        start_storage_gc(dry_run=False)
+                        st.rerun()
+                with col3:
+                    if st.button("🔄 새로고침", key="storage_gc_refresh"):
+                        st.rerun()
+
+                if gc_running:
+                    st.info("정리 작업이 백그라운드에서 실행 중입니다...")
+
+                gc_report = gc_job['report']
+                if gc_report:
+                    mode = "점검" if gc_report['dry_run'] else "삭제"
+                    st.subheader(f"최근 실행 결과 ({mode}, {gc_report['started_at']} ~ {gc_report['finished_at']})")
+                    if gc_report['error']:
+                        st.error(f"정리 작업 실패: {gc_report['error']}")
+                    summary_rows = [
+                        {
+                            '버킷': bucket,
+                            '검사한 파일': result['scanned'],
+                            '참조 중': result['referenced'],
+                            '고아 파일': len(result['orphans']),
+                            '고아 용량(MB)': round(result['orphan_bytes'] / (1024 * 1024), 2),
+                            '삭제됨': result['deleted']
+                        }
+                        for bucket, result in gc_report['buckets'].items()
+                    ]
+                    if summary_rows:
+                        st.dataframe(pd.DataFrame(summary_rows), width='stretch', hide_index=True)
+                    for bucket, result in gc_report['buckets'].items():
+                        if result['orphans']:
+                            with st.expander(f"{bucket} 고아 파일 {len(result['orphans'])}개"):
+                                st.dataframe(pd.DataFrame(result['orphans']), width='stretch', hide_index=True)
+
+            # 신뢰성 보고서 탭
+            with admin_tabs[7]:
+                st.header(get_translation('reliability_report'))
+                report_period = st.selectbox(get_translation('period'), options=list(RELIABILITY_PERIOD_DAYS), index=2, format_func=get_translation, key="reliability_report_period")
+                report_days = RELIABILITY_PERIOD_DAYS[report_period]
+                report_factories = get_factories()
+
+                st.subheader(get_translation('reliability_by_factory'))
+                factory_rows = []
+                for factory in report_factories:
+                    factory_total = get_reliability_summary(factory['id'], days=report_days, by=())
+                    factory_rows.append(factory_total.assign(factory=factory['name']))
+                if factory_rows:
+                    factory_summary = reliability_display_frame(pd.concat(factory_rows, ignore_index=True)[['factory', *RELIABILITY_COLUMNS]])
+                    st.dataframe(factory_summary.rename(columns={'factory': get_translation('col_factory')}), width='stretch', hide_index=True)
+
+                factory_options = {factory['name']: factory['id'] for factory in report_factories}
+                report_factory_name = st.selectbox(get_translation('select_factory'), options=list(factory_options), key="reliability_report_factory")
+                if report_factory_name:
+                    report_factory_id = factory_options[report_factory_name]
+
+                    st.subheader(get_translation('reliability_monthly_trend').format(months=12))
+                    # 차트 필드는 원래 컬럼 이름을 쓰고 축 제목만 번역 (번역 문자열의 특수 문자가 필드 이름으로 해석되지 않도록)
+                    monthly = reliability_display_frame(get_reliability_summary(report_factory_id, months=12, by=()), translate=False)
+                    base = alt.Chart(monthly).encode(x=alt.X('yearmonth(period):T', title=get_translation('cost_month')))
+                    chart = alt.layer(
+                        base.mark_bar(opacity=0.4).encode(y=alt.Y('failures:Q', title=get_translation('reliability_failures'))),
+                        base.mark_line(point=True, color='#2e7d32').encode(y=alt.Y('availability:Q', title=get_translation('reliability_availability')))
+                    ).resolve_scale(y='independent').properties(width='container')
+                    st.altair_chart(chart)
+
+                    st.subheader(get_translation('reliability_by_equipment'))
+                    report_names = {eq['id']: eq['name'] for eq in get_equipment(report_factory_id)}
+                    report_equipment = get_reliability_summary(report_factory_id, days=report_days)
+                    report_equipment = report_equipment.sort_values('availability', na_position='last')
+                    report_equipment.insert(0, get_translation('equipment_name'), report_equipment['equipment_id'].map(report_names).fillna('Unknown'))
+                    report_frame = reliability_display_frame(report_equipment.drop(columns='equipment_id'))
+                    st.dataframe(report_frame, width='stretch', hide_index=True)
+                    st.download_button(
+                        get_translation('download_csv'),
+                        data=report_frame.to_csv(index=False).encode('utf-8-sig'),
+                        file_name=f"reliability_{report_factory_name}_{date.today():%Y%m%d}.csv",
+                        mime='text/csv',
+                        key="reliability_report_download"
+                    )
+
+# ------------------------ 부품 색인 ------------------------
+    def page_parts():
+        st.header(get_translation('parts_index_header'))
+        search_cols = st.columns([3, 1, 1])
+        with search_cols[0]:
+            part_term = st.text_input(get_translation('parts_search'), placeholder=get_translation('parts_search_placeholder'), key="parts_search")
+        with search_cols[1]:
+            part_kind = st.selectbox(get_translation('col_category'), options=[None] + list(PART_KINDS), format_func=lambda kind: get_translation('part_kind_all') if kind is None else get_translation(PART_KINDS[kind]), key="parts_kind")
+        with search_cols[2]:
+            all_factories = st.selectbox(get_translation('parts_scope'), options=[False, True], format_func=lambda value: get_translation('log_search_all_factories') if value else get_translation('current_factory'), key="parts_scope")
+        # 사용 설비 목록과 공장별 현황이 같은 검색어로 조회되도록 한 번만 정리
+        part_term = clean_search_term(part_term)
+
+        def kind_label(kind):
+            return get_translation(PART_KINDS[kind]) if kind in PART_KINDS else kind
+
+        st.subheader(get_translation('parts_used_by'))
+        if not part_term:
+            st.caption(get_translation('parts_search_hint'))
+        else:
+            part_rows = search_parts(part_term, part_kind, None if all_factories else factory_id)
+            if not part_rows:
+                st.info(get_translation('parts_no_results'))
+            else:
+                st.dataframe(pd.DataFrame([{
+                    get_translation('col_category'): kind_label(row['kind']),
+                    get_translation('parts_col_name'): row['name'],
+                    get_translation('col_accessory_type'): row['model'],
+                    get_translation('col_accessory_serial'): row['serial'],
+                    get_translation('col_maker'): row['maker'],
+                    get_translation('parts_col_spec'): row['spec'],
+                    get_translation('equipment_name'): (row.get('equipment') or {}).get('name'),
+                    get_translation('model'): (row.get('equipment') or {}).get('model'),
+                    get_translation('col_factory'): ((row.get('equipment') or {}).get('factories') or {}).get('name'),
+                } for row in part_rows]), width='stretch', hide_index=True)
+                if len(part_rows) >= PART_SEARCH_LIMIT:
+                    st.caption(get_translation('parts_truncated').format(limit=PART_SEARCH_LIMIT))
+
+        st.subheader(get_translation('parts_usage_by_factory'))
+        usage = get_part_usage(part_kind, part_term)
+        if not usage:
+            st.info(get_translation('parts_no_usage'))
+        else:
+            usage_df = pd.DataFrame(usage)
+            usage_df['factory_name'] = usage_df['factory_name'].fillna('-')
+            # 공장마다 표기가 조금 다를 수 있으므로 정규화 이름(name_key) 기준으로 묶고 첫 표기를 표시
+            names = usage_df.groupby(['kind', 'name_key'])['name'].first()
+            pivot = usage_df.pivot_table(index=['kind', 'name_key'], columns='factory_name', values='equipment_count', aggfunc='sum', fill_value=0)
+            total_column = get_translation('col_total')
+            pivot[total_column] = pivot.sum(axis=1)
+            pivot = pivot.sort_values(total_column, ascending=False)
+            pivot.insert(0, get_translation('parts_col_name'), names.reindex(pivot.index).values)
+            pivot.insert(0, get_translation('col_category'), [kind_label(kind) for kind, _ in pivot.index])
+            st.dataframe(pivot.reset_index(drop=True), width='stretch', hide_index=True)
+
+# ------------------------ 현황판 ------------------------
+    def page_wallboard():
+        if st.toggle(get_translation('wallboard_kiosk_mode'), key="wallboard_kiosk"):
+            st.markdown(
+                "<style>[data-testid='stHeader'], [data-testid='stToolbar'] { display: none; }</style>",
+                unsafe_allow_html=True
+            )
+        render_wallboard(factory_id)
+
+# ------------------------ 페이지 이동 ------------------------
+    # 공장 로그인 상태(session_state)와 데이터 캐시는 페이지 간에 그대로 공유됨
+    navigation = st.navigation([
+        st.Page(page_dashboard, title=get_translation('dashboard'), url_path='dashboard', default=True),
+        st.Page(page_add_equipment, title=get_translation('add_equipment'), url_path='add-equipment'),
+        st.Page(page_add_log, title=get_translation('add_maintenance_log'), url_path='add-log'),
+        st.Page(page_view_logs, title=get_translation('view_maintenance_log'), url_path='maintenance-logs'),
+        st.Page(page_record_status, title=get_translation('record_status'), url_path='record-status'),
+        st.Page(page_parts, title=get_translation('parts_index'), url_path='parts'),
+        st.Page(page_wallboard, title=get_translation('wallboard'), url_path='wallboard'),
+        st.Page(page_admin, title=get_translation('admin_mode'), url_path='admin'),
+    ], position="top")
+    navigation.run()
@@ -0,0 +1,112 @@
+"""재개 가능한 청크 업로드 (TUS 1.0 프로토콜) 클라이언트
+
+Supabase Storage의 TUS 엔드포인트(/storage/v1/upload/resumable)에 파일 스트림을 청크 단위로 올린다.
+streamlit/supabase에 의존하지 않으므로 tests/test_resumable_upload.py가 로컬 TUS 서버로 직접 검증한다.
+app.py는 이 모듈을 LazyModule로 불러 requests import를 실제 업로드 시점까지 미룬다.
+"""
+import base64
+from time import sleep
+from urllib.parse import urljoin
+
+import requests
+
+CHUNK_SIZE = 6 * 1024 * 1024  # Supabase는 마지막 청크를 제외하고 6MB 청크만 허용
+MAX_RETRIES = 5
+
+def tus_headers(api_key, extra=None):
+    headers = {
+        'Authorization': f"Bearer {api_key}",
+        'apikey': api_key,
+        'Tus-Resumable': '1.0.0',
+    }
+    if extra:
+        headers.update(extra)
+    return headers
+
+def tus_metadata(bucket, object_name, content_type):
+    metadata = {
+        'bucketName': bucket,
+        'objectName': object_name,
+        'contentType': content_type or 'application/octet-stream',
+        'cacheControl': '3600',
+    }
+    return ','.join(f"{key} {base64.b64encode(value.encode('utf-8')).decode('ascii')}" for key, value in metadata.items())
+
+def create_upload(endpoint, api_key, size, bucket, object_name, content_type):
+    """업로드 위치 생성 후 절대 URL 반환"""
+    response = requests.post(
+        endpoint,
+        headers=tus_headers(api_key, {
+            'Upload-Length': str(size),
+            'Upload-Metadata': tus_metadata(bucket, object_name, content_type),
+            'x-upsert': 'true',
+        }),
+        timeout=30
+    )
+    response.raise_for_status()
+    return urljoin(endpoint, response.headers['Location'])
+
+def upload_offset(location, api_key):
+    """서버에 저장된 업로드 위치 조회 (만료된 업로드면 None)"""
+    response = requests.head(location, headers=tus_headers(api_key), timeout=30)
+    if response.status_code in (404, 410):
+        return None
+    response.raise_for_status()
+    return int(response.headers['Upload-Offset'])
+
+def upload_stream(endpoint, api_key, stream, size, bucket, object_name, content_type, resume_store, resume_key,
+                  persist=None, chunk_size=CHUNK_SIZE, max_retries=MAX_RETRIES):
+    """스트림을 청크 단위로 업로드. 중단되면 resume_store에 남은 위치에서 재개한다.
+
+    메모리에는 한 번에 청크 하나(chunk_size)만 올라간다.
+    persist: 업로드 위치를 만든 뒤와 청크마다 호출 (resume_store를 파일 등에 저장할 때)
+    """
+    entry = resume_store.get(resume_key)
+    offset = None
+    if entry:
+        try:
+            offset = upload_offset(entry['location'], api_key)
+        except requests.RequestException:
+            offset = None
+    if offset is None:
+        entry = {'location': create_upload(endpoint, api_key, size, bucket, object_name, content_type), 'object_name': object_name}
+        resume_store[resume_key] = entry
+        offset = 0
+        if persist:
+            persist()
+
+    retries = 0
+    while offset < size:
+        stream.seek(offset)
+        chunk = stream.read(chunk_size)
+        try:
+            response = requests.patch(
+                entry['location'],
+                data=chunk,
+                headers=tus_headers(api_key, {
+                    'Upload-Offset': str(offset),
+                    'Content-Type': 'application/offset+octet-stream',
+                }),
+                timeout=120
+            )
+            response.raise_for_status()
+            offset = int(response.headers['Upload-Offset'])
+            retries = 0
+            if persist:
+                persist()
+        except requests.RequestException:
+            retries += 1
+            if retries > max_retries:
+                raise
+            sleep(min(2 ** retries, 30))
+            # 서버가 실제로 받은 위치부터 다시 전송 (조회도 실패하면 마지막으로 확인된 위치 유지)
+            try:
+                server_offset = upload_offset(entry['location'], api_key)
+            except requests.RequestException:
+                continue
+            if server_offset is None:
+                raise
+            offset = server_offset
+
+    resume_store.pop(resume_key, None)
+    return entry['object_name']
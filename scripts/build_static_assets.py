@@ -0,0 +1,91 @@
+"""로그인 화면 정적 자산 빌드 스크립트
+
+원격 Supabase Storage의 로고/배경 이미지를 크기별로 줄이고 WebP로 압축해
+static/ 폴더에 저장한 뒤 static/manifest.json을 생성한다.
+app.py는 매니페스트에 있는 파일을 ?v=<해시> 로 요청하므로 브라우저가 장기 캐시한다.
+
+사용법:
+    python scripts/build_static_assets.py                 # 원격 원본을 내려받아 빌드
+    python scripts/build_static_assets.py --source-dir 원본폴더  # 로컬 logo.png / background.png 사용
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+
+import requests
+from PIL import Image
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT_DIR, 'static')
+REMOTE_BASE_URL = "https://xvudytcfwnzjxhaortik.supabase.co/storage/v1/object/public/equipment_images/logo_image"
+
+# 자산별 원본 파일과 변형(가로 폭 px). mobile 변형은 app.py CSS의 @media (max-width: 600px)에서 사용
+ASSETS = {
+    'logo': {
+        'source': 'logo.png',
+        'variants': {'desktop': 200, 'desktop_2x': 400, 'mobile': 120, 'mobile_2x': 240},
+        'quality': 90,
+    },
+    'background': {
+        'source': 'background.png',
+        'variants': {'desktop': 1920, 'mobile': 800},
+        'quality': 75,
+    },
+}
+
+
+def load_source(name, source_dir):
+    if source_dir:
+        with open(os.path.join(source_dir, name), 'rb') as f:
+            return Image.open(io.BytesIO(f.read()))
+    response = requests.get(f"{REMOTE_BASE_URL}/{name}", timeout=60)
+    response.raise_for_status()
+    return Image.open(io.BytesIO(response.content))
+
+
+def build_variant(image, width, quality):
+    """원본보다 크게 늘리지 않고 지정 폭으로 줄인 WebP 바이트 반환"""
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    if image.width > width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='WEBP', quality=quality, method=6)
+    return buffer.getvalue(), image.width, image.height
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source-dir', help='원본 이미지 폴더 (지정하지 않으면 원격에서 내려받음)')
+    args = parser.parse_args()
+
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    manifest = {}
+    for asset, config in ASSETS.items():
+        source = load_source(config['source'], args.source_dir)
+        manifest[asset] = {}
+        for variant, width in config['variants'].items():
+            data, actual_width, actual_height = build_variant(source, width, config['quality'])
+            file_name = f"{asset}-{variant}.webp"
+            with open(os.path.join(STATIC_DIR, file_name), 'wb') as f:
+                f.write(data)
+            manifest[asset][variant] = {
+                'file': file_name,
+                'hash': hashlib.sha256(data).hexdigest()[:12],
+                'width': actual_width,
+                'height': actual_height,
+            }
+            print(f"{file_name}: {actual_width}x{actual_height}, {len(data) / 1024:.1f} KB")
+
+    with open(os.path.join(STATIC_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"manifest 저장: {os.path.join(STATIC_DIR, 'manifest.json')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""앱 콜드 스타트 import 시간 프로파일
+
+새 파이썬 프로세스에서 `python -X importtime`으로 app.py가 사용하는 최상위 모듈을 하나씩 import 하고,
+모듈별 누적 import 시간을 큰 순서대로 출력한다. 지연 import 대상(pandas, altair, requests)이
+로그인 화면 첫 렌더에서 빠졌는지 전후 비교할 때 사용한다.
+
+사용법:
+    python scripts/profile_startup.py              # 기본 모듈 목록
+    python scripts/profile_startup.py pandas numpy # 지정한 모듈만
+"""
+import subprocess
+import sys
+import tempfile
+
+# app.py 첫 실행(로그인 화면)에서 import 되는 모듈과 페이지에서 지연 import 되는 모듈
+EAGER_MODULES = ['streamlit', 'supabase', 'dotenv', 'uuid', 'json', 're', 'base64', 'threading', 'shutil']
+LAZY_MODULES = ['pandas', 'altair', 'requests']
+
+def measure_import(module):
+    """새 프로세스에서 module을 import 하고 -X importtime 출력의 최상위 누적 시간(μs)을 반환"""
+    # 저장소 루트의 supabase/ 폴더(마이그레이션)가 패키지로 잡히지 않도록 임시 폴더에서 실행
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=tempfile.gettempdir()
+    )
+    if result.returncode != 0:
+        return None
+    cumulative = None
+    for line in result.stderr.splitlines():
+        # 형식: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:'):
+            continue
+        parts = [part.strip() for part in line[len('import time:'):].split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative = int(parts[1])
+    return cumulative
+
+def main():
+    modules = sys.argv[1:] or EAGER_MODULES + LAZY_MODULES
+    rows = []
+    for module in modules:
+        rows.append((module, measure_import(module)))
+    rows.sort(key=lambda row: -(row[1] or 0))
+
+    print(f"{'module':<14}{'cumulative ms':>15}  phase")
+    eager_total = 0
+    for module, micros in rows:
+        phase = 'lazy' if module in LAZY_MODULES else 'startup'
+        if micros is None:
+            print(f"{module:<14}{'not installed':>15}  {phase}")
+            continue
+        if phase == 'startup':
+            eager_total += micros
+        print(f"{module:<14}{micros / 1000:>15.1f}  {phase}")
+    # 모듈 간 공유 의존성이 중복 집계되므로 합계는 상한값
+    print(f"\n로그인 화면 import 합계(상한): {eager_total / 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+-- ------------------------------------------------------
+-- 다단계 쓰기 경로를 단일 트랜잭션 RPC로 통합
+-- ------------------------------------------------------
+-- 적용: supabase db push  (또는 로컬 Postgres에서 psql "$DATABASE_URL" -f 이 파일)
+-- Supabase 전용 확장에 의존하지 않으므로 일반 Postgres에서도 그대로 실행된다.
+
+-- 설비 삭제: 상태 이력, 정비 이력, 설비를 한 트랜잭션에서 삭제하고
+-- Storage 정리에 필요한 파일 URL을 반환한다.
+create or replace function public.delete_equipment_cascade(p_equipment_id public.equipment.id%type)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_equipment public.equipment%rowtype;
+    v_log_image_urls text[];
+begin
+    select * into v_equipment
+      from public.equipment
+     where id = p_equipment_id
+       for update;
+    if not found then
+        return null;
+    end if;
+
+    select coalesce(array_agg(image_urls) filter (where coalesce(image_urls, '') <> ''), '{}')
+      into v_log_image_urls
+      from public.maintenance_logs
+     where equipment_id = p_equipment_id;
+
+    delete from public.equipment_status_history where equipment_id = p_equipment_id;
+    delete from public.maintenance_logs where equipment_id = p_equipment_id;
+    delete from public.equipment where id = p_equipment_id;
+
+    return jsonb_build_object(
+        'image_urls', v_equipment.image_urls,
+        'documents', v_equipment.documents,
+        'log_image_urls', to_jsonb(v_log_image_urls)
+    );
+end;
+$$;
+
+-- 상태 기록: 이력 추가와 설비 현재 상태 변경을 함께 처리한다.
+create or replace function public.record_equipment_status(
+    p_equipment_id public.equipment.id%type,
+    p_status text,
+    p_notes text,
+    p_created_at timestamptz
+)
+returns public.equipment_status_history
+language plpgsql
+as $$
+declare
+    v_history public.equipment_status_history%rowtype;
+begin
+    insert into public.equipment_status_history (equipment_id, status, notes, created_at)
+    values (p_equipment_id, p_status, p_notes, coalesce(p_created_at, now()))
+    returning * into v_history;
+
+    update public.equipment
+       set status = p_status
+     where id = p_equipment_id;
+
+    return v_history;
+end;
+$$;
+
+-- 설비 수정: p_data에 포함된 컬럼만 덮어쓰고, 새 이미지 URL은 기존 목록 뒤에 이어 붙인다.
+-- 기존 image_urls를 다시 조회하는 왕복이 필요 없다.
+create or replace function public.update_equipment_record(
+    p_equipment_id public.equipment.id%type,
+    p_data jsonb,
+    p_new_image_urls text default null
+)
+returns public.equipment
+language plpgsql
+as $$
+declare
+    v_row public.equipment%rowtype;
+begin
+    select * into v_row
+      from public.equipment
+     where id = p_equipment_id
+       for update;
+    if not found then
+        return null;
+    end if;
+
+    -- p_data에 없는 키는 현재 값을 유지
+    v_row := jsonb_populate_record(v_row, p_data);
+
+    if coalesce(p_new_image_urls, '') <> '' then
+        v_row.image_urls := case
+            when coalesce(v_row.image_urls, '') = '' then p_new_image_urls
+            else v_row.image_urls || ',' || p_new_image_urls
+        end;
+    end if;
+
+    update public.equipment
+       set name = v_row.name,
+           model = v_row.model,
+           equipment_type = v_row.equipment_type,
+           status = v_row.status,
+           product_name = v_row.product_name,
+           maker = v_row.maker,
+           serial_number = v_row.serial_number,
+           production_date = v_row.production_date,
+           acquisition_cost = v_row.acquisition_cost,
+           acquisition_date = v_row.acquisition_date,
+           acquisition_basis = v_row.acquisition_basis,
+           purchase_date = v_row.purchase_date,
+           installation_location = v_row.installation_location,
+           motor_capacity = v_row.motor_capacity,
+           heater_capacity = v_row.heater_capacity,
+           total_weight = v_row.total_weight,
+           other_notes = v_row.other_notes,
+           equipment_grade = v_row.equipment_grade,
+           details = v_row.details,
+           accessory_specs = v_row.accessory_specs,
+           spare_part_specs = v_row.spare_part_specs,
+           documents = v_row.documents,
+           screw_specs = v_row.screw_specs,
+           oil_specs = v_row.oil_specs,
+           image_urls = v_row.image_urls
+     where id = p_equipment_id
+    returning * into v_row;
+
+    return v_row;
+end;
+$$;
+
+-- PostgREST 스키마 캐시 갱신 (일반 Postgres에서는 수신자가 없어 무시됨)
+notify pgrst, 'reload schema';
@@ -0,0 +1,80 @@
+-- ------------------------------------------------------
+-- 백그라운드 첨부 업로드: 대기 표시 컬럼과 첨부 반영 RPC
+-- ------------------------------------------------------
+-- 폼 제출 시 레코드를 먼저 저장하고(attachments_pending = true),
+-- 업로드 워커가 파일을 올린 뒤 아래 함수로 URL을 붙이고 표시를 해제한다.
+
+alter table public.equipment
+    add column if not exists attachments_pending boolean not null default false;
+alter table public.maintenance_logs
+    add column if not exists attachments_pending boolean not null default false;
+
+-- 설비에 이미지 URL과 문서 목록을 이어 붙인다.
+-- documents 컬럼이 JSON 문자열(text)이든 jsonb든 같은 방식으로 동작한다.
+create or replace function public.append_equipment_attachments(
+    p_equipment_id public.equipment.id%type,
+    p_image_urls text,
+    p_documents jsonb
+)
+returns void
+language plpgsql
+as $$
+declare
+    v_row public.equipment%rowtype;
+    v_documents jsonb;
+    v_image_urls text;
+begin
+    select * into v_row
+      from public.equipment
+     where id = p_equipment_id
+       for update;
+    if not found then
+        return;
+    end if;
+
+    v_documents := coalesce(to_jsonb(v_row.documents), '[]'::jsonb);
+    if jsonb_typeof(v_documents) = 'string' then
+        v_documents := coalesce(nullif(v_documents #>> '{}', '')::jsonb, '[]'::jsonb);
+    end if;
+    if jsonb_typeof(v_documents) <> 'array' then
+        v_documents := '[]'::jsonb;
+    end if;
+    v_documents := v_documents || coalesce(p_documents, '[]'::jsonb);
+
+    v_image_urls := case
+        when coalesce(p_image_urls, '') = '' then v_row.image_urls
+        when coalesce(v_row.image_urls, '') = '' then p_image_urls
+        else v_row.image_urls || ',' || p_image_urls
+    end;
+
+    v_row := jsonb_populate_record(v_row, jsonb_build_object('documents', v_documents));
+
+    update public.equipment
+       set image_urls = v_image_urls,
+           documents = v_row.documents,
+           attachments_pending = false
+     where id = p_equipment_id;
+end;
+$$;
+
+-- 정비 이력에 이미지 URL을 이어 붙인다.
+create or replace function public.append_log_attachments(
+    p_log_id public.maintenance_logs.id%type,
+    p_image_urls text
+)
+returns void
+language plpgsql
+as $$
+begin
+    update public.maintenance_logs
+       set image_urls = case
+               when coalesce(p_image_urls, '') = '' then image_urls
+               when coalesce(image_urls, '') = '' then p_image_urls
+               else image_urls || ',' || p_image_urls
+           end,
+           attachments_pending = false
+     where id = p_log_id;
+end;
+$$;
+
+notify pgrst, 'reload schema';
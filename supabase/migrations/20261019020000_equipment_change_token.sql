@@ -0,0 +1,44 @@
+-- ------------------------------------------------------
+-- 현황판 증분 갱신: 설비 변경 시각(updated_at)과 변경 토큰 RPC
+-- ------------------------------------------------------
+-- 현황판은 주기적으로 equipment_change_token()만 호출하고,
+-- 토큰이 바뀌었을 때 updated_at이 이전 토큰보다 큰 행만 다시 읽는다.
+
+alter table public.equipment
+    add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists equipment_factory_updated_at_idx
+    on public.equipment (factory_id, updated_at desc);
+
+-- 모든 UPDATE(상태 기록 RPC 포함)에서 updated_at을 갱신한다.
+create or replace function public.touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists equipment_touch_updated_at on public.equipment;
+create trigger equipment_touch_updated_at
+    before update on public.equipment
+    for each row execute function public.touch_updated_at();
+
+-- 공장 단위 변경 토큰: 가장 최근 updated_at과 행 수.
+-- 행 수는 삭제(updated_at으로는 알 수 없음)를 감지하는 데 사용한다.
+create or replace function public.equipment_change_token(p_factory_id public.equipment.factory_id%type)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'max_updated_at', max(updated_at),
+        'row_count', count(*)
+    )
+      from public.equipment
+     where factory_id = p_factory_id;
+$$;
+
+notify pgrst, 'reload schema';
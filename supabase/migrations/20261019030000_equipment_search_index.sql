@@ -0,0 +1,24 @@
+-- ------------------------------------------------------
+-- 관리자 설비 검색(typeahead): 부분 일치(ilike '%term%')용 trigram 인덱스
+-- ------------------------------------------------------
+-- 앱은 name/model/serial_number/maker 네 컬럼을 ilike로 OR 검색한다.
+-- 앞뒤 와일드카드 ilike는 btree를 쓸 수 없으므로 컬럼별 GIN(gin_trgm_ops) 인덱스를 만들고,
+-- 플래너가 BitmapOr로 결합하게 한다.
+
+create extension if not exists pg_trgm;
+
+create index if not exists equipment_name_trgm_idx
+    on public.equipment using gin (name gin_trgm_ops);
+
+create index if not exists equipment_model_trgm_idx
+    on public.equipment using gin (model gin_trgm_ops);
+
+create index if not exists equipment_serial_number_trgm_idx
+    on public.equipment using gin (serial_number gin_trgm_ops);
+
+create index if not exists equipment_maker_trgm_idx
+    on public.equipment using gin (maker gin_trgm_ops);
+
+-- 검색어가 없을 때의 이름순 상위 N건 조회용
+create index if not exists equipment_name_idx
+    on public.equipment (name);
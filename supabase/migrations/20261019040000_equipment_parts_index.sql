@@ -0,0 +1,176 @@
+-- ------------------------------------------------------
+-- 전체 설비 스페어 파트 / 부속기기 색인
+-- ------------------------------------------------------
+-- 설비별 spare_part_specs / accessory_specs JSON을 행 단위로 풀어 equipment_parts에 저장한다.
+-- 설비가 추가되거나 두 컬럼(또는 공장)이 바뀔 때 트리거가 해당 설비의 행만 다시 만들고,
+-- 설비가 삭제되면 외래 키로 함께 삭제된다. 조회 시에는 JSON을 파싱하지 않는다.
+
+create extension if not exists pg_trgm;
+
+-- equipment.id / factory_id 타입(uuid, bigint 등)을 그대로 따르도록 동적으로 생성
+do $$
+declare
+    v_id_type text;
+    v_factory_type text;
+begin
+    select format_type(atttypid, atttypmod) into v_id_type
+      from pg_attribute
+     where attrelid = 'public.equipment'::regclass and attname = 'id';
+    select format_type(atttypid, atttypmod) into v_factory_type
+      from pg_attribute
+     where attrelid = 'public.equipment'::regclass and attname = 'factory_id';
+
+    execute format($sql$
+        create table if not exists public.equipment_parts (
+            id bigint generated always as identity primary key,
+            equipment_id %s not null references public.equipment (id) on delete cascade,
+            factory_id %s,
+            kind text not null check (kind in ('spare_part', 'accessory')),
+            position integer not null,
+            name text,
+            name_key text,      -- 집계용 정규화 이름 (소문자, 공백 제거)
+            model text,         -- 부속기기 형식
+            serial text,        -- 부속기기 제작번호
+            maker text,         -- 부속기기 제조처
+            spec text           -- 부속기기 용량 및 규격 / 스페어 파트 교체 주기
+        )
+    $sql$, v_id_type, v_factory_type);
+end;
+$$;
+
+create index if not exists equipment_parts_equipment_idx
+    on public.equipment_parts (equipment_id);
+create index if not exists equipment_parts_usage_idx
+    on public.equipment_parts (kind, name_key, factory_id);
+create index if not exists equipment_parts_name_trgm_idx
+    on public.equipment_parts using gin (name gin_trgm_ops);
+create index if not exists equipment_parts_model_trgm_idx
+    on public.equipment_parts using gin (model gin_trgm_ops);
+create index if not exists equipment_parts_serial_trgm_idx
+    on public.equipment_parts using gin (serial gin_trgm_ops);
+create index if not exists equipment_parts_maker_trgm_idx
+    on public.equipment_parts using gin (maker gin_trgm_ops);
+
+-- 사양 컬럼 값을 JSON 배열로 변환. JSON 문자열(text)이든 jsonb든 같은 방식으로 동작하고,
+-- 파싱할 수 없거나 배열이 아니면 빈 배열 (앱의 사양 오류 표시가 따로 알려 줌)
+create or replace function public.spec_json_array(p_value jsonb)
+returns jsonb
+language plpgsql
+immutable
+as $$
+declare
+    v_value jsonb := p_value;
+begin
+    if v_value is null then
+        return '[]'::jsonb;
+    end if;
+    if jsonb_typeof(v_value) = 'string' then
+        begin
+            v_value := nullif(v_value #>> '{}', '')::jsonb;
+        exception when others then
+            return '[]'::jsonb;
+        end;
+    end if;
+    if v_value is null or jsonb_typeof(v_value) <> 'array' then
+        return '[]'::jsonb;
+    end if;
+    return v_value;
+end;
+$$;
+
+create or replace function public.parts_name_key(p_name text)
+returns text
+language sql
+immutable
+as $$
+    select nullif(lower(regexp_replace(coalesce(p_name, ''), '\s+', '', 'g')), '');
+$$;
+
+-- 설비 한 대의 색인 행을 다시 만든다.
+create or replace function public.refresh_equipment_parts(p_equipment_id public.equipment.id%type)
+returns void
+language plpgsql
+as $$
+declare
+    v_row public.equipment%rowtype;
+begin
+    delete from public.equipment_parts where equipment_id = p_equipment_id;
+
+    select * into v_row from public.equipment where id = p_equipment_id;
+    if not found then
+        return;
+    end if;
+
+    insert into public.equipment_parts (equipment_id, factory_id, kind, position, name, name_key, spec)
+    select v_row.id, v_row.factory_id, 'spare_part', item.position,
+           nullif(trim(item.value ->> 'SPARE PART'), ''),
+           public.parts_name_key(item.value ->> 'SPARE PART'),
+           nullif(trim(item.value ->> '교체 주기'), '')
+      from jsonb_array_elements(public.spec_json_array(to_jsonb(v_row.spare_part_specs))) with ordinality as item(value, position)
+     where jsonb_typeof(item.value) = 'object'
+       and coalesce(trim(item.value ->> 'SPARE PART'), '') <> '';
+
+    insert into public.equipment_parts (equipment_id, factory_id, kind, position, name, name_key, model, serial, maker, spec)
+    select v_row.id, v_row.factory_id, 'accessory', item.position,
+           nullif(trim(item.value ->> '부속기기 명'), ''),
+           public.parts_name_key(item.value ->> '부속기기 명'),
+           nullif(trim(item.value ->> '형식'), ''),
+           nullif(trim(item.value ->> '제작번호'), ''),
+           nullif(trim(item.value ->> '제조처'), ''),
+           nullif(trim(item.value ->> '용량 및 규격'), '')
+      from jsonb_array_elements(public.spec_json_array(to_jsonb(v_row.accessory_specs))) with ordinality as item(value, position)
+     where jsonb_typeof(item.value) = 'object'
+       and (coalesce(trim(item.value ->> '부속기기 명'), '') <> ''
+            or coalesce(trim(item.value ->> '형식'), '') <> ''
+            or coalesce(trim(item.value ->> '제작번호'), '') <> '');
+end;
+$$;
+
+create or replace function public.equipment_parts_sync()
+returns trigger
+language plpgsql
+as $$
+begin
+    perform public.refresh_equipment_parts(new.id);
+    return null;
+end;
+$$;
+
+drop trigger if exists equipment_parts_sync on public.equipment;
+create trigger equipment_parts_sync
+    after insert or update of spare_part_specs, accessory_specs, factory_id on public.equipment
+    for each row execute function public.equipment_parts_sync();
+
+-- 기존 설비 채우기
+select public.refresh_equipment_parts(id) from public.equipment;
+
+-- 부품별 공장 사용 현황: [{kind, name_key, name, factory_id, factory_name, equipment_count, row_count}]
+-- p_kind가 null이면 두 종류 모두, p_term이 있으면 이름/형식/제작번호/제조처 부분 일치로 제한
+create or replace function public.part_usage_by_factory(p_kind text default null, p_term text default null)
+returns jsonb
+language sql
+stable
+as $$
+    select coalesce(jsonb_agg(usage order by usage.equipment_count desc, usage.name), '[]'::jsonb)
+      from (
+        select p.kind,
+               p.name_key,
+               min(p.name) as name,
+               p.factory_id,
+               min(f.name) as factory_name,
+               count(distinct p.equipment_id) as equipment_count,
+               count(*) as row_count
+          from public.equipment_parts p
+          left join public.factories f on f.id = p.factory_id
+         where p.name_key is not null
+           and (p_kind is null or p.kind = p_kind)
+           and (coalesce(p_term, '') = ''
+                or p.name ilike '%' || p_term || '%'
+                or p.model ilike '%' || p_term || '%'
+                or p.serial ilike '%' || p_term || '%'
+                or p.maker ilike '%' || p_term || '%')
+         group by p.kind, p.name_key, p.factory_id
+      ) usage;
+$$;
+
+notify pgrst, 'reload schema';
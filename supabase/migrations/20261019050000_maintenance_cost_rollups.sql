@@ -0,0 +1,131 @@
+-- ------------------------------------------------------
+-- 정비 비용 집계: (일/월, 설비, 작업 분류)별 비용 합계와 이력 건수
+-- ------------------------------------------------------
+-- maintenance_logs 트리거가 추가/수정/삭제된 이력의 차이만 반영한다.
+-- 공장 단위 조회는 factory_id 인덱스로 집계 테이블 몇 행만 읽는다.
+-- 다른 경로로 데이터가 바뀌었거나 설비의 공장이 바뀌었으면 rebuild_maintenance_cost_rollups()로 다시 만든다.
+
+-- equipment.id / factory_id 타입을 그대로 따르도록 동적으로 생성
+do $$
+declare
+    v_id_type text;
+    v_factory_type text;
+    v_table text;
+    v_period text;
+begin
+    select format_type(atttypid, atttypmod) into v_id_type
+      from pg_attribute
+     where attrelid = 'public.equipment'::regclass and attname = 'id';
+    select format_type(atttypid, atttypmod) into v_factory_type
+      from pg_attribute
+     where attrelid = 'public.equipment'::regclass and attname = 'factory_id';
+
+    foreach v_table in array array['maintenance_cost_daily', 'maintenance_cost_monthly'] loop
+        v_period := case v_table when 'maintenance_cost_daily' then 'day' else 'month' end;
+        execute format($sql$
+            create table if not exists public.%I (
+                %I date not null,               -- 월 집계는 해당 월 1일
+                equipment_id %s not null references public.equipment (id) on delete cascade,
+                factory_id %s,
+                action_category text not null default '',
+                cost numeric not null default 0,
+                log_count integer not null default 0,
+                primary key (%I, equipment_id, action_category)
+            )
+        $sql$, v_table, v_period, v_id_type, v_factory_type, v_period);
+        execute format('create index if not exists %I on public.%I (factory_id, %I)', v_table || '_factory_idx', v_table, v_period);
+    end loop;
+end;
+$$;
+
+-- 이력 한 건의 비용/건수를 일/월 집계에 더한다 (삭제/수정 전 값은 음수로 호출)
+create or replace function public.apply_maintenance_cost(
+    p_equipment_id public.equipment.id%type,
+    p_maintenance_date timestamptz,
+    p_action_category text,
+    p_cost numeric,
+    p_count integer
+)
+returns void
+language plpgsql
+as $$
+declare
+    v_factory_id public.equipment.factory_id%type;
+    v_day date := p_maintenance_date::date;
+    v_category text := coalesce(p_action_category, '');
+begin
+    if p_equipment_id is null or p_maintenance_date is null then
+        return;
+    end if;
+    select factory_id into v_factory_id from public.equipment where id = p_equipment_id;
+    if not found then
+        return;  -- 설비 삭제 중 (집계 행은 외래 키로 함께 삭제됨)
+    end if;
+
+    insert into public.maintenance_cost_daily as t (day, equipment_id, factory_id, action_category, cost, log_count)
+    values (v_day, p_equipment_id, v_factory_id, v_category, coalesce(p_cost, 0), p_count)
+    on conflict (day, equipment_id, action_category) do update
+       set cost = t.cost + excluded.cost,
+           log_count = t.log_count + excluded.log_count,
+           factory_id = excluded.factory_id;
+    delete from public.maintenance_cost_daily
+     where day = v_day and equipment_id = p_equipment_id and action_category = v_category and log_count <= 0;
+
+    insert into public.maintenance_cost_monthly as t (month, equipment_id, factory_id, action_category, cost, log_count)
+    values (date_trunc('month', v_day)::date, p_equipment_id, v_factory_id, v_category, coalesce(p_cost, 0), p_count)
+    on conflict (month, equipment_id, action_category) do update
+       set cost = t.cost + excluded.cost,
+           log_count = t.log_count + excluded.log_count,
+           factory_id = excluded.factory_id;
+    delete from public.maintenance_cost_monthly
+     where month = date_trunc('month', v_day)::date and equipment_id = p_equipment_id and action_category = v_category and log_count <= 0;
+end;
+$$;
+
+create or replace function public.maintenance_cost_rollup_sync()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        perform public.apply_maintenance_cost(old.equipment_id, old.maintenance_date, old.action_category, -coalesce(old.cost, 0), -1);
+    end if;
+    if tg_op in ('INSERT', 'UPDATE') then
+        perform public.apply_maintenance_cost(new.equipment_id, new.maintenance_date, new.action_category, coalesce(new.cost, 0), 1);
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists maintenance_cost_rollup_sync on public.maintenance_logs;
+create trigger maintenance_cost_rollup_sync
+    after insert or delete or update of equipment_id, maintenance_date, action_category, cost on public.maintenance_logs
+    for each row execute function public.maintenance_cost_rollup_sync();
+
+-- 전체 재계산 (배치 작업/수동 복구용)
+create or replace function public.rebuild_maintenance_cost_rollups()
+returns void
+language plpgsql
+as $$
+begin
+    delete from public.maintenance_cost_daily;
+    delete from public.maintenance_cost_monthly;
+
+    insert into public.maintenance_cost_daily (day, equipment_id, factory_id, action_category, cost, log_count)
+    select l.maintenance_date::date, l.equipment_id, e.factory_id, coalesce(l.action_category, ''),
+           sum(coalesce(l.cost, 0)), count(*)
+      from public.maintenance_logs l
+      join public.equipment e on e.id = l.equipment_id
+     where l.maintenance_date is not null
+     group by 1, 2, 3, 4;
+
+    insert into public.maintenance_cost_monthly (month, equipment_id, factory_id, action_category, cost, log_count)
+    select date_trunc('month', day)::date, equipment_id, factory_id, action_category, sum(cost), sum(log_count)
+      from public.maintenance_cost_daily
+     group by 1, 2, 3, 4;
+end;
+$$;
+
+select public.rebuild_maintenance_cost_rollups();
+
+notify pgrst, 'reload schema';
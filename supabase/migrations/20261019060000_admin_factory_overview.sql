@@ -0,0 +1,62 @@
+-- ------------------------------------------------------
+-- 관리자 전체 현황: 공장별 설비 상태 수, 진행 중 고장, 이번 달 정비 건수/비용을 한 번에 반환
+-- ------------------------------------------------------
+-- 정비 건수/비용은 maintenance_logs를 훑지 않고 월별 비용 집계(maintenance_cost_monthly)에서 읽는다.
+
+-- 고장 설비별 마지막 '고장' 기록 시각 조회용
+create index if not exists equipment_status_history_equipment_created_idx
+    on public.equipment_status_history (equipment_id, created_at desc);
+
+-- [{factory_id, factory_name, equipment_total, normal_count, faulty_count, sold_count,
+--   oldest_fault_since, logs_this_month, cost_this_month}]
+-- p_month: 집계할 달의 아무 날짜 (null이면 DB 기준 이번 달)
+create or replace function public.admin_factory_overview(p_month date default null)
+returns jsonb
+language sql
+stable
+as $$
+    with equipment_counts as (
+        select factory_id,
+               count(*) as equipment_total,
+               count(*) filter (where status = '정상') as normal_count,
+               count(*) filter (where status = '고장') as faulty_count,
+               count(*) filter (where status = '매각') as sold_count
+          from public.equipment
+         group by factory_id
+    ),
+    open_faults as (
+        -- 현재 고장 상태인 설비의 고장 시작 시각 중 가장 오래된 값
+        select e.factory_id, min(fault.since) as oldest_fault_since
+          from public.equipment e
+          cross join lateral (
+              select max(h.created_at) as since
+                from public.equipment_status_history h
+               where h.equipment_id = e.id and h.status = '고장'
+          ) fault
+         where e.status = '고장'
+         group by e.factory_id
+    ),
+    month_costs as (
+        select factory_id, sum(log_count) as logs_this_month, sum(cost) as cost_this_month
+          from public.maintenance_cost_monthly
+         where month = date_trunc('month', coalesce(p_month, current_date))::date
+         group by factory_id
+    )
+    select coalesce(jsonb_agg(jsonb_build_object(
+               'factory_id', f.id,
+               'factory_name', f.name,
+               'equipment_total', coalesce(ec.equipment_total, 0),
+               'normal_count', coalesce(ec.normal_count, 0),
+               'faulty_count', coalesce(ec.faulty_count, 0),
+               'sold_count', coalesce(ec.sold_count, 0),
+               'oldest_fault_since', fo.oldest_fault_since,
+               'logs_this_month', coalesce(mc.logs_this_month, 0),
+               'cost_this_month', coalesce(mc.cost_this_month, 0)
+           ) order by f.name), '[]'::jsonb)
+      from public.factories f
+      left join equipment_counts ec on ec.factory_id = f.id
+      left join open_faults fo on fo.factory_id = f.id
+      left join month_costs mc on mc.factory_id = f.id;
+$$;
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,187 @@
+-- ------------------------------------------------------
+-- 공장 단위 정비 비용 집계: (월, 공장, 작업 분류)별 비용 합계와 이력 건수
+-- ------------------------------------------------------
+-- 공장 비용 요약은 설비별 월 집계(maintenance_cost_monthly)를 모두 읽지 않고 이 테이블의 몇 행만 읽는다.
+-- 설비별 순위는 factory_equipment_costs()가 DB에서 합산해 상위 N건만 돌려준다.
+-- 설비가 삭제되거나 다른 공장으로 옮겨지면 equipment 트리거가 해당 설비의 합계를 공장 사이에서 옮긴다.
+
+do $$
+declare
+    v_factory_type text;
+begin
+    select format_type(atttypid, atttypmod) into v_factory_type
+      from pg_attribute
+     where attrelid = 'public.equipment'::regclass and attname = 'factory_id';
+
+    execute format($sql$
+        create table if not exists public.maintenance_cost_factory_monthly (
+            factory_id %s not null,
+            month date not null,            -- 해당 월 1일
+            action_category text not null default '',
+            cost numeric not null default 0,
+            log_count integer not null default 0,
+            primary key (factory_id, month, action_category)
+        )
+    $sql$, v_factory_type);
+end;
+$$;
+
+-- 공장 월 집계에 더한다 (빼려면 음수로 호출). 공장이 없는 설비는 집계하지 않음
+create or replace function public.apply_factory_cost(
+    p_factory_id public.equipment.factory_id%type,
+    p_month date,
+    p_action_category text,
+    p_cost numeric,
+    p_count integer
+)
+returns void
+language plpgsql
+as $$
+begin
+    if p_factory_id is null or p_month is null then
+        return;
+    end if;
+    insert into public.maintenance_cost_factory_monthly as t (factory_id, month, action_category, cost, log_count)
+    values (p_factory_id, p_month, coalesce(p_action_category, ''), coalesce(p_cost, 0), p_count)
+    on conflict (factory_id, month, action_category) do update
+       set cost = t.cost + excluded.cost,
+           log_count = t.log_count + excluded.log_count;
+    delete from public.maintenance_cost_factory_monthly
+     where factory_id = p_factory_id and month = p_month and action_category = coalesce(p_action_category, '') and log_count <= 0;
+end;
+$$;
+
+-- 이력 한 건의 비용/건수를 일/월/공장 집계에 더한다 (삭제/수정 전 값은 음수로 호출)
+create or replace function public.apply_maintenance_cost(
+    p_equipment_id public.equipment.id%type,
+    p_maintenance_date timestamptz,
+    p_action_category text,
+    p_cost numeric,
+    p_count integer
+)
+returns void
+language plpgsql
+as $$
+declare
+    v_factory_id public.equipment.factory_id%type;
+    v_day date := p_maintenance_date::date;
+    v_category text := coalesce(p_action_category, '');
+begin
+    if p_equipment_id is null or p_maintenance_date is null then
+        return;
+    end if;
+    select factory_id into v_factory_id from public.equipment where id = p_equipment_id;
+    if not found then
+        return;  -- 설비 삭제 중 (집계 행은 외래 키/설비 트리거로 정리됨)
+    end if;
+
+    insert into public.maintenance_cost_daily as t (day, equipment_id, factory_id, action_category, cost, log_count)
+    values (v_day, p_equipment_id, v_factory_id, v_category, coalesce(p_cost, 0), p_count)
+    on conflict (day, equipment_id, action_category) do update
+       set cost = t.cost + excluded.cost,
+           log_count = t.log_count + excluded.log_count,
+           factory_id = excluded.factory_id;
+    delete from public.maintenance_cost_daily
+     where day = v_day and equipment_id = p_equipment_id and action_category = v_category and log_count <= 0;
+
+    insert into public.maintenance_cost_monthly as t (month, equipment_id, factory_id, action_category, cost, log_count)
+    values (date_trunc('month', v_day)::date, p_equipment_id, v_factory_id, v_category, coalesce(p_cost, 0), p_count)
+    on conflict (month, equipment_id, action_category) do update
+       set cost = t.cost + excluded.cost,
+           log_count = t.log_count + excluded.log_count,
+           factory_id = excluded.factory_id;
+    delete from public.maintenance_cost_monthly
+     where month = date_trunc('month', v_day)::date and equipment_id = p_equipment_id and action_category = v_category and log_count <= 0;
+
+    perform public.apply_factory_cost(v_factory_id, date_trunc('month', v_day)::date, v_category, p_cost, p_count);
+end;
+$$;
+
+-- 설비 삭제/공장 변경: 설비의 월 합계를 이전 공장에서 빼고, 공장 변경이면 새 공장에 더함
+create or replace function public.maintenance_cost_equipment_sync()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op = 'UPDATE' and old.factory_id is not distinct from new.factory_id then
+        return new;
+    end if;
+
+    perform public.apply_factory_cost(old.factory_id, m.month, m.action_category, -m.cost, -m.log_count)
+       from public.maintenance_cost_monthly m
+      where m.equipment_id = old.id;
+
+    if tg_op = 'DELETE' then
+        return old;
+    end if;
+
+    update public.maintenance_cost_daily set factory_id = new.factory_id where equipment_id = new.id;
+    update public.maintenance_cost_monthly set factory_id = new.factory_id where equipment_id = new.id;
+    perform public.apply_factory_cost(new.factory_id, m.month, m.action_category, m.cost, m.log_count)
+       from public.maintenance_cost_monthly m
+      where m.equipment_id = new.id;
+    return new;
+end;
+$$;
+
+drop trigger if exists maintenance_cost_equipment_sync on public.equipment;
+create trigger maintenance_cost_equipment_sync
+    before delete or update of factory_id on public.equipment
+    for each row execute function public.maintenance_cost_equipment_sync();
+
+-- 전체 재계산 (배치 작업/수동 복구용)
+create or replace function public.rebuild_maintenance_cost_rollups()
+returns void
+language plpgsql
+as $$
+begin
+    delete from public.maintenance_cost_daily;
+    delete from public.maintenance_cost_monthly;
+    delete from public.maintenance_cost_factory_monthly;
+
+    insert into public.maintenance_cost_daily (day, equipment_id, factory_id, action_category, cost, log_count)
+    select l.maintenance_date::date, l.equipment_id, e.factory_id, coalesce(l.action_category, ''),
+           sum(coalesce(l.cost, 0)), count(*)
+      from public.maintenance_logs l
+      join public.equipment e on e.id = l.equipment_id
+     where l.maintenance_date is not null
+     group by 1, 2, 3, 4;
+
+    insert into public.maintenance_cost_monthly (month, equipment_id, factory_id, action_category, cost, log_count)
+    select date_trunc('month', day)::date, equipment_id, factory_id, action_category, sum(cost), sum(log_count)
+      from public.maintenance_cost_daily
+     group by 1, 2, 3, 4;
+
+    insert into public.maintenance_cost_factory_monthly (factory_id, month, action_category, cost, log_count)
+    select factory_id, month, action_category, sum(cost), sum(log_count)
+      from public.maintenance_cost_monthly
+     where factory_id is not null
+     group by 1, 2, 3;
+end;
+$$;
+
+select public.rebuild_maintenance_cost_rollups();
+
+-- 공장 설비별 비용 합계 상위 p_limit건: [{equipment_id, cost, log_count}]
+create or replace function public.factory_equipment_costs(
+    p_factory_id public.equipment.factory_id%type,
+    p_since date default null,
+    p_limit integer default 10
+)
+returns jsonb
+language sql
+stable
+as $$
+    select coalesce(jsonb_agg(ranked order by ranked.cost desc), '[]'::jsonb)
+      from (
+        select equipment_id, sum(cost) as cost, sum(log_count) as log_count
+          from public.maintenance_cost_monthly
+         where factory_id = p_factory_id
+           and (p_since is null or month >= p_since)
+         group by equipment_id
+         order by sum(cost) desc
+         limit p_limit
+      ) ranked;
+$$;
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,76 @@
+-- ------------------------------------------------------
+-- 관리자 전체 현황: 상태 값을 별칭 목록으로 받아 집계
+-- ------------------------------------------------------
+-- 상태 기록 폼은 선택한 언어로 번역된 상태 문자열('Normal', 'Bình thường' 등)을 저장하므로
+-- '정상'/'고장'/'매각' 리터럴 비교로는 다른 언어로 기록된 설비를 세지 못한다.
+-- 앱이 신뢰성 지표와 같은 매핑(모든 언어 카탈로그)에서 만든 별칭 목록을 넘긴다.
+-- 이번 달 정비 건수/비용은 공장 월 집계(maintenance_cost_factory_monthly)에서 읽는다.
+
+drop function if exists public.admin_factory_overview(date);
+
+-- [{factory_id, factory_name, equipment_total, normal_count, faulty_count, sold_count,
+--   oldest_fault_since, logs_this_month, cost_this_month}]
+-- p_month: 집계할 달의 아무 날짜 (null이면 DB 기준 이번 달)
+-- p_normal / p_faulty / p_sold: 각 상태로 볼 값 목록 (null이면 한국어 기본값만)
+create or replace function public.admin_factory_overview(
+    p_month date default null,
+    p_normal text[] default null,
+    p_faulty text[] default null,
+    p_sold text[] default null
+)
+returns jsonb
+language sql
+stable
+as $$
+    with aliases as (
+        select coalesce(p_normal, array['정상']) as normal,
+               coalesce(p_faulty, array['고장']) as faulty,
+               coalesce(p_sold, array['매각']) as sold
+    ),
+    equipment_counts as (
+        select e.factory_id,
+               count(*) as equipment_total,
+               count(*) filter (where e.status = any (a.normal)) as normal_count,
+               count(*) filter (where e.status = any (a.faulty)) as faulty_count,
+               count(*) filter (where e.status = any (a.sold)) as sold_count
+          from public.equipment e
+          cross join aliases a
+         group by e.factory_id
+    ),
+    open_faults as (
+        -- 현재 고장 상태인 설비의 고장 시작 시각 중 가장 오래된 값
+        select e.factory_id, min(fault.since) as oldest_fault_since
+          from public.equipment e
+          cross join aliases a
+          cross join lateral (
+              select max(h.created_at) as since
+                from public.equipment_status_history h
+               where h.equipment_id = e.id and h.status = any (a.faulty)
+          ) fault
+         where e.status = any (a.faulty)
+         group by e.factory_id
+    ),
+    month_costs as (
+        select factory_id, sum(log_count) as logs_this_month, sum(cost) as cost_this_month
+          from public.maintenance_cost_factory_monthly
+         where month = date_trunc('month', coalesce(p_month, current_date))::date
+         group by factory_id
+    )
+    select coalesce(jsonb_agg(jsonb_build_object(
+               'factory_id', f.id,
+               'factory_name', f.name,
+               'equipment_total', coalesce(ec.equipment_total, 0),
+               'normal_count', coalesce(ec.normal_count, 0),
+               'faulty_count', coalesce(ec.faulty_count, 0),
+               'sold_count', coalesce(ec.sold_count, 0),
+               'oldest_fault_since', fo.oldest_fault_since,
+               'logs_this_month', coalesce(mc.logs_this_month, 0),
+               'cost_this_month', coalesce(mc.cost_this_month, 0)
+           ) order by f.name), '[]'::jsonb)
+      from public.factories f
+      left join equipment_counts ec on ec.factory_id = f.id
+      left join open_faults fo on fo.factory_id = f.id
+      left join month_costs mc on mc.factory_id = f.id;
+$$;
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,39 @@
+-- ------------------------------------------------------
+-- 부품 사용 현황: 검색어를 글자 그대로 부분 일치 검색
+-- ------------------------------------------------------
+-- p_term을 ilike 패턴에 그대로 이어 붙이면 '%'와 '_'가 와일드카드로 동작해
+-- 'SE_100'이 'SE-100'에도 일치하고, '%' 하나만 입력하면 모든 부품이 집계된다.
+-- 백슬래시를 이스케이프 문자로 지정하고 검색어 안의 \ % _ 를 이스케이프한다.
+
+create or replace function public.part_usage_by_factory(p_kind text default null, p_term text default null)
+returns jsonb
+language sql
+stable
+as $$
+    with pattern as (
+        select '%' || replace(replace(replace(coalesce(p_term, ''), '\', '\\'), '%', '\%'), '_', '\_') || '%' as value
+    )
+    select coalesce(jsonb_agg(usage order by usage.equipment_count desc, usage.name), '[]'::jsonb)
+      from (
+        select p.kind,
+               p.name_key,
+               min(p.name) as name,
+               p.factory_id,
+               min(f.name) as factory_name,
+               count(distinct p.equipment_id) as equipment_count,
+               count(*) as row_count
+          from public.equipment_parts p
+          left join public.factories f on f.id = p.factory_id
+          cross join pattern
+         where p.name_key is not null
+           and (p_kind is null or p.kind = p_kind)
+           and (coalesce(p_term, '') = ''
+                or p.name ilike pattern.value escape '\'
+                or p.model ilike pattern.value escape '\'
+                or p.serial ilike pattern.value escape '\'
+                or p.maker ilike pattern.value escape '\')
+         group by p.kind, p.name_key, p.factory_id
+      ) usage;
+$$;
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(resumable_upload 등)을 테스트에서 import 할 수 있도록 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,144 @@
+"""resumable_upload 청크 업로드 테스트
+
+http.server로 띄운 최소 TUS 서버(POST 생성 / HEAD 위치 조회 / PATCH 이어쓰기)에 실제 HTTP로 업로드한다.
+"""
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import resumable_upload
+
+CHUNK_SIZE = 1024
+
+
+class TusStubServer(ThreadingHTTPServer):
+    """업로드별 수신 바이트를 메모리에 쌓는 TUS 서버. fail_patches번째 PATCH 요청은 500으로 실패시킨다."""
+    daemon_threads = True
+
+    def __init__(self, fail_patches=()):
+        super().__init__(('127.0.0.1', 0), TusStubHandler)
+        self.uploads = {}
+        self.fail_patches = set(fail_patches)
+        self.patch_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.server_port}/upload/resumable"
+
+
+class TusStubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, headers=None):
+        self.send_response(status)
+        self.send_header('Tus-Resumable', '1.0.0')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        with self.server.lock:
+            upload_id = str(len(self.server.uploads) + 1)
+            self.server.uploads[upload_id] = {
+                'length': int(self.headers['Upload-Length']),
+                'metadata': self.headers['Upload-Metadata'],
+                'data': bytearray(),
+            }
+        self._reply(201, {'Location': f"/upload/resumable/{upload_id}"})
+
+    def do_HEAD(self):
+        upload = self.server.uploads.get(self.path.rsplit('/', 1)[-1])
+        if upload is None:
+            self._reply(404)
+            return
+        self._reply(200, {'Upload-Offset': str(len(upload['data'])), 'Upload-Length': str(upload['length'])})
+
+    def do_PATCH(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        upload = self.server.uploads.get(self.path.rsplit('/', 1)[-1])
+        if upload is None:
+            self._reply(404)
+            return
+        with self.server.lock:
+            self.server.patch_count += 1
+            failing = self.server.patch_count in self.server.fail_patches
+        if failing:
+            self._reply(500)
+            return
+        if int(self.headers['Upload-Offset']) != len(upload['data']):
+            self._reply(409)
+            return
+        upload['data'].extend(body)
+        self._reply(204, {'Upload-Offset': str(len(upload['data']))})
+
+
+@pytest.fixture
+def tus_server(request):
+    server = TusStubServer(fail_patches=getattr(request, 'param', ()))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resumable_upload, 'sleep', lambda seconds: None)
+
+
+def upload(server, payload, resume_store, persist=None):
+    return resumable_upload.upload_stream(
+        server.endpoint, 'test-key', io.BytesIO(payload), len(payload), 'documents', 'scan.pdf', 'application/pdf',
+        resume_store, 'scan', persist=persist, chunk_size=CHUNK_SIZE
+    )
+
+
+@pytest.mark.parametrize('tus_server', [(2,)], indirect=True)
+def test_multi_chunk_upload_retries_failed_patch(tus_server):
+    payload = bytes(range(256)) * 10  # 2560 바이트 = 청크 3개
+    resume_store = {}
+    persisted = []
+
+    object_name = upload(tus_server, payload, resume_store, persist=lambda: persisted.append(dict(resume_store)))
+
+    assert object_name == 'scan.pdf'
+    [stored] = tus_server.uploads.values()
+    assert bytes(stored['data']) == payload
+    assert stored['length'] == len(payload)
+    # 청크 3개 + 실패한 PATCH 재시도 1번
+    assert tus_server.patch_count == 4
+    # 위치 생성 직후와 성공한 청크마다 저장
+    assert len(persisted) == 4
+    assert resume_store == {}
+
+
+def test_upload_resumes_from_server_offset(tus_server):
+    payload = b'x' * (CHUNK_SIZE * 2 + 100)
+    resume_store = {}
+    location = resumable_upload.create_upload(tus_server.endpoint, 'test-key', len(payload), 'documents', 'scan.pdf', 'application/pdf')
+    [stored] = tus_server.uploads.values()
+    stored['data'].extend(payload[:CHUNK_SIZE])
+    resume_store['scan'] = {'location': location, 'object_name': 'scan.pdf'}
+
+    upload(tus_server, payload, resume_store)
+
+    assert len(tus_server.uploads) == 1
+    assert bytes(stored['data']) == payload
+    assert tus_server.patch_count == 2
+
+
+@pytest.mark.parametrize('tus_server', [tuple(range(1, 10))], indirect=True)
+def test_upload_gives_up_after_max_retries(tus_server):
+    resume_store = {}
+    with pytest.raises(resumable_upload.requests.HTTPError):
+        upload(tus_server, b'y' * (CHUNK_SIZE + 1), resume_store)
+
+    # 다음 제출에서 이어 올릴 수 있도록 위치가 남아 있음
+    assert 'scan' in resume_store
+    assert tus_server.patch_count == resumable_upload.MAX_RETRIES + 1